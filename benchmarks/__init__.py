@@ -0,0 +1 @@
+"""Benchmark scripts for the Testify Automation tooling. Run with ``python -m benchmarks.<name>``."""
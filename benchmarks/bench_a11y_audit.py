@@ -0,0 +1,67 @@
+"""Benchmark the single-pass accessibility audit on a large synthetic page.
+
+Usage:
+    python -m benchmarks.bench_a11y_audit               # ~20000 elements
+    python -m benchmarks.bench_a11y_audit --nodes 50000
+"""
+
+import argparse
+import time
+
+from playwright.sync_api import sync_playwright
+
+from support.a11y_audit import AccessibilityAudit
+
+BLOCK = (
+    '<section style="background:#{bg}"><h2>Section {i}</h2>'
+    '<p style="color:#{fg};font-size:{size}px">Paragraph {i} <a href="/item/{i}">link</a>'
+    '<span>note</span></p><img src="/img/{i}.png" alt="Image {i}"><ul><li>one</li><li>two</li></ul></section>'
+)
+ELEMENTS_PER_BLOCK = 9
+
+
+def _page_html(nodes: int) -> str:
+    blocks = []
+    for i in range(nodes // ELEMENTS_PER_BLOCK):
+        blocks.append(
+            BLOCK.format(i=i, bg="fff" if i % 2 else "f4f4f4", fg="777" if i % 7 == 0 else "222", size=12 + i % 6)
+        )
+    return f'<html lang="en"><body><h1>Bench</h1>{"".join(blocks)}<button type="submit">Go</button></body></html>'
+
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed * 1000:9.1f} ms")
+    return elapsed, result
+
+
+def run(nodes: int) -> dict:
+    """Time the first audit, a cached query, and a re-audit after a DOM change."""
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        page.set_content(_page_html(nodes))
+        audit = AccessibilityAudit(page)
+
+        print(f"📏 Accessibility audit over ~{nodes} elements")
+        results = {}
+        results["first"], _ = _timed("first query (full audit)", audit.contrast)
+        results["cached"], _ = _timed("next query (cached)", lambda: audit.small_text(12))
+        page.evaluate("() => document.body.append(document.createElement('p'))")
+        results["after_mutation"], _ = _timed("after a DOM change", audit.images)
+        stats = audit.stats()
+        print(
+            f"   audited {stats['nodes']} nodes, styled {stats['styled']}/{stats['textTotal']} "
+            f"(complete={stats['complete']}) in {stats['durationMs']} ms in-page, {stats['runs']} runs"
+        )
+        browser.close()
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20000, help="Approximate number of elements on the page")
+    args = parser.parse_args()
+    run(args.nodes)
@@ -0,0 +1,110 @@
+"""Benchmark catalog generation on a synthetic corpus of feature files.
+
+Usage:
+    python -m benchmarks.bench_catalog              # 2000 feature files
+    python -m benchmarks.bench_catalog --files 5000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import generate_catalog
+
+FEATURE_TEMPLATE = """@generated @{suite}
+Feature: Generated feature {index}
+
+  Background:
+    Given the user navigates to the home page
+
+  Rule: Rule {index}
+
+  @smoke @sanity
+  Scenario: TC-{index:05d} - Generated scenario {index}
+    When the user clicks on the "Portfolio" link
+    And the user fills in the contact form with:
+      | Field     | Value    |
+      | Full Name | Jane Doe |
+    Then the page should contain:
+      \"\"\"
+      Scenario: not a real scenario
+      @not-a-tag
+      \"\"\"
+
+  @navigation
+  Scenario Outline: TC-B{index:05d} - Navigation to <Section> works
+    When the user clicks on the "<Section>" link
+    Then the "<Section>" heading should be visible
+
+    Examples:
+      | Section   |
+      | About Me  |
+      | Portfolio |
+"""
+
+
+def _write_corpus(features_dir: Path, count: int) -> list[Path]:
+    """Write *count* synthetic feature files into *features_dir*."""
+    suites = ["regression", "accessibility", "performance"]
+    paths = []
+    for i in range(count):
+        path = features_dir / f"generated_{i:05d}.feature"
+        path.write_text(FEATURE_TEMPLATE.format(index=i, suite=suites[i % len(suites)]))
+        paths.append(path)
+    return paths
+
+
+def _timed(label: str, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def run(count: int) -> dict:
+    """Time cold, warm and single-file-changed catalog builds over *count* files."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        features_dir = root / "features"
+        features_dir.mkdir()
+        paths = _write_corpus(features_dir, count)
+
+        catalog_html = root / "catalog.html"
+        catalog_html.write_text(f"<script>\n{generate_catalog.CATALOG_MARKER}null;\n</script>\n")
+        kwargs = {
+            "features_dir": features_dir,
+            "catalog_file": root / "test_catalog.json",
+            "catalog_html": catalog_html,
+            "cache_file": root / "catalog_cache.json",
+            "verbose": False,
+        }
+
+        print(f"📏 Catalog build over {count} feature files")
+        results = {
+            "cold": _timed("cold (no cache)", lambda: generate_catalog.build_catalog(**kwargs)),
+            "warm": _timed("warm (nothing changed)", lambda: generate_catalog.build_catalog(**kwargs)),
+        }
+
+        changed = random.Random(0).choice(paths)
+        changed.write_text(changed.read_text().replace("Generated scenario", "Edited scenario"))
+        results["one_changed"] = _timed(
+            "incremental (1 file changed)", lambda: generate_catalog.build_catalog(**kwargs)
+        )
+
+        text = paths[0].read_text()
+        start = time.perf_counter()
+        for _ in range(count):
+            generate_catalog.parse_feature_text(text, "bench.feature")
+        results["parse_only"] = time.perf_counter() - start
+        print(f"   {'parse only (no I/O)':<28} {results['parse_only'] * 1000:9.1f} ms")
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="Number of feature files to generate")
+    args = parser.parse_args()
+    run(args.files)
@@ -0,0 +1,227 @@
+"""Benchmark the framework's own overhead against a local fixture copy of the site.
+
+The real Behave hooks from ``features/environment.py`` and the real page objects
+run against ``benchmarks/fixtures/portfolio`` on localhost, so the timings
+reflect our code (plus the browser), not the live site. Measured: browser
+launch, ``before_scenario``, ``navigate`` for each ``wait_until`` mode, the
+step hooks, page-object assertions and ``after_scenario``.
+
+Usage:
+    python -m benchmarks.bench_framework                  # run; results → reports/bench_framework.json
+    python -m benchmarks.bench_framework --iterations 50
+    python -m benchmarks.bench_framework --mirror         # latest mirror_site.py snapshot instead of the fixture
+    python -m benchmarks.bench_framework --save-baseline  # also store the results as the baseline
+    python -m benchmarks.bench_framework compare          # results vs baseline; exits 1 on a regression
+"""
+
+import argparse
+import importlib.metadata
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import config
+import mirror_site
+from support.circuit_breaker import breaker
+
+ROOT = Path(__file__).parent.parent
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "portfolio"
+ENVIRONMENT_FILE = ROOT / "features" / "environment.py"
+RESULTS_FILE = ROOT / "reports" / "bench_framework.json"
+BASELINE_FILE = Path(__file__).parent / "baselines" / "framework.json"
+
+WAIT_UNTIL_MODES = ("commit", "domcontentloaded", "load", "networkidle")
+LAUNCH_ITERATIONS = 5  # browser launches are slow; this many are enough for a stable median
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, directory=str(FIXTURE_DIR), **kwargs)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def start_fixture_server() -> ThreadingHTTPServer:
+    """Serve the fixture site on a free localhost port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _load_hooks():
+    """Import ``features/environment.py`` as a module (``features`` is not a package)."""
+    spec = importlib.util.spec_from_file_location("testify_environment", ENVIRONMENT_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 3),
+        "p90_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "min_ms": round(ordered[0], 3),
+        "n": len(ordered),
+    }
+
+
+def _timed(samples: dict, name: str, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def _assertions(context) -> dict:
+    """Representative page-object assertions, one per kind of check the suite makes."""
+    home, contact = context.home_page, context.contact_page
+    return {
+        "assert.title": lambda: home.verify_title("Artashes Kocharyan | Software Quality Assurance Engineer"),
+        "assert.tagline_visible": home.verify_tagline_visible,
+        "assert.social_link_url": lambda: home.verify_social_link_url("GitHub"),
+        "assert.portfolio_count": lambda: home.verify_portfolio_item_count(6),
+        "assert.portfolio_images": home.verify_portfolio_item_images,
+        "assert.footer_text": lambda: home.verify_footer_copyright("Artashes Alex Kocharyan"),
+        "assert.meta_tag": lambda: home.verify_meta_tag("description"),
+        "assert.form_field": lambda: contact.verify_field_visible("Email Address"),
+    }
+
+
+def run(iterations: int, base_url: str, target: str) -> dict:
+    """Run the hooks and page objects *iterations* times against *base_url*; return the results."""
+    # Keep the benchmark from touching a real run's live stream, breaker state, scenario order or timeout history
+    config.LIVE_RESULTS = False
+    config.ADAPTIVE_TIMEOUTS = False
+    config.SCENARIO_ORDER = "file"
+    breaker.state_file = None
+    hooks = _load_hooks()
+    context = SimpleNamespace()
+    samples: dict[str, list[float]] = {}
+
+    _timed(samples, "before_all", hooks.before_all, context)
+    browser_type = getattr(context.playwright, config.BROWSER, context.playwright.chromium)
+    for _ in range(min(LAUNCH_ITERATIONS, iterations)):
+        browser = _timed(samples, "browser_launch", browser_type.launch, headless=config.HEADLESS)
+        _timed(samples, "browser_close", browser.close)
+
+    step = SimpleNamespace(keyword="Then", name="framework benchmark step", status="passed")
+    print(f"⏱  Framework overhead: {iterations} iterations against {base_url} ({target})")
+    try:
+        for i in range(iterations):
+            scenario = SimpleNamespace(
+                name=f"BENCH-{i:03d} - framework overhead", effective_tags=[], status="passed", skip=lambda **_: None
+            )
+            _timed(samples, "before_scenario", hooks.before_scenario, context, scenario)
+            for mode in WAIT_UNTIL_MODES:
+                _timed(samples, f"navigate.{mode}", context.home_page.navigate, base_url, wait_until=mode)
+            _timed(samples, "step_hooks", lambda: (hooks.before_step(context, step), hooks.after_step(context, step)))
+            for name, check in _assertions(context).items():
+                hooks.before_step(context, step)
+                _timed(samples, name, check)
+                hooks.after_step(context, step)
+            _timed(samples, "after_scenario", hooks.after_scenario, context, scenario)
+    finally:
+        context.artifact_writer.close()
+        context.browser.close()
+        context.playwright.stop()
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": target,
+        "iterations": iterations,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "playwright": importlib.metadata.version("playwright"),
+            "browser": config.BROWSER,
+            "headless": config.HEADLESS,
+        },
+        "metrics": {name: _summary(values) for name, values in samples.items()},
+    }
+
+
+def print_results(results: dict) -> None:
+    print(f"   {'metric':<26} {'median':>10} {'p90':>10} {'n':>5}")
+    for name, m in results["metrics"].items():
+        print(f"   {name:<26} {m['median_ms']:8.2f}ms {m['p90_ms']:8.2f}ms {m['n']:5d}")
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[dict]:
+    """Metrics whose median grew by more than *threshold* (relative) and *min_delta_ms* (absolute)."""
+    if results["environment"] != baseline["environment"]:
+        print("⚠️  Baseline was recorded in a different environment — differences may not be regressions")
+    regressions = []
+    print(f"   {'metric':<26} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in results["metrics"].items():
+        base = baseline["metrics"].get(name)
+        if base is None:
+            print(f"   {name:<26} {'—':>10} {current['median_ms']:8.2f}ms      new")
+            continue
+        delta = current["median_ms"] - base["median_ms"]
+        change = delta / base["median_ms"] if base["median_ms"] else 0.0
+        regressed = change > threshold and delta > min_delta_ms
+        icon = "❌" if regressed else ("✅" if change < -threshold and -delta > min_delta_ms else "  ")
+        print(f"{icon} {name:<26} {base['median_ms']:8.2f}ms {current['median_ms']:8.2f}ms {change:+7.1%}")
+        if regressed:
+            regressions.append({"metric": name, "baseline_ms": base["median_ms"], "current_ms": current["median_ms"]})
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", nargs="?", choices=("run", "compare"), default="run")
+    parser.add_argument("--iterations", type=int, default=20, help="Scenarios to simulate")
+    parser.add_argument("--mirror", nargs="?", const="", default=None, help="Use a mirror snapshot (default: latest)")
+    parser.add_argument("--output", type=Path, default=RESULTS_FILE, help="Results file to write or compare")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Also store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        if not args.output.exists() or not args.baseline.exists():
+            print(f"⚠️  Need both {args.output} and {args.baseline} — run the benchmark (with --save-baseline) first")
+            return 2
+        results, baseline = json.loads(args.output.read_text()), json.loads(args.baseline.read_text())
+        print(f"⚖️  {args.output.name} ({results['timestamp']}) vs baseline ({baseline['timestamp']})")
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"❌ {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            return 1
+        print("✅ No regressions")
+        return 0
+
+    if args.mirror is not None:
+        server, snapshot_id = mirror_site.start_server(args.mirror or None)
+        target = f"mirror:{snapshot_id}"
+    else:
+        server, target = start_fixture_server(), "fixture"
+    try:
+        results = run(args.iterations, f"http://127.0.0.1:{server.server_port}/", target)
+    finally:
+        server.shutdown()
+        server.server_close()
+    print_results(results)
+    for path in [args.output] + ([args.baseline] if args.save_baseline else []):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2))
+        print(f"💾 Saved {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,113 @@
+"""Benchmark the link checker against a local stand-in server.
+
+The stand-in answers every URL after ``--delay-ms``. Some URLs redirect, some
+reject ``HEAD`` (405, forcing the GET fallback), some are 404 and some 429.
+The same URL list is checked one request at a time, then concurrently
+(cold cache), then again (warm cache). The run fails if the checker
+misclassifies any URL.
+
+Usage:
+    python -m benchmarks.bench_link_checker
+    python -m benchmarks.bench_link_checker --urls 500 --delay-ms 50 --per-host 8
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from support.link_checker import LinkChecker
+
+KINDS = {"ok": "ok", "redirect": "ok", "nohead": "ok", "missing": "broken", "limited": "unverified"}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is measured
+    delay_s = 0.02
+
+    def _answer(self, with_body: bool) -> None:
+        time.sleep(self.delay_s)
+        kind, _, n = self.path.strip("/").partition("/")
+        if kind == "nohead" and not with_body:
+            status, location = 405, None
+        elif kind == "redirect":
+            status, location = 301, f"/ok/{n}"
+        else:
+            status, location = {"missing": 404, "limited": 429}.get(kind, 200), None
+        body = b"<html>stand-in</html>" if with_body else b""
+        self.send_response(status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        self._answer(with_body=False)
+
+    def do_GET(self) -> None:
+        self._answer(with_body=True)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def start_stand_in(delay_ms: int) -> ThreadingHTTPServer:
+    """Serve the stand-in on a free localhost port."""
+    _StandInHandler.delay_s = delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _urls(base: str, count: int) -> dict[str, str]:
+    """*count* URLs mapped to the outcome the checker should report for each."""
+    kinds = list(KINDS)
+    return {f"{base}/{kinds[i % len(kinds)]}/{i}": KINDS[kinds[i % len(kinds)]] for i in range(count)}
+
+
+def _timed_check(label: str, checker: LinkChecker, expected: dict[str, str]) -> list[str]:
+    before = dict(checker.stats)
+    start = time.perf_counter()
+    results = checker.check_all(list(expected))
+    seconds = time.perf_counter() - start
+    stats = {name: value - before[name] for name, value in checker.stats.items()}
+    print(
+        f"   {label:<22} {seconds * 1000:9.1f} ms  {stats['requests']:5d} requests  "
+        f"{stats['connections_reused']:5d} reused  {stats['cache_hits']:5d} cache hits"
+    )
+    wrong = [r for r in results if r["outcome"] != expected[r["url"]]]
+    return [f"{r['url']}: {r['outcome']} (expected {expected[r['url']]}, {r['error'] or r['status']})" for r in wrong]
+
+
+def run(count: int, delay_ms: int, per_host: int) -> int:
+    server = start_stand_in(delay_ms)
+    expected = _urls(f"http://127.0.0.1:{server.server_port}", count)
+    print(f"🔗 Link checker: {count} URLs, {delay_ms} ms per response, {per_host} per host")
+    wrong = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            wrong += _timed_check("sequential", LinkChecker(per_host=1, cache_file=None, ttl_s=0), expected)
+            checker = LinkChecker(per_host=per_host, cache_file=Path(tmp) / "link_cache.json")
+            wrong += _timed_check("concurrent (cold)", checker, expected)
+            wrong += _timed_check("concurrent (warm)", checker, expected)
+            checker.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    for line in wrong:
+        print(f"❌ {line}")
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=200, help="URLs to check")
+    parser.add_argument("--delay-ms", type=int, default=20, help="Stand-in response time")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests per host")
+    args = parser.parse_args()
+    sys.exit(run(args.urls, args.delay_ms, args.per_host))
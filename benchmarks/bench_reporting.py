@@ -0,0 +1,276 @@
+"""Scale benchmarks for the reporting pipeline on synthetic data.
+
+Generates feature files, Allure result files and run histories at several
+scales in a temporary directory. Then it times ``parse_allure_results``,
+``collect_and_save``, ``inject_into_dashboard``, ``build_catalog`` and
+``inject_into_html``, and records each stage's peak traced memory in a second,
+separate pass (``tracemalloc`` slows the code it watches). Results go to
+``reports/bench_reporting.json``. Each stage also gets a scaling exponent,
+the log-log slope of time against input size (≈1 is linear).
+
+Usage:
+    python -m benchmarks.bench_reporting                               # default scales
+    python -m benchmarks.bench_reporting --results 10000,100000 --runs 1000,100000
+    python -m benchmarks.bench_reporting --features 1000,5000 --no-memory
+"""
+
+import argparse
+import json
+import math
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from pathlib import Path
+
+import collect_results
+import generate_catalog
+from benchmarks.bench_catalog import _write_corpus
+
+RESULTS_FILE = collect_results.REPORTS_DIR / "bench_reporting.json"
+DASHBOARD_TEMPLATE = collect_results.REPORTS_DIR / "dashboard.html"
+CATALOG_TEMPLATE = generate_catalog.CATALOG_HTML
+
+STATUSES = ("passed",) * 8 + ("failed", "broken", "skipped")
+TAGS = ("smoke", "regression", "validation", "ui", "performance", "accessibility")
+
+
+def _parse_scales(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+# ── Synthetic inputs ────────────────────────────────────────────────────────
+
+
+def write_allure_results(results_dir: Path, count: int, rng: random.Random) -> None:
+    """Write *count* Allure result files shaped like allure-behave's output."""
+    results_dir.mkdir(parents=True)
+    start = 1_760_000_000_000
+    for i in range(count):
+        duration = rng.randint(500, 30_000)
+        result = {
+            "uuid": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"TC-{i:06d} - Synthetic scenario {i}",
+            "fullName": f"Synthetic feature {i // 40}: TC-{i:06d} - Synthetic scenario {i}",
+            "status": rng.choice(STATUSES),
+            "start": start,
+            "stop": start + duration,
+            "labels": [
+                {"name": "feature", "value": f"Synthetic feature {i // 40}"},
+                {"name": "tag", "value": rng.choice(TAGS)},
+                {"name": "framework", "value": "behave"},
+                {"name": "language", "value": "cpython3"},
+            ],
+            "steps": [
+                {"name": f"Then step {n}", "status": "passed", "start": start, "stop": start + duration // 4}
+                for n in range(4)
+            ],
+        }
+        start += duration
+        (results_dir / f"{result['uuid']}-result.json").write_text(json.dumps(result))
+
+
+def make_history(runs: int, scenarios_per_run: int, rng: random.Random) -> list[dict]:
+    """Build a run history of *runs* runs with *scenarios_per_run* scenarios each."""
+    names = [f"TC-{i:03d} - Synthetic scenario {i}" for i in range(scenarios_per_run)]
+    when = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    history = []
+    for _ in range(runs):
+        scenarios = [
+            {"name": n, "status": rng.choice(STATUSES), "duration_ms": rng.randint(500, 30_000), "tags": "regression"}
+            for n in names
+        ]
+        counts = {s: sum(1 for sc in scenarios if sc["status"] == s) for s in ("passed", "failed", "broken", "skipped")}
+        history.append(
+            {
+                "total": len(scenarios),
+                **counts,
+                "pass_rate": round(counts["passed"] / len(scenarios) * 100, 1),
+                "duration_s": round(sum(sc["duration_ms"] for sc in scenarios) / 1000, 1),
+                "scenarios": scenarios,
+                "timestamp": when.isoformat(),
+                "run_id": when.strftime("%Y%m%d_%H%M%S"),
+                "tags_filter": "",
+            }
+        )
+        when += timedelta(hours=1)
+    return history
+
+
+def _template(source: Path, dest: Path, marker: str) -> Path:
+    """Copy the real HTML template if there is one, else write a minimal page holding *marker*."""
+    if source.exists():
+        shutil.copyfile(source, dest)
+    else:
+        dest.write_text(f"<html><script>\n{marker}null;\n</script></html>\n")
+    return dest
+
+
+@contextmanager
+def _collect_paths(root: Path):
+    """Point collect_results at *root* instead of the real reports directory."""
+    names = ("REPORTS_DIR", "HISTORY_FILE", "ALLURE_RESULTS_DIR", "LIVE_RESULTS_FILE")
+    saved = {name: getattr(collect_results, name) for name in names}
+    collect_results.REPORTS_DIR = root
+    collect_results.HISTORY_FILE = root / "run_history.json"
+    collect_results.ALLURE_RESULTS_DIR = root / "allure-results"
+    collect_results.LIVE_RESULTS_FILE = root / "live_results.jsonl"
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(collect_results, name, value)
+
+
+# ── Measurement ─────────────────────────────────────────────────────────────
+
+
+def measure(stage: str, n: int, fn, setup=None, memory: bool = True) -> dict:
+    """Time one call of *fn* (after *setup*), then optionally repeat it under tracemalloc for peak memory."""
+    if setup:
+        setup()
+    with redirect_stdout(StringIO()):  # the pipeline's own progress lines
+        start = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - start
+    row = {"stage": stage, "n": n, "seconds": round(seconds, 4), "us_per_item": round(seconds / n * 1e6, 2)}
+    if memory:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            with redirect_stdout(StringIO()):
+                fn()
+            row["peak_mib"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        finally:
+            tracemalloc.stop()
+    peak = f"{row['peak_mib']:8.1f} MiB" if "peak_mib" in row else ""
+    print(f"   {stage:<34} n={n:<8} {seconds * 1000:10.1f} ms {row['us_per_item']:9.2f} µs/item {peak}")
+    return row
+
+
+def scaling(rows: list[dict]) -> dict[str, float]:
+    """Log-log slope of time against n per stage, between its smallest and largest measured scale."""
+    exponents = {}
+    for stage in dict.fromkeys(r["stage"] for r in rows):
+        points = sorted((r["n"], r["seconds"]) for r in rows if r["stage"] == stage and r["seconds"] > 0)
+        if len(points) > 1 and points[-1][0] > points[0][0]:
+            (n0, t0), (n1, t1) = points[0], points[-1]
+            exponents[stage] = round(math.log(t1 / t0) / math.log(n1 / n0), 2)
+    return exponents
+
+
+def run(features: list[int], results: list[int], runs: list[int], scenarios_per_run: int, memory: bool) -> dict:
+    rng = random.Random(0)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        print(f"📏 Allure parsing and collection over {results} result files")
+        for count in results:
+            reports = root / f"allure_{count}"
+            reports.mkdir()
+            write_allure_results(reports / "allure-results", count, rng)
+            with _collect_paths(reports):
+                results_dir = collect_results.ALLURE_RESULTS_DIR
+                parse = lambda results_dir=results_dir: collect_results.parse_allure_results(results_dir)  # noqa: E731
+                rows.append(measure("parse_allure_results", count, parse, memory=memory))
+                rows.append(
+                    measure(
+                        "collect_and_save (allure)",
+                        count,
+                        lambda: collect_results.collect_and_save(history=[], inject=False),
+                        memory=memory,
+                    )
+                )
+            shutil.rmtree(reports)
+
+        print(f"📏 History persistence over {runs} runs x {scenarios_per_run} scenarios")
+        for count in runs:
+            reports = root / f"history_{count}"
+            reports.mkdir()
+            history = make_history(count, scenarios_per_run, rng)
+            run_data = history[-1]
+            dashboard = _template(DASHBOARD_TEMPLATE, reports / "dashboard.html", collect_results.RUN_DATA_MARKER)
+            with _collect_paths(reports):
+                rows.append(
+                    measure(
+                        "collect_and_save (history)",
+                        count,
+                        lambda run_data=run_data, history=history: collect_results.collect_and_save(
+                            run_data=dict(run_data), history=history[:-1], inject=False
+                        ),
+                        memory=memory,
+                    )
+                )
+                inject = lambda history=history: collect_results.inject_into_dashboard(history)  # noqa: E731
+                rows.append(measure("inject_into_dashboard", count, inject, memory=memory))
+                rows.append(measure("load_history", count, collect_results.load_history, memory=memory))
+            print(f"   {'':<34} dashboard {dashboard.stat().st_size / 2**20:.1f} MiB")
+            del history
+            shutil.rmtree(reports)
+
+        print(f"📏 Catalog generation over {features} feature files")
+        for count in features:
+            base = root / f"features_{count}"
+            features_dir = base / "features"
+            features_dir.mkdir(parents=True)
+            _write_corpus(features_dir, count)
+            catalog_html = _template(CATALOG_TEMPLATE, base / "catalog.html", generate_catalog.CATALOG_MARKER)
+            kwargs = {
+                "features_dir": features_dir,
+                "catalog_file": base / "test_catalog.json",
+                "catalog_html": catalog_html,
+                "cache_file": base / "catalog_cache.json",
+                "verbose": False,
+            }
+
+            def clear_outputs(kwargs=kwargs) -> None:
+                kwargs["cache_file"].unlink(missing_ok=True)
+                kwargs["catalog_file"].unlink(missing_ok=True)
+
+            build = lambda kwargs=kwargs: generate_catalog.build_catalog(**kwargs)  # noqa: E731
+            rows.append(measure("build_catalog (cold)", count, build, setup=clear_outputs, memory=memory))
+            rows.append(measure("build_catalog (warm)", count, build, memory=memory))
+            catalog = generate_catalog.build_catalog(**kwargs)
+            rows.append(
+                measure(
+                    "inject_into_html",
+                    count,
+                    lambda catalog=catalog, html=catalog_html: generate_catalog.inject_into_html(catalog, html),
+                    memory=memory,
+                )
+            )
+            shutil.rmtree(base)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "scales": {"features": features, "results": results, "runs": runs, "scenarios_per_run": scenarios_per_run},
+        "rows": rows,
+        "scaling": scaling(rows),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=_parse_scales, default=[500, 2000, 5000], help="Feature file counts")
+    parser.add_argument("--results", type=_parse_scales, default=[1000, 10000, 30000], help="Allure result counts")
+    parser.add_argument("--runs", type=_parse_scales, default=[1000, 10000], help="Run history lengths")
+    parser.add_argument("--scenarios-per-run", type=int, default=42, help="Scenarios in each synthetic history run")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", type=Path, default=RESULTS_FILE, help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    report = run(args.features, args.results, args.runs, args.scenarios_per_run, memory=not args.no_memory)
+    for stage, exponent in report["scaling"].items():
+        print(f"   {stage:<34} time ∝ n^{exponent}")
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"💾 Saved {args.output}")
@@ -0,0 +1,79 @@
+"""Benchmark the tiled visual diff on a synthetic full-page screenshot.
+
+Renders a page-like image (blocks of color, text-like noise), then times the
+byte-digest check that lets unchanged screenshots skip decoding, PNG decoding,
+and :func:`support.visual_diff.compare` for identical pixels, a small local
+change, a color shift under the threshold, and a change across the whole page.
+
+Usage:
+    python -m benchmarks.bench_visual_diff                     # 1280 x 8000
+    python -m benchmarks.bench_visual_diff --width 1920 --height 12000 --repeat 10
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from support.visual_diff import compare, decode_png, encode_png, png_digest
+
+
+def _page(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    pixels = np.full((height, width, 3), 250, np.uint8)
+    for top in range(0, height, 400):  # sections with a header band and text-like rows
+        pixels[top : top + 60] = rng.integers(0, 255, 3, dtype=np.uint8)
+        for row in range(top + 90, min(top + 380, height), 24):
+            pixels[row : row + 12, 80 : width - 80] = rng.integers(0, 2, (min(12, height - row), width - 160, 1)) * 200
+    return pixels
+
+
+def _timed(fn, repeat: int) -> tuple[float, object]:
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def run(width: int, height: int, repeat: int) -> None:
+    rng = np.random.default_rng(0)
+    baseline = _page(width, height, rng)
+    png = encode_png(baseline)
+
+    local = baseline.copy()
+    local[1000:1100, 200:600] = [255, 0, 0]
+    subtle = baseline.copy()
+    subtle[:, :, 2] = np.clip(subtle[:, :, 2].astype(int) + 3, 0, 255)
+    shifted = np.roll(baseline, 7, axis=0)
+
+    print(f"🖼  Visual diff: {width}x{height}, 64 px tiles, median of {repeat}")
+    steps = {"PNG digest (unchanged bytes)": lambda: png_digest(png), "decode PNG": lambda: decode_png(png)}
+    for name, fn in steps.items():
+        ms, _ = _timed(fn, repeat)
+        print(f"   {name:<34} {ms:8.1f} ms")
+    cases = {
+        "identical pixels": baseline.copy(),
+        "local change 400x100": local,
+        "color shift under threshold": subtle,
+        "whole page shifted 7 px": shifted,
+    }
+    for name, actual in cases.items():
+        ms, result = _timed(lambda a=actual: compare(a, baseline, heatmap=False), repeat)
+        verdict = "pass" if result.passed else "FAIL"
+        print(
+            f"   {name:<34} {ms:8.1f} ms  {result.changed_tiles:5d}/{result.tiles} tiles changed  "
+            f"{result.diff_pixels:9d} px differ  {verdict}"
+        )
+    ms, _ = _timed(lambda: compare(local, baseline), repeat)
+    print(f"   {'local change + heatmap':<34} {ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=8000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.width, args.height, args.repeat)
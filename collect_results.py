@@ -2,18 +2,34 @@
 """Collects Behave test results and appends them to a run history JSON file."""
 
 import json
-import re
+import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from statistics import median
+
+from live_results import LIVE_RESULTS_FILE, first_failure, read_session_records, to_history_scenarios
+from support.circuit_breaker import environment_state_file, read_breaker_summary
 
 REPORTS_DIR = Path(__file__).parent / "reports"
 HISTORY_FILE = REPORTS_DIR / "run_history.json"
 ALLURE_RESULTS_DIR = REPORTS_DIR / "allure-results"
+SESSION_SLACK_S = 5  # Allure may write its last results just after the live session closes
+RUN_DATA_MARKER = "        window.__RUN_DATA__ = "
 
 
-def parse_allure_results(results_dir: Path) -> dict:
-    """Parse Allure result JSON files to extract test run data."""
+def iter_allure_results(results_dir: Path):
+    """Yield each parseable Allure result dict in *results_dir*, one file at a time."""
+    for result_file in results_dir.glob("*-result.json"):
+        try:
+            with open(result_file) as f:
+                yield json.load(f)
+        except json.JSONDecodeError:
+            continue
+
+
+def summarize_results(results) -> dict:
+    """Reduce an iterable of Allure result dicts to run counts and scenario summaries."""
     passed = 0
     failed = 0
     broken = 0
@@ -21,11 +37,8 @@ def parse_allure_results(results_dir: Path) -> dict:
     total_duration_ms = 0
     scenarios = []
 
-    for result_file in results_dir.glob("*-result.json"):
+    for result in results:
         try:
-            with open(result_file) as f:
-                result = json.load(f)
-
             status = result.get("status", "unknown")
             name = result.get("name", "Unknown")
             duration = result.get("stop", 0) - result.get("start", 0)
@@ -41,15 +54,11 @@ def parse_allure_results(results_dir: Path) -> dict:
                 skipped += 1
 
             total_duration_ms += duration
-            scenarios.append(
-                {
-                    "name": name,
-                    "status": status,
-                    "duration_ms": duration,
-                    "tags": labels.get("tag", ""),
-                }
-            )
-        except (json.JSONDecodeError, KeyError):
+            scenario = {"name": name, "status": status, "duration_ms": duration, "tags": labels.get("tag", "")}
+            if "environment" in labels:  # matrix cell (see matrix.py)
+                scenario.update(browser=labels.get("browser", ""), environment=labels["environment"])
+            scenarios.append(scenario)
+        except KeyError:
             continue
 
     total = passed + failed + broken + skipped
@@ -65,26 +74,178 @@ def parse_allure_results(results_dir: Path) -> dict:
     }
 
 
-def collect_and_save(tags_filter: str = ""):
-    """Collect results and append to run history."""
-    if not ALLURE_RESULTS_DIR.exists():
+def parse_allure_results(results_dir: Path) -> dict:
+    """Parse Allure result JSON files to extract test run data."""
+    return summarize_results(iter_allure_results(results_dir))
+
+
+def merge_live_results(run_data: dict, live_scenarios: list) -> dict:
+    """Add live-stream scenarios that have no Allure result (e.g. the run crashed) to *run_data*.
+
+    Allure results win wherever both sources recorded the same scenario name.
+    """
+    known = {s["name"] for s in run_data["scenarios"]}
+    missing = [s for s in live_scenarios if s["name"] not in known]
+    if not missing:
+        return run_data
+
+    for s in missing:
+        if s["status"] in ("passed", "failed", "broken", "skipped"):
+            run_data[s["status"]] += 1
+        run_data["scenarios"].append(s)
+    run_data["total"] = run_data["passed"] + run_data["failed"] + run_data["broken"] + run_data["skipped"]
+    run_data["pass_rate"] = round((run_data["passed"] / run_data["total"] * 100), 1) if run_data["total"] > 0 else 0
+    run_data["duration_s"] = round(sum(s["duration_ms"] for s in run_data["scenarios"]) / 1000, 1)
+    run_data["live_only"] = len(missing)
+    return run_data
+
+
+def attach_ipc_calls(run_data: dict, live_scenarios: list) -> None:
+    """Copy each scenario's Playwright round-trip count from the live stream onto *run_data*."""
+    calls = {r["name"]: r["ipc_calls"] for r in live_scenarios if "ipc_calls" in r}
+    if not calls:
+        return
+    for s in run_data["scenarios"]:
+        if s["name"] in calls:
+            s["ipc_calls"] = calls[s["name"]]
+    run_data["ipc_calls"] = sum(calls.values())
+
+
+def ipc_regressions(run_data: dict, history: list, window: int = 5, tolerance: float = 0.2) -> list[dict]:
+    """Scenarios making over *tolerance* more round trips than their median in the last *window* runs."""
+    past: dict[str, list[int]] = {}
+    for run in history[-window:]:
+        for s in run.get("scenarios", []):
+            if "ipc_calls" in s:
+                past.setdefault(s["name"], []).append(s["ipc_calls"])
+    regressions = []
+    for s in run_data["scenarios"]:
+        if "ipc_calls" not in s or s["name"] not in past:
+            continue
+        baseline = median(past[s["name"]])
+        if s["ipc_calls"] > baseline * (1 + tolerance) and s["ipc_calls"] - baseline >= 2:
+            regressions.append({"name": s["name"], "calls": s["ipc_calls"], "baseline": baseline})
+    return regressions
+
+
+def matrix_divergences(run_data: dict) -> list[dict]:
+    """Scenarios whose status differs between matrix cells, with the status in each cell."""
+    by_scenario: dict[str, dict[str, str]] = {}
+    for s in run_data["scenarios"]:
+        if "environment" not in s:
+            continue
+        cell = f"{s['browser']}/{s['environment']}"
+        by_scenario.setdefault(s["name"].replace(f" [{cell}]", ""), {})[cell] = s["status"]
+    return [
+        {"name": name, "statuses": dict(sorted(statuses.items()))}
+        for name, statuses in sorted(by_scenario.items())
+        if len(set(statuses.values())) > 1
+    ]
+
+
+def merge_profiles(profiles: list[dict]) -> dict | None:
+    """One step-profiler summary from the ``profile`` records of a session (one per matrix cell)."""
+    if not profiles:
+        return None
+    slowest = sorted((row for p in profiles for row in p["slowest_steps"]), key=lambda row: -row["ms"])
+    return {
+        "slowest_steps": slowest[: max(len(p["slowest_steps"]) for p in profiles)],
+        "overhead_ms": round(sum(p["overhead_ms"] for p in profiles), 1),
+    }
+
+
+def live_session_records(results_dir: Path = ALLURE_RESULTS_DIR) -> list[dict]:
+    """Live-stream records of the session that produced the results being collected.
+
+    ``TESTIFY_SESSION`` names that session when it is set. Otherwise the most
+    recent session is used only if it was still running when the newest Allure
+    result was written. A session left over from an earlier run, say one made
+    before a run with ``LIVE_RESULTS=false``, is not merged.
+    """
+    session = os.getenv("TESTIFY_SESSION")
+    records = read_session_records(LIVE_RESULTS_FILE, session)
+    if session or not records:
+        return records
+    newest = max((f.stat().st_mtime for f in results_dir.glob("*-result.json")), default=None)
+    if newest is None:
+        return records  # nothing from Allure: the live stream is all there is
+    times = [datetime.fromisoformat(r["timestamp"]).timestamp() for r in records]
+    if min(times) <= newest <= max(times) + SESSION_SLACK_S:
+        return records
+    print("⚠️  The latest live-results session is not the one that produced these Allure results — not merged")
+    return []
+
+
+def load_history() -> list:
+    """Load the run history, or an empty list if there is none yet."""
+    if not HISTORY_FILE.exists():
+        return []
+    try:
+        with open(HISTORY_FILE) as f:
+            return json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return []
+
+
+def collect_and_save(
+    tags_filter: str = "",
+    run_data: dict | None = None,
+    history: list | None = None,
+    inject: bool = True,
+) -> tuple[dict, list]:
+    """Collect results and append to run history.
+
+    *run_data* (from :func:`summarize_results`) and *history* can be passed in
+    when the caller has already parsed them, so nothing is read twice. Returns
+    the recorded run and the updated history.
+    """
+    if run_data is None and not ALLURE_RESULTS_DIR.exists() and not LIVE_RESULTS_FILE.exists():
         print("⚠️  No allure-results directory found. Run tests first.")
         sys.exit(1)
 
-    # Parse results
-    run_data = parse_allure_results(ALLURE_RESULTS_DIR)
+    # Parse results, topping up from the live stream anything Allure never wrote
+    if run_data is None:
+        run_data = parse_allure_results(ALLURE_RESULTS_DIR)
+    live_records = live_session_records()
+    live_scenarios = [r for r in live_records if r.get("event") == "scenario"]
+    run_data = merge_live_results(run_data, to_history_scenarios(live_scenarios))
+    attach_ipc_calls(run_data, live_scenarios)
     run_data["timestamp"] = datetime.now(timezone.utc).isoformat()
     run_data["run_id"] = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     run_data["tags_filter"] = tags_filter
+    if os.getenv("MIRROR_SNAPSHOT"):
+        run_data["mirror_snapshot"] = os.getenv("MIRROR_SNAPSHOT")
+    ordering = first_failure(live_records)
+    if ordering:
+        run_data["ordering"] = ordering
+    profile = merge_profiles([r for r in live_records if r.get("event") == "profile"])
+    if profile:
+        run_data["profile"] = profile
+    # Matrix cells share a session, so each cell's Behave process has its own ipc record
+    over_budget = [step for r in live_records if r.get("event") == "ipc" for step in r["over_budget"]]
+    if over_budget:
+        run_data["ipc_over_budget"] = over_budget
+    divergences = matrix_divergences(run_data)
+    cells = sorted({f"{s['browser']}/{s['environment']}" for s in run_data["scenarios"] if "environment" in s})
+    if cells:
+        run_data["matrix"] = {"cells": cells, "divergences": divergences}
+        breakers = {env: read_breaker_summary(environment_state_file(env)) for env in {c.split("/")[1] for c in cells}}
+        if any(breakers.values()):
+            run_data["matrix"]["circuit_breakers"] = {env: b for env, b in breakers.items() if b}
+    breaker_summary = read_breaker_summary()
+    if breaker_summary:
+        run_data["circuit_breaker"] = breaker_summary
 
     # Load existing history
-    history = []
-    if HISTORY_FILE.exists():
-        try:
-            with open(HISTORY_FILE) as f:
-                history = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            history = []
+    if history is None:
+        history = load_history()
+
+    regressions = ipc_regressions(run_data, history)
+    if regressions:
+        run_data["ipc_regressions"] = regressions
+        print(f"⚠️  {len(regressions)} scenario(s) make more Playwright round trips than before:")
+        for r in regressions:
+            print(f"   {r['calls']:4d} calls (was ~{r['baseline']:g})  {r['name']}")
 
     # Append new run
     history.append(run_data)
@@ -95,11 +256,36 @@ def collect_and_save(tags_filter: str = ""):
         json.dump(history, f, indent=2)
 
     # Inject data into dashboard HTML so it works via file:// protocol
-    inject_into_dashboard(history)
+    if inject:
+        inject_into_dashboard(history)
 
+    if divergences:
+        print(f"🔀 {len(divergences)} scenario(s) differ between matrix cells:")
+        for d in divergences:
+            print(f"   {d['name']}: " + ", ".join(f"{cell} {status}" for cell, status in d["statuses"].items()))
+    if profile and profile["slowest_steps"]:
+        print_slowest_steps(profile["slowest_steps"])
+    if ordering and ordering["first_failure"]:
+        print(
+            f"⏱  First failure after {ordering['time_to_first_failure_s']}s "
+            f"(scenario #{ordering['position']}, {ordering['mode']} order): {ordering['first_failure']}"
+        )
     print(
         f"📝 Run #{len(history)} recorded: {run_data['passed']}/{run_data['total']} passed ({run_data['pass_rate']}%)"
     )
+    return run_data, history
+
+
+def print_slowest_steps(rows: list[dict]) -> None:
+    """Print the step profiler's slowest-steps table."""
+    print(f"🐢 Slowest {len(rows)} steps:")
+    for row in rows:
+        print(f"   {row['ms']:9.1f} ms  {row['step'][:70]:<70}  {row['scenario'][:40]}")
+
+
+def slim_run(run: dict) -> dict:
+    """Return *run* without its per-scenario details."""
+    return {k: v for k, v in run.items() if k != "scenarios"}
 
 
 def inject_into_dashboard(history: list):
@@ -110,14 +296,17 @@ def inject_into_dashboard(history: list):
 
     html = dashboard_path.read_text()
     # Compact JSON for embedding (strip scenario details to keep file small)
-    slim_history = []
-    for run in history:
-        slim = {k: v for k, v in run.items() if k != "scenarios"}
-        slim_history.append(slim)
-
-    data_line = f"        window.__RUN_DATA__ = {json.dumps(slim_history)};"
-    html = re.sub(r"        window\.__RUN_DATA__ = .*?;", data_line, html)
-    dashboard_path.write_text(html)
+    slim_history = [slim_run(run) for run in history]
+
+    data_line = f"{RUN_DATA_MARKER}{json.dumps(slim_history)};"
+
+    # Replace the marker line by position: a regex replacement would mangle backslashes in the JSON
+    start = html.find(RUN_DATA_MARKER)
+    if start == -1:
+        return
+    end = html.find("\n", start)
+    end = len(html) if end == -1 else end
+    dashboard_path.write_text(html[:start] + data_line + html[end:])
 
 
 if __name__ == "__main__":
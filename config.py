@@ -20,12 +20,91 @@ HEADLESS: bool = os.getenv("HEADLESS", "true").lower() == "true"
 BROWSER: str = os.getenv("BROWSER", "chromium")  # chromium | firefox | webkit
 VIEWPORT_WIDTH: int = int(os.getenv("VIEWPORT_WIDTH", "1280"))
 VIEWPORT_HEIGHT: int = int(os.getenv("VIEWPORT_HEIGHT", "720"))
+BROWSER_WS_ENDPOINT: str = os.getenv("BROWSER_WS_ENDPOINT", "")  # connect to a shared browser server, don't launch
+
+# ── Matrix ──────────────────────────────────────────────────────────────────
+MATRIX_ENV: str = os.getenv("MATRIX_ENV", "")  # environment name of this cell; set by orchestrate.py --browsers/--envs
+
+# ── Device Matrix ───────────────────────────────────────────────────────────
+# Profiles @device_matrix scenarios run on at once: Playwright device names or WIDTHxHEIGHT[@DPR]; empty = off
+DEVICE_MATRIX: list[str] = [
+    d.strip()
+    for d in os.getenv("DEVICE_MATRIX", "iPhone 8,iPhone SE,iPhone 12,Pixel 7,Galaxy S9+").split(",")
+    if d.strip()
+]
 
 # ── Timeouts & Retries ─────────────────────────────────────────────────────
 DEFAULT_TIMEOUT_MS: int = int(os.getenv("DEFAULT_TIMEOUT", "30000"))
 NAVIGATION_TIMEOUT_MS: int = int(os.getenv("NAVIGATION_TIMEOUT", "60000"))
+ADAPTIVE_TIMEOUTS: bool = os.getenv("ADAPTIVE_TIMEOUTS", "false").lower() == "true"  # learn timeouts from past runs
+TIMEOUT_PERCENTILE: float = float(os.getenv("TIMEOUT_PERCENTILE", "95"))  # of recorded durations per step/locator
+TIMEOUT_SAFETY_FACTOR: float = float(os.getenv("TIMEOUT_SAFETY_FACTOR", "3"))
+TIMEOUT_FLOOR_MS: int = int(os.getenv("TIMEOUT_FLOOR", "2000"))  # ceilings are the static timeouts above
+TIMEOUT_MIN_SAMPLES: int = int(os.getenv("TIMEOUT_MIN_SAMPLES", "5"))  # fewer = static timeout
+TIMEOUT_HISTORY_SAMPLES: int = int(os.getenv("TIMEOUT_HISTORY_SAMPLES", "50"))  # most recent kept per key
 RETRY_ATTEMPTS: int = int(os.getenv("RETRY_ATTEMPTS", "3"))
-RETRY_DELAY_S: int = int(os.getenv("RETRY_DELAY", "2"))
+RETRY_DELAY_S: int = int(os.getenv("RETRY_DELAY", "2"))  # base of the jittered exponential backoff
+RETRY_MAX_DELAY_S: int = int(os.getenv("RETRY_MAX_DELAY", "10"))
+
+# ── Circuit Breaker ─────────────────────────────────────────────────────────
+CIRCUIT_BREAKER: bool = os.getenv("CIRCUIT_BREAKER", "true").lower() == "true"
+CIRCUIT_BREAKER_THRESHOLD: int = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))  # consecutive failed attempts
+CIRCUIT_BREAKER_COOLDOWN_S: int = int(os.getenv("CIRCUIT_BREAKER_COOLDOWN", "30"))
+CIRCUIT_BREAKER_ACTION: str = os.getenv("CIRCUIT_BREAKER_ACTION", "skip").lower()  # skip | fail
+
+# ── Artifacts ───────────────────────────────────────────────────────────────
+ARTIFACT_WRITER: bool = os.getenv("ARTIFACT_WRITER", "true").lower() == "true"  # false = write inline in the hook
+ARTIFACT_QUEUE_SIZE: int = int(os.getenv("ARTIFACT_QUEUE_SIZE", "32"))
+SCREENSHOT_MAX_WIDTH: int = int(os.getenv("SCREENSHOT_MAX_WIDTH", "0"))  # 0 = full size; downscaling needs Pillow
+ARTIFACT_STORE_MAX_MB: int = int(os.getenv("ARTIFACT_STORE_MAX_MB", "500"))  # reports/artifacts size bound; 0 = none
+ARTIFACT_COMPRESS: bool = os.getenv("ARTIFACT_COMPRESS", "false").lower() == "true"  # gzip blobs (PNGs gain little)
+
+# ── Tracing ─────────────────────────────────────────────────────────────────
+TRACE_ON_FAILURE: bool = os.getenv("TRACE_ON_FAILURE", "true").lower() == "true"  # keep traces of failed/flaky only
+TRACE_SCREENSHOTS: bool = os.getenv("TRACE_SCREENSHOTS", "true").lower() == "true"
+TRACE_SNAPSHOTS: bool = os.getenv("TRACE_SNAPSHOTS", "true").lower() == "true"  # DOM snapshots per action
+TRACE_SOURCES: bool = os.getenv("TRACE_SOURCES", "false").lower() == "true"  # embed step source files
+
+# ── Selectors ───────────────────────────────────────────────────────────────
+SELECTOR_CACHE: bool = os.getenv("SELECTOR_CACHE", "true").lower() == "true"  # pin matching union alternatives
+SELECTOR_SLOW_US: int = int(os.getenv("SELECTOR_SLOW_US", "1000"))  # in-page query time reported as slow
+
+# ── Profiling ───────────────────────────────────────────────────────────────
+STEP_PROFILER: bool = os.getenv("STEP_PROFILER", "true").lower() == "true"  # steps → page methods → Playwright calls
+PROFILE_TOP_N: int = int(os.getenv("PROFILE_TOP_N", "10"))  # slowest steps / hotspots kept in the run summary
+
+# ── Round Trips ─────────────────────────────────────────────────────────────
+IPC_COUNT: bool = os.getenv("IPC_COUNT", "true").lower() == "true"  # count Playwright round trips per step
+IPC_STEP_BUDGET: int = int(os.getenv("IPC_STEP_BUDGET", "0"))  # default per-step budget; 0 = only @max_calls=N tags
+IPC_BUDGET_ACTION: str = os.getenv("IPC_BUDGET_ACTION", "warn").lower()  # warn | fail
+
+# ── Forms ───────────────────────────────────────────────────────────────────
+FORM_FILL: str = os.getenv("FORM_FILL", "batch").lower()  # batch (one round trip per form) | native (fill per field)
+
+# ── Link Checking ───────────────────────────────────────────────────────────
+LINK_CHECK_SCOPE: str = os.getenv("LINK_CHECK_SCOPE", "all").lower()  # all | internal (only the page's own host)
+LINK_CHECK_PER_HOST: int = int(os.getenv("LINK_CHECK_PER_HOST", "4"))  # concurrent requests per host
+LINK_CHECK_TIMEOUT_S: float = float(os.getenv("LINK_CHECK_TIMEOUT", "10"))
+LINK_CHECK_TTL_S: int = int(os.getenv("LINK_CHECK_TTL", "3600"))  # seconds a resolved URL stays cached; 0 = no cache
+LINK_CHECK_UNVERIFIED: tuple[int, ...] = tuple(  # statuses meaning "blocked", not "broken" (rate limits, bot walls)
+    int(s) for s in os.getenv("LINK_CHECK_UNVERIFIED", "429,999").split(",") if s.strip()
+)
+
+# ── Visual Regression ───────────────────────────────────────────────────────
+VISUAL_UPDATE: str = os.getenv("VISUAL_UPDATE", "missing").lower()  # missing (record new baselines) | all | none
+VISUAL_THRESHOLD: float = float(os.getenv("VISUAL_THRESHOLD", "0.1"))  # per-pixel YIQ color distance, 0-1
+VISUAL_MAX_DIFF_RATIO: float = float(os.getenv("VISUAL_MAX_DIFF_RATIO", "0.001"))  # share of pixels allowed to differ
+VISUAL_TILE: int = int(os.getenv("VISUAL_TILE", "64"))  # tile size (px) for hashing and diffing
+
+# ── Accessibility ───────────────────────────────────────────────────────────
+A11Y_AUDIT_BUDGET_MS: int = int(os.getenv("A11Y_AUDIT_BUDGET", "3000"))  # style/contrast pass budget per page state
+
+# ── Scenario Order ──────────────────────────────────────────────────────────
+SCENARIO_ORDER: str = os.getenv("SCENARIO_ORDER", "file").lower()  # file | history (likely failures first)
+
+# ── Live Results ────────────────────────────────────────────────────────────
+LIVE_RESULTS: bool = os.getenv("LIVE_RESULTS", "true").lower() == "true"
+LIVE_RESULTS_FSYNC: bool = os.getenv("LIVE_RESULTS_FSYNC", "true").lower() == "true"
 
 # ── Logging ─────────────────────────────────────────────────────────────────
 LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
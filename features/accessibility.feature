@@ -25,3 +25,4 @@ Feature: Accessibility Suite for artasheskocharyan.com
   @a11y
   Scenario: TC-A05 - Color contrast and text readability
     Then the body text should have a minimum font size of 12px
+    And the text should meet the WCAG AA contrast ratio
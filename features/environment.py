@@ -2,17 +2,33 @@
 
 import logging
 import os
-from datetime import datetime
+import uuid
 
 import allure
 from playwright.sync_api import sync_playwright
 
 import config
+from collect_results import load_history
+from live_results import LiveResultSink
+from matrix import cell_dir, label_cell
 from pages.contact_page import ContactPage
 from pages.home_page import HomePage
 from pages.responsive_page import ResponsivePage
-
-SCREENSHOT_DIR = os.path.join(os.path.dirname(__file__), "..", "reports", "screenshots")
+from support.adaptive_timeouts import adaptive_timeouts
+from support.artifact_store import ArtifactStore
+from support.artifact_writer import ArtifactWriter
+from support.circuit_breaker import breaker, environment_state_file
+from support.device_matrix import MATRIX_TAG, DeviceMatrix
+from support.image_tracker import IMAGE_TAG, ImageTracker
+from support.ipc_budget import IpcCounter
+from support.link_checker import link_checker
+from support.ordering import ScenarioOrderer
+from support.selector_cache import PROFILE_FILE as SELECTOR_PROFILE_FILE
+from support.selector_cache import selector_cache
+from support.step_profiler import PROFILE_FILE as STEP_PROFILE_FILE
+from support.step_profiler import StepProfiler
+from support.trace_capture import TraceRecorder
+from support.visual_diff import visual_baselines
 
 # ── Logging Setup ───────────────────────────────────────────────────────────
 logger = logging.getLogger("testify")
@@ -32,13 +48,76 @@ def before_all(context):
 
     # Dynamically select browser engine
     browser_launcher = getattr(context.playwright, config.BROWSER, context.playwright.chromium)
-    context.browser = browser_launcher.launch(headless=config.HEADLESS)
-
-    os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+    if config.BROWSER_WS_ENDPOINT:
+        # Matrix cells share one browser per engine across environments (see matrix.py)
+        context.browser = browser_launcher.connect(config.BROWSER_WS_ENDPOINT)
+    else:
+        context.browser = browser_launcher.launch(headless=config.HEADLESS)
+
+    # Parallel workers share one session (one circuit breaker, one artifact-store run) via TESTIFY_SESSION
+    context.session_id = os.getenv("TESTIFY_SESSION") or uuid.uuid4().hex[:12]
+    context.artifact_writer = ArtifactWriter(ArtifactStore(run=context.session_id))
+    if config.ARTIFACT_WRITER:
+        context.artifact_writer.start()
+    context.tracer = TraceRecorder() if config.TRACE_ON_FAILURE else None
+    context.profiler = None
+    if config.STEP_PROFILER:
+        context.profiler = StepProfiler()
+        context.profiler.instrument_pages(HomePage, ContactPage, ResponsivePage)
+        context.profiler.instrument_playwright()
+    context.ipc = None
+    if config.IPC_COUNT:
+        context.ipc = IpcCounter(caller=context.profiler.page_method if context.profiler else None)
+        context.ipc.install()
+    if config.ADAPTIVE_TIMEOUTS:
+        adaptive_timeouts.install()
+
+    if config.MATRIX_ENV:
+        # Matrix cells of one environment share a breaker; an outage elsewhere must not open it
+        breaker.state_file = environment_state_file(config.MATRIX_ENV)
+        label_cell(context._runner.features, f"{config.BROWSER}/{config.MATRIX_ENV}")
+    breaker.start_session(context.session_id)
+
+    context.live_sink = None
+    if config.LIVE_RESULTS:
+        context.live_sink = LiveResultSink(session=context.session_id, fsync=config.LIVE_RESULTS_FSYNC)
+        context.live_sink.open()
+
+    if config.SCENARIO_ORDER == "history":
+        _order_by_history(context)
 
 
 def after_all(context):
-    """Shut down the browser and Playwright."""
+    """Flush pending artifacts, then shut down the browser and Playwright."""
+    artifact_stats = context.artifact_writer.close()
+    trace_stats = context.tracer.summary() if context.tracer else None
+    selector_file, step_file = SELECTOR_PROFILE_FILE, STEP_PROFILE_FILE
+    if config.MATRIX_ENV:
+        # Concurrent matrix cells would overwrite each other's profiles in reports/: each cell writes to its own directory
+        selector_file = cell_dir(config.BROWSER, config.MATRIX_ENV) / SELECTOR_PROFILE_FILE.name
+        step_file = cell_dir(config.BROWSER, config.MATRIX_ENV) / STEP_PROFILE_FILE.name
+    selector_stats = selector_cache.save_report(selector_file) if config.SELECTOR_CACHE else None
+    profile = context.profiler.save(step_file) if context.profiler else None
+    ipc_stats = context.ipc.summary() if context.ipc else None
+    timeout_stats = adaptive_timeouts.save() if config.ADAPTIVE_TIMEOUTS else None
+    link_checker.close()
+    if context.live_sink:
+        context.live_sink.emit({"event": "artifacts", **artifact_stats})
+        if trace_stats:
+            context.live_sink.emit({"event": "tracing", **trace_stats})
+        if selector_stats:
+            context.live_sink.emit({"event": "selectors", **selector_stats})
+        if profile:
+            context.live_sink.emit({"event": "profile", **profile})
+        if ipc_stats:
+            context.live_sink.emit({"event": "ipc", **ipc_stats})
+        if timeout_stats:
+            context.live_sink.emit({"event": "timeouts", **timeout_stats})
+        if link_checker.stats["checked"]:
+            context.live_sink.emit({"event": "links", **link_checker.stats})
+        if visual_baselines.stats["compared"] or visual_baselines.stats["recorded"]:
+            context.live_sink.emit({"event": "visual", **visual_baselines.stats})
+        context.live_sink.close()
     context.browser.close()
     context.playwright.stop()
     logger.info("Browser closed")
@@ -47,38 +126,123 @@ def after_all(context):
 def before_scenario(context, scenario):
     """Create an isolated browser context and page for each scenario."""
     logger.debug("▶ Starting: %s", scenario.name)
+    context.page = None
+    context.device = None  # the device profile a @per_device step is running on
+    context.matrix = None
+    context.images = None
+    if config.MATRIX_ENV:
+        allure.dynamic.label("browser", config.BROWSER)
+        allure.dynamic.label("environment", config.MATRIX_ENV)
+    if context.profiler:
+        context.profiler.start_scenario(scenario)
+    if context.ipc:
+        context.ipc.start_scenario(scenario)
+    if config.ADAPTIVE_TIMEOUTS:
+        adaptive_timeouts.start_scenario(scenario)
+    if config.CIRCUIT_BREAKER and config.CIRCUIT_BREAKER_ACTION == "skip" and breaker.is_open():
+        breaker.count_short_circuit()
+        scenario.skip(reason="Circuit breaker open: target site unreachable")
+        logger.warning("⏭ Skipped (circuit open): %s", scenario.name)
+        return
+
     context.browser_context = context.browser.new_context(
         viewport={"width": config.VIEWPORT_WIDTH, "height": config.VIEWPORT_HEIGHT},
     )
     context.browser_context.set_default_timeout(config.DEFAULT_TIMEOUT_MS)
+    if context.tracer:
+        context.tracer.start_scenario(context.browser_context)
     context.page = context.browser_context.new_page()
     context.home_page = HomePage(context.page)
     context.contact_page = ContactPage(context.page)
     context.responsive_page = ResponsivePage(context.page)
+    if IMAGE_TAG in scenario.effective_tags:
+        context.images = ImageTracker(context.page)
+    if MATRIX_TAG in scenario.effective_tags and config.DEVICE_MATRIX:
+        context.matrix = DeviceMatrix(context.browser, config.DEVICE_MATRIX, context.playwright.devices)
+
+
+def before_step(context, step):
+    """Apply the step's learned timeouts; start its trace chunk, profiler frame and round-trip count."""
+    if config.ADAPTIVE_TIMEOUTS and context.page:
+        pages = [context.page] + ([run.page for run in context.matrix.runs] if context.matrix else [])
+        adaptive_timeouts.start_step(step, pages)
+    if context.tracer:
+        context.tracer.start_step(step)
+    if context.profiler:
+        context.profiler.start_step(step)
+    if context.ipc:
+        context.ipc.start_step(step)
+    if context.matrix:
+        context.matrix.start_step(step)
+
+
+def after_step(context, step):
+    """Save the step's trace chunk (kept only if the scenario fails or is flaky) and its duration."""
+    if config.ADAPTIVE_TIMEOUTS:
+        adaptive_timeouts.stop_step(step)
+    if context.ipc:
+        context.ipc.stop_step(step)
+    if context.profiler:
+        context.profiler.stop_step(step)
+    if context.tracer:
+        context.tracer.stop_step(step)
 
 
 def after_scenario(context, scenario):
-    """Capture failure screenshots and clean up the browser context."""
+    """Capture failure artifacts (screenshot, trace) and clean up the browser context."""
     try:
-        if scenario.status == "failed":
+        if scenario.status == "failed" and context.page:
             _capture_failure_screenshot(context, scenario)
     finally:
         # Guarantee cleanup even if screenshot capture fails
-        context.page.close()
-        context.browser_context.close()
+        if context.page:
+            context.page.close()
+            context.browser_context.close()
+        if context.tracer and context.page:
+            # The chunks are already on disk. Only the default page is traced, so its trace is kept only
+            # for failures that happened on it
+            failed_here = scenario.status == "failed" and not (context.matrix and context.matrix.failed)
+            context.tracer.finish_scenario(scenario, keep=failed_here or _is_flaky(context))
+        extra = context.ipc.finish_scenario() if context.ipc else {}
+        if config.MATRIX_ENV:
+            extra.update(browser=config.BROWSER, environment=config.MATRIX_ENV)
+        if context.matrix:
+            context.matrix.report(scenario)
+            context.matrix.close()
+            extra.update(context.matrix.summary())
+        if context.images and context.images.report:
+            extra["images"] = context.images.summary()
         logger.debug("◼ Finished: %s [%s]", scenario.name, scenario.status)
+        if context.profiler:
+            context.profiler.finish_scenario()
+        if context.live_sink:
+            context.live_sink.emit_scenario(scenario, extra)
+
+
+def _order_by_history(context):
+    """Reorder the parsed features and scenarios so likely, quick failures run first."""
+    plan = ScenarioOrderer(load_history()).order(context._runner.features)
+    logger.info("Scenario order: history (%d scenarios, first: %s)", len(plan), plan[0]["name"] if plan else "-")
+    if context.live_sink:
+        context.live_sink.emit({"event": "ordering", "mode": "history", "scenarios": len(plan), "head": plan[:10]})
+
+
+def _is_flaky(context) -> bool:
+    """True if a page object had to retry navigation during the scenario."""
+    pages = (context.home_page, context.contact_page, context.responsive_page)
+    return any(page.navigation_retries for page in pages) or bool(context.matrix and context.matrix.navigation_retries)
 
 
 def _capture_failure_screenshot(context, scenario):
-    """Save a timestamped screenshot and attach it to the Allure report."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_name = scenario.name.replace(" ", "_").replace("-", "")[:50]
-    screenshot_path = os.path.join(SCREENSHOT_DIR, f"{safe_name}_{timestamp}.png")
-
-    screenshot_bytes = context.page.screenshot(path=screenshot_path)
-    allure.attach(
-        screenshot_bytes,
-        name="Failure Screenshot",
-        attachment_type=allure.attachment_type.PNG,
-    )
-    logger.warning("📸 Screenshot saved: %s", screenshot_path)
+    """Capture a failure screenshot; storing and attaching to Allure happen on the artifact writer.
+
+    In a ``@device_matrix`` scenario whose device profiles failed, each failing profile's page is
+    captured instead of the default desktop page, which those steps never touched.
+    """
+    failed_runs = context.matrix.failed if context.matrix else []
+    for run in failed_runs:
+        context.artifact_writer.submit_screenshot(
+            run.page.screenshot(), scenario.name, f"Failure Screenshot [{run.name}]"
+        )
+    if not failed_runs:
+        context.artifact_writer.submit_screenshot(context.page.screenshot(), scenario.name)
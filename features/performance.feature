@@ -6,7 +6,7 @@ Feature: Performance Suite for artasheskocharyan.com
     When the user measures the page load time
     Then the page should load in less than 5 seconds
 
-  @perf
+  @perf @track_images
   Scenario: TC-P02 - No broken images on the page
     Given the user navigates to the home page
     Then all images should load successfully
@@ -40,18 +40,20 @@ Feature: Regression Suite for artasheskocharyan.com
     When the user clicks the Portfolio button in the hero section
     Then the portfolio section should be in the viewport
 
-  @contact @smoke @sanity
+  @contact @smoke @sanity @max_calls=4
   Scenario: TC-006 - Contact form fields are present
     When the user navigates to the contact section
     Then the contact form should be visible
-    And the "Full Name" field should be visible
-    And the "Email Address" field should be visible
-    And the "Subject" field should be visible
-    And the "Phone Number" field should be visible
-    And the "Message" field should be visible
+    And the contact form should show the fields:
+      | Field         |
+      | Full Name     |
+      | Email Address |
+      | Subject       |
+      | Phone Number  |
+      | Message       |
     And the Send Message button should be visible
 
-  @contact
+  @contact @max_calls=4
   Scenario: TC-007 - User can fill out the contact form
     When the user navigates to the contact section
     And the user fills in the contact form with:
@@ -63,7 +65,7 @@ Feature: Regression Suite for artasheskocharyan.com
       | Message       | This is a test message. |
     Then all contact form fields should retain their values
 
-  @contact @validation
+  @contact @validation @max_calls=4
   Scenario: TC-008 - Required fields enforce validation
     When the user navigates to the contact section
     And the user clicks the Send Message button
@@ -126,7 +128,7 @@ Feature: Regression Suite for artasheskocharyan.com
       | GitHub   |
       | LinkedIn |
 
-  @responsive
+  @responsive @device_matrix
   Scenario: TC-016 - Mobile layout hides sidebar and shows content
     Given the user navigates to the home page in mobile view
     Then the sidebar should be hidden
@@ -139,13 +141,15 @@ Feature: Regression Suite for artasheskocharyan.com
     And the meta tag "viewport" should be present
     And the og meta tag "og:title" should be present
 
-  @contact @validation
+  @contact @validation @max_calls=4
   Scenario: TC-018 - Email field rejects invalid format
     When the user navigates to the contact section
-    And the user fills in the "Full Name" field with "Jane Doe"
-    And the user fills in the "Email Address" field with "not-an-email"
-    And the user fills in the "Subject" field with "Test"
-    And the user fills in the "Message" field with "Testing email validation"
+    And the user fills in the contact form with:
+      | Field         | Value                    |
+      | Full Name     | Jane Doe                 |
+      | Email Address | not-an-email             |
+      | Subject       | Test                     |
+      | Message       | Testing email validation |
     And the user clicks the Send Message button
     Then the email field should show a format validation error
 
@@ -168,3 +172,7 @@ Feature: Regression Suite for artasheskocharyan.com
   Scenario: TC-022 - Resume PDF iframe has valid source
     When the user clicks on the "Resume" link
     Then the resume iframe should point to a PDF file
+
+  @links
+  Scenario: TC-023 - All links and assets resolve
+    Then every link and asset on the page should resolve
@@ -18,6 +18,11 @@ def step_verify_field_visible(context, field_name):
     context.contact_page.verify_field_visible(field_name)
 
 
+@then("the contact form should show the fields:")
+def step_verify_fields_visible(context):
+    context.contact_page.verify_fields_visible([row["Field"] for row in context.table])
+
+
 @then("the Send Message button should be visible")
 def step_verify_send_btn_visible(context):
     context.contact_page.verify_send_button_visible()
@@ -25,17 +30,13 @@ def step_verify_send_btn_visible(context):
 
 @when("the user fills in the contact form with:")
 def step_fill_contact_form(context):
-    context.form_data = {}
-    for row in context.table:
-        field, value = row["Field"], row["Value"]
-        context.contact_page.fill_field(field, value)
-        context.form_data[field] = value
+    context.form_data = {row["Field"]: row["Value"] for row in context.table}
+    context.contact_page.fill_fields(context.form_data)
 
 
 @then("all contact form fields should retain their values")
 def step_verify_all_fields_retained(context):
-    for field, value in context.form_data.items():
-        context.contact_page.verify_field_has_value(field, value)
+    context.contact_page.verify_fields_have_values(context.form_data)
 
 
 @when("the user clicks the Send Message button")
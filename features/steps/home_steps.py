@@ -1,6 +1,8 @@
 from behave import given, then, when
 from playwright.sync_api import expect
 
+from support.device_matrix import per_device
+
 
 @given("the user navigates to the home page")
 def step_navigate_to_home(context):
@@ -18,6 +20,7 @@ def step_click_link(context, link_name):
 
 
 @then('the "{heading_text}" heading should be visible')
+@per_device
 def step_verify_heading_visible(context, heading_text):
     context.home_page.verify_heading_visible(heading_text)
 
@@ -56,6 +59,7 @@ def step_verify_sidebar_name(context, name):
 
 
 @then("the hero tagline should be visible")
+@per_device
 def step_verify_tagline(context):
     context.home_page.verify_tagline_visible()
 
@@ -112,7 +116,7 @@ def step_verify_og_meta_tag(context, name):
 def step_verify_heading_in_viewport(context, heading_text):
     heading = context.home_page.HEADINGS.get(heading_text)
     assert heading, f"No heading mapping for '{heading_text}'"
-    expect(context.page.locator(heading)).to_be_in_viewport()
+    expect(context.home_page.locate(heading)).to_be_in_viewport()
 
 
 # --- Email mailto link (TC-021) ---
@@ -122,7 +126,7 @@ def step_verify_heading_in_viewport(context, heading_text):
 def step_verify_mailto_link(context, platform):
     selector = context.home_page.SOCIAL_LINKS.get(platform)
     assert selector, f"No selector for '{platform}'"
-    href = context.page.locator(selector).first.get_attribute("href")
+    href = context.home_page.locate(selector).first.get_attribute("href")
     assert href and href.startswith("mailto:"), f"Expected mailto link, got '{href}'"
 
 
@@ -132,3 +136,20 @@ def step_verify_mailto_link(context, platform):
 @then("the resume iframe should point to a PDF file")
 def step_verify_resume_iframe(context):
     context.home_page.verify_resume_iframe_src()
+
+
+# --- Link and asset resolution (TC-023) ---
+
+
+@then("every link and asset on the page should resolve")
+def step_verify_links_resolve(context):
+    context.home_page.verify_links_resolve()
+
+
+# --- Visual regression (TC-V01..TC-V04) ---
+
+
+@then('the "{region}" should match the visual baseline')
+@per_device
+def step_verify_visual_baseline(context, region):
+    context.home_page.verify_matches_baseline(region, context.scenario.name, context.device)
@@ -2,6 +2,8 @@ import time
 
 from behave import then, when
 
+from support.image_tracker import ImageTracker, describe_failure
+
 
 @when("the user measures the page load time")
 def step_measure_load_time(context):
@@ -18,25 +20,12 @@ def step_verify_load_time(context, max_seconds):
 
 @then("all images should load successfully")
 def step_verify_no_broken_images(context):
-    context.page.wait_for_load_state("networkidle")
-    for attempt in range(3):
-        result = context.page.evaluate("""
-            () => {
-                const images = Array.from(document.images);
-                const broken = images.filter(img => !img.complete || img.naturalWidth === 0);
-                return {
-                    total: images.length,
-                    broken: broken.map(img => img.src)
-                };
-            }
-        """)
-        if len(result["broken"]) == 0:
-            return
-        if attempt < 2:
-            time.sleep(1)
-    assert len(result["broken"]) == 0, (
-        f"{len(result['broken'])} of {result['total']} images failed to load: {result['broken']}"
-    )
+    # Without @track_images there are no network records; the DOM states alone still settle the check
+    tracker = context.images or ImageTracker(context.page)
+    report = tracker.settle()
+    failed = [image for image in report["images"] if image["state"] in ("broken", "pending")]
+    details = "; ".join(f"{image['src'] or '<img>'}: {describe_failure(image)}" for image in failed)
+    assert not failed, f"{len(failed)} of {len(report['images'])} images failed to load: {details}"
 
 
 @then("the total DOM element count should be less than {max_count:d}")
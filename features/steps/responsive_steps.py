@@ -1,12 +1,21 @@
 from behave import given, then
 
+from support.device_matrix import per_device
+
 
 @given("the user navigates to the home page in mobile view")
 def step_navigate_mobile(context):
-    # Close the default desktop context and create a fresh mobile one
-    context.page.close()
-    context.browser_context.close()
+    if context.matrix:
+        # @device_matrix: every profile already has its own context; load them all at once
+        context.matrix.navigate_home()
+        return
+    # Replace the default desktop context with a fresh mobile one (traced instead, if tracing is on)
+    desktop = context.browser_context
     context.browser_context = context.browser.new_context(viewport={"width": 375, "height": 667})
+    if context.tracer:
+        context.tracer.switch_context(context.browser_context)
+    context.page.close()
+    desktop.close()
     context.page = context.browser_context.new_page()
     # Re-create page objects with the new mobile page
     from pages.home_page import HomePage
@@ -18,5 +27,6 @@ def step_navigate_mobile(context):
 
 
 @then("the sidebar should be hidden")
+@per_device
 def step_verify_sidebar_hidden(context):
     context.responsive_page.verify_sidebar_not_in_viewport()
@@ -0,0 +1,27 @@
+@visual
+Feature: Visual Regression Suite for artasheskocharyan.com
+
+  Background:
+    Given the user navigates to the home page
+
+  @ui
+  Scenario: TC-V01 - Hero section matches its baseline
+    Then the "hero" should match the visual baseline
+
+  @ui
+  Scenario: TC-V02 - Sidebar matches its baseline
+    Then the "sidebar" should match the visual baseline
+
+  @portfolio
+  Scenario: TC-V03 - Portfolio grid matches its baseline
+    When the user clicks on the "Portfolio" link
+    Then the "portfolio grid" should match the visual baseline
+
+  @ui
+  Scenario: TC-V04 - Full page matches its baseline
+    Then the "page" should match the visual baseline
+
+  @responsive @device_matrix
+  Scenario: TC-V05 - Mobile layouts match their baselines
+    Given the user navigates to the home page in mobile view
+    Then the "page" should match the visual baseline
@@ -1,126 +1,246 @@
 #!/usr/bin/env python3
-"""Parse all .feature files and generate a test catalog JSON + inject into catalog.html."""
+"""Parse all .feature files and generate a test catalog JSON + inject into catalog.html.
 
+Parsed feature files are cached by content hash in ``reports/catalog_cache.json``
+so only changed files are re-parsed, and the catalog outputs are left untouched
+when nothing they contain has changed.
+"""
+
+import hashlib
 import json
 import re
+from datetime import datetime
 from pathlib import Path
 
 FEATURES_DIR = Path(__file__).parent / "features"
 REPORTS_DIR = Path(__file__).parent / "reports"
 CATALOG_FILE = REPORTS_DIR / "test_catalog.json"
 CATALOG_HTML = REPORTS_DIR / "catalog.html"
+CACHE_FILE = REPORTS_DIR / "catalog_cache.json"
 
+# Bump whenever the parsed output shape changes so stale cache entries are discarded
+PARSER_VERSION = 2
 
-def parse_feature_file(filepath: Path) -> dict:
-    """Parse a .feature file and extract scenarios with tags."""
-    lines = filepath.read_text().splitlines()
+CATALOG_MARKER = "        window.__CATALOG__ = "
 
-    feature_name = ""
-    feature_tags = []
-    scenarios = []
-    current_tags = []
+STEP_KEYWORDS = ("Given ", "When ", "Then ", "And ", "But ", "* ")
+SCENARIO_KEYWORDS = ("Scenario Outline:", "Scenario Template:", "Scenario:", "Example:")
+OUTLINE_KEYWORDS = ("Scenario Outline:", "Scenario Template:")
+EXAMPLES_KEYWORDS = ("Examples:", "Scenarios:")
+DOCSTRING_DELIMITERS = ('"""', "```")
 
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+TAG_RE = re.compile(r"@[^\s@]+")
+TC_ID_RE = re.compile(r"(TC-[A-Z]?\d+)")
+TC_PREFIX_RE = re.compile(r"^TC-[A-Z]?\d+\s*-\s*")
 
-        # Collect tags
-        if line.startswith("@"):
-            tags = re.findall(r"@\w+", line)
-            # Check if next non-empty line is Feature or Scenario
-            j = i + 1
-            while j < len(lines) and lines[j].strip() == "":
-                j += 1
-            if j < len(lines):
-                next_line = lines[j].strip()
-                if next_line.startswith("Feature:"):
-                    feature_tags = tags
-                else:
-                    current_tags = tags
-            i += 1
+
+# ── Tokenizer ───────────────────────────────────────────────────────────────
+
+
+def tokenize(text: str):
+    """Yield ``(kind, value)`` tokens for each meaningful line of Gherkin *text*.
+
+    Kinds: ``tags``, ``feature``, ``background``, ``rule``, ``scenario``,
+    ``outline``, ``examples``, ``step``, ``row`` and ``docstring``. Docstring
+    bodies are yielded verbatim as a single token so their content can never be
+    mistaken for keywords, tags or steps.
+    """
+    docstring_delim = None
+    docstring_lines: list[str] = []
+
+    for raw in text.splitlines():
+        line = raw.strip()
+
+        if docstring_delim is not None:
+            docstring_lines.append(line)
+            if line.startswith(docstring_delim):
+                yield "docstring", docstring_lines
+                docstring_delim = None
+                docstring_lines = []
             continue
 
-        # Feature line
-        if line.startswith("Feature:"):
-            feature_name = line.replace("Feature:", "").strip()
-            i += 1
+        if not line or line.startswith("#"):
             continue
+        if line.startswith("@"):
+            yield "tags", TAG_RE.findall(line.split(" #", 1)[0])
+        elif line.startswith("|"):
+            yield "row", line
+        elif line.startswith(DOCSTRING_DELIMITERS):
+            docstring_delim = line[:3]
+            docstring_lines = [line]
+        elif line.startswith(STEP_KEYWORDS):
+            yield "step", line
+        elif line.startswith("Feature:"):
+            yield "feature", line[len("Feature:") :].strip()
+        elif line.startswith("Background:"):
+            yield "background", line[len("Background:") :].strip()
+        elif line.startswith("Rule:"):
+            yield "rule", line[len("Rule:") :].strip()
+        elif line.startswith(OUTLINE_KEYWORDS):
+            yield "outline", line.split(":", 1)[1].strip()
+        elif line.startswith(SCENARIO_KEYWORDS):
+            yield "scenario", line.split(":", 1)[1].strip()
+        elif line.startswith(EXAMPLES_KEYWORDS):
+            yield "examples", line.split(":", 1)[1].strip()
+        # Anything else is free-form description text and carries no structure
 
-        # Scenario / Scenario Outline
-        if line.startswith("Scenario:") or line.startswith("Scenario Outline:"):
-            is_outline = line.startswith("Scenario Outline:")
-            name = re.sub(r"^Scenario( Outline)?:\s*", "", line)
+    if docstring_delim is not None:
+        # Unterminated docstring — keep what was read rather than dropping it
+        yield "docstring", docstring_lines
 
-            # Extract TC-ID
-            tc_match = re.match(r"(TC-[A-Z]?\d+)", name)
-            tc_id = tc_match.group(1) if tc_match else ""
-            description = re.sub(r"^TC-[A-Z]?\d+\s*-\s*", "", name).strip()
 
-            # Collect steps
-            steps = []
-            j = i + 1
-            examples = []
-            in_examples = False
-            while j < len(lines):
-                step_line = lines[j].strip()
-                if step_line == "" and not in_examples:
-                    j += 1
-                    continue
-                if step_line.startswith("@") or step_line.startswith("Scenario"):
-                    break
-                if step_line.startswith("Examples:"):
-                    in_examples = True
-                    j += 1
-                    continue
-                if in_examples and step_line.startswith("|"):
-                    examples.append(step_line)
-                    j += 1
-                    continue
-                if in_examples and not step_line.startswith("|"):
-                    break
-                if step_line.startswith(("Given ", "When ", "Then ", "And ", "But ")) or step_line.startswith("|"):
-                    steps.append(step_line)
-                j += 1
-
-            # Count example rows (minus header)
-            example_count = max(0, len(examples) - 1) if examples else 0
-
-            all_tags = list(set(feature_tags + current_tags))
-            all_tags.sort()
-
-            scenario = {
-                "tc_id": tc_id,
-                "name": description,
-                "tags": all_tags,
-                "steps": steps,
-                "is_outline": is_outline,
-                "example_count": example_count,
+# ── Parser ──────────────────────────────────────────────────────────────────
+
+
+def parse_feature_text(text: str, filename: str) -> dict:
+    """Parse Gherkin *text* in a single pass over its tokens."""
+    feature_name = ""
+    feature_tags: list[str] = []
+    feature_background: list[str] = []
+    scenarios: list[dict] = []
+
+    rule_name = ""
+    rule_tags: list[str] = []
+    rule_background: list[str] = []
+
+    pending_tags: list[str] = []
+    current: dict | None = None  # scenario being built
+    steps: list[str] | None = None  # where steps/rows/docstrings are appended
+    in_examples = False
+    example_header_seen = False
+
+    for kind, value in tokenize(text):
+        if kind == "tags":
+            pending_tags.extend(value)
+            continue
+
+        if kind == "feature":
+            feature_name = value
+            feature_tags = pending_tags
+            steps = None
+        elif kind == "background":
+            current = None
+            steps = rule_background if rule_name else feature_background
+        elif kind == "rule":
+            current = None
+            rule_name = value
+            rule_tags = pending_tags
+            rule_background = []
+            steps = None
+        elif kind in ("scenario", "outline"):
+            tc_match = TC_ID_RE.match(value)
+            current = {
+                "tc_id": tc_match.group(1) if tc_match else "",
+                "name": TC_PREFIX_RE.sub("", value).strip(),
+                "tags": sorted(set(feature_tags + rule_tags + pending_tags)),
+                "steps": [],
+                "background": feature_background + rule_background,
+                "is_outline": kind == "outline",
+                "example_count": 0,
                 "feature": feature_name,
-                "file": filepath.name,
+                "rule": rule_name,
+                "file": filename,
             }
-            scenarios.append(scenario)
-            current_tags = []
-            i = j
-            continue
+            scenarios.append(current)
+            steps = current["steps"]
+            in_examples = False
+        elif kind == "examples":
+            if current is not None:
+                current["tags"] = sorted(set(current["tags"]) | set(pending_tags))
+                in_examples = True
+                example_header_seen = False
+            steps = None
+        elif kind == "row":
+            if in_examples and current is not None:
+                if example_header_seen:
+                    current["example_count"] += 1
+                example_header_seen = True
+            elif steps is not None:
+                steps.append(value)
+        elif kind == "docstring":
+            if steps is not None:
+                steps.extend(value)
+        elif kind == "step" and steps is not None:
+            steps.append(value)
 
-        i += 1
+        pending_tags = []
 
     return {
         "feature": feature_name,
-        "file": filepath.name,
+        "file": filename,
         "tags": feature_tags,
+        "background": feature_background,
         "scenarios": scenarios,
     }
 
 
-def build_catalog():
-    """Build catalog from all feature files."""
+def parse_feature_file(filepath: Path) -> dict:
+    """Parse a .feature file and extract scenarios with tags."""
+    return parse_feature_text(filepath.read_text(), filepath.name)
+
+
+# ── Cache ───────────────────────────────────────────────────────────────────
+
+
+def _load_cache(cache_file: Path) -> dict:
+    """Load the per-file parse cache, discarding it if written by another parser version."""
+    if not cache_file.exists():
+        return {}
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if cache.get("version") != PARSER_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def _parse_cached(filepath: Path, cached: dict | None) -> tuple[dict, dict, bool]:
+    """Return ``(parsed, cache_entry, reparsed)`` for *filepath*.
+
+    A matching size + mtime skips reading the file at all; otherwise the
+    content hash decides whether the cached parse can be reused.
+    """
+    stat = filepath.stat()
+    if cached and cached.get("size") == stat.st_size and cached.get("mtime_ns") == stat.st_mtime_ns:
+        return cached["parsed"], cached, False
+
+    data = filepath.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    entry = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if cached and cached.get("sha256") == digest:
+        entry["parsed"] = cached["parsed"]
+        return entry["parsed"], entry, False
+
+    entry["parsed"] = parse_feature_text(data.decode("utf-8"), filepath.name)
+    return entry["parsed"], entry, True
+
+
+# ── Catalog ─────────────────────────────────────────────────────────────────
+
+
+def build_catalog(
+    features_dir: Path = FEATURES_DIR,
+    catalog_file: Path = CATALOG_FILE,
+    catalog_html: Path = CATALOG_HTML,
+    cache_file: Path = CACHE_FILE,
+    verbose: bool = True,
+) -> dict:
+    """Build catalog from all feature files, re-parsing only files that changed."""
+    old_cache = _load_cache(cache_file)
+    new_cache = {}
+    reparsed = 0
+
     features = []
-    for f in sorted(FEATURES_DIR.glob("*.feature")):
-        parsed = parse_feature_file(f)
+    for f in sorted(features_dir.glob("*.feature")):
+        parsed, entry, was_parsed = _parse_cached(f, old_cache.get(f.name))
+        new_cache[f.name] = entry
+        reparsed += was_parsed
         if parsed["scenarios"]:
             features.append(parsed)
 
+    cache_dirty = new_cache != old_cache
+
     # Build summary
     all_scenarios = [s for f in features for s in f["scenarios"]]
     all_tags = set()
@@ -150,7 +270,7 @@ def build_catalog():
             suite_map["performance"].append(name)
 
     catalog = {
-        "generated_at": __import__("datetime").datetime.now().isoformat(),
+        "generated_at": datetime.now().isoformat(),
         "total_features": len(features),
         "total_scenarios": len(all_scenarios),
         "total_with_examples": sum(s["example_count"] if s["example_count"] > 0 else 1 for s in all_scenarios),
@@ -159,31 +279,61 @@ def build_catalog():
         "features": features,
     }
 
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    with open(CATALOG_FILE, "w") as f:
+    if cache_dirty:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({"version": PARSER_VERSION, "files": new_cache}))
+
+    if _catalog_unchanged(catalog, catalog_file):
+        if verbose:
+            print(f"📋 Test catalog unchanged: {len(all_scenarios)} test cases across {len(features)} features")
+        return catalog
+
+    catalog_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(catalog_file, "w") as f:
         json.dump(catalog, f, indent=2)
 
     # Inject into catalog.html
-    inject_into_html(catalog)
+    inject_into_html(catalog, catalog_html)
+
+    if verbose:
+        print(
+            f"📋 Test catalog generated: {len(all_scenarios)} test cases across {len(features)} features "
+            f"({reparsed} re-parsed)"
+        )
+        for suite, data in catalog["suites"].items():
+            if data["count"] > 0:
+                print(f"   {suite}: {data['count']} tests")
+    return catalog
+
 
-    print(f"📋 Test catalog generated: {len(all_scenarios)} test cases across {len(features)} features")
-    for suite, data in catalog["suites"].items():
-        if data["count"] > 0:
-            print(f"   {suite}: {data['count']} tests")
+def _catalog_unchanged(catalog: dict, catalog_file: Path) -> bool:
+    """Return True if *catalog_file* already holds *catalog*, ignoring the generation timestamp."""
+    if not catalog_file.exists():
+        return False
+    try:
+        previous = json.loads(catalog_file.read_text())
+    except (json.JSONDecodeError, OSError):
+        return False
+    previous.pop("generated_at", None)
+    current = {k: v for k, v in catalog.items() if k != "generated_at"}
+    return previous == current
 
 
-def inject_into_html(catalog: dict):
+def inject_into_html(catalog: dict, catalog_html: Path = CATALOG_HTML):
     """Inject catalog data into catalog.html."""
-    if not CATALOG_HTML.exists():
+    if not catalog_html.exists():
+        return
+    html = catalog_html.read_text()
+    data_line = f"{CATALOG_MARKER}{json.dumps(catalog)};"
+
+    # Replace the marker line by position rather than regex: the JSON payload may
+    # itself contain ';' or backslashes that a pattern/replacement would mangle.
+    start = html.find(CATALOG_MARKER)
+    if start == -1:
         return
-    html = CATALOG_HTML.read_text()
-    data_line = f"        window.__CATALOG__ = {json.dumps(catalog)};"
-    html = re.sub(
-        r"        window\.__CATALOG__ = .*?;",
-        data_line,
-        html,
-    )
-    CATALOG_HTML.write_text(html)
+    end = html.find("\n", start)
+    end = len(html) if end == -1 else end
+    catalog_html.write_text(html[:start] + data_line + html[end:])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""Generate a lightweight, self-contained HTML report straight from Allure result files.
+
+A pure-Python alternative to ``allure generate`` for quick runs: no JVM, no
+history directory shuffling. Result and container files are streamed one at a
+time, each scenario is rendered to an HTML fragment that is cached per
+result, and trends come from ``reports/run_history.json``.
+
+Usage:
+    python generate_report.py                # all results → reports/quick-report/index.html
+    python generate_report.py smoke          # trend history for the "smoke" tags filter
+"""
+
+import base64
+import html
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from collect_results import ALLURE_RESULTS_DIR, REPORTS_DIR, load_history
+
+REPORT_DIR = REPORTS_DIR / "quick-report"
+FRAGMENT_CACHE = "fragments.json"
+TREND_RUNS = 20
+MAX_INLINE_ATTACHMENT_BYTES = 2 * 1024 * 1024
+STATUS_ORDER = ("failed", "broken", "skipped", "passed", "unknown")
+
+PAGE_STYLE = """
+body { margin: 0; padding: 2rem; background: #121214; color: #e5e5e5; font: 14px/1.5 system-ui, sans-serif; }
+h1 { margin: 0 0 .25rem; font-size: 1.5rem; } h2 { font-size: 1.1rem; margin: 2rem 0 .75rem; color: #a1a1aa; }
+.muted { color: #8b8b93; } .stats { display: flex; gap: 1rem; margin: 1.5rem 0; flex-wrap: wrap; }
+.stat { background: #1c1c1f; border: 1px solid #27272a; border-radius: 10px; padding: .75rem 1.25rem; min-width: 110px; }
+.stat b { display: block; font-size: 1.4rem; } .filters button { background: #1c1c1f; color: inherit; border: 1px solid #3f3f46;
+border-radius: 999px; padding: .3rem .9rem; margin-right: .4rem; cursor: pointer; } .filters button.active { border-color: #6366f1; }
+details { background: #1c1c1f; border: 1px solid #27272a; border-left: 4px solid #52525b; border-radius: 8px; margin: .4rem 0; }
+details.passed { border-left-color: #22c55e; } details.failed { border-left-color: #ef4444; }
+details.broken { border-left-color: #eab308; } summary { padding: .6rem 1rem; cursor: pointer; display: flex; gap: 1rem; align-items: center; }
+summary .name { flex: 1; } .body { padding: 0 1rem 1rem; } .step { display: flex; gap: .75rem; padding: .15rem 0; }
+.step .dur { margin-left: auto; } .s-passed { color: #22c55e; } .s-failed { color: #ef4444; } .s-broken { color: #eab308; }
+.s-skipped, .s-unknown { color: #8b8b93; } pre { background: #0b0b0c; padding: .75rem; border-radius: 6px; overflow-x: auto;
+white-space: pre-wrap; } img.attachment { max-width: 100%; border: 1px solid #27272a; border-radius: 6px; margin-top: .5rem; }
+.strip { display: inline-flex; gap: 2px; } .strip i { width: 6px; height: 14px; border-radius: 2px; background: #3f3f46; }
+.strip i.passed { background: #22c55e; } .strip i.failed { background: #ef4444; } .strip i.broken { background: #eab308; }
+"""
+
+PAGE_SCRIPT = """
+document.querySelectorAll('.filters button').forEach(btn => btn.addEventListener('click', () => {
+    document.querySelectorAll('.filters button').forEach(b => b.classList.toggle('active', b === btn));
+    const status = btn.dataset.status;
+    document.querySelectorAll('details.scenario').forEach(d => {
+        d.style.display = status === 'all' || d.classList.contains(status) ? '' : 'none';
+    });
+}));
+"""
+
+
+# ── Streaming readers ───────────────────────────────────────────────────────
+
+
+def iter_result_files(results_dir: Path, suffix: str):
+    """Yield ``os.DirEntry`` objects for files in *results_dir* ending in *suffix*."""
+    with os.scandir(results_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(suffix) and entry.is_file():
+                yield entry
+
+
+def _read_json(path) -> dict | None:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def load_container_fixtures(results_dir: Path) -> dict[str, list[dict]]:
+    """Map each result uuid to the before/after fixtures of the containers that wrap it."""
+    fixtures: dict[str, list[dict]] = {}
+    for entry in iter_result_files(results_dir, "-container.json"):
+        container = _read_json(entry.path)
+        if not container:
+            continue
+        wrapped = [
+            {"name": fx.get("name", ""), "status": fx.get("status", "unknown"), "kind": kind}
+            for kind in ("befores", "afters")
+            for fx in container.get(kind, [])
+        ]
+        if not wrapped:
+            continue
+        for child in container.get("children", []):
+            fixtures.setdefault(child, []).extend(wrapped)
+    return fixtures
+
+
+def load_scenario_history(
+    tags_filter: str, limit: int = TREND_RUNS, history: list | None = None
+) -> tuple[list[dict], dict[str, list[str]]]:
+    """Return the last *limit* runs for *tags_filter* and each scenario's status across them."""
+    if history is None:
+        history = load_history()
+
+    runs = [r for r in history if r.get("tags_filter", "") == tags_filter][-limit:]
+    statuses: dict[str, list[str]] = {}
+    for i, run in enumerate(runs):
+        for s in run.get("scenarios", []):
+            strip = statuses.setdefault(s["name"], [])
+            strip.extend(["unknown"] * (i - len(strip)))
+            strip.append(s["status"])
+    return runs, statuses
+
+
+# ── Rendering ───────────────────────────────────────────────────────────────
+
+
+def _esc(value) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _duration(ms: int) -> str:
+    return f"{ms / 1000:.2f}s" if ms < 60_000 else f"{ms // 60_000}m {ms % 60_000 / 1000:.0f}s"
+
+
+def _render_attachment(attachment: dict, results_dir: Path, report_dir: Path) -> str:
+    source = attachment.get("source", "")
+    path = results_dir / source
+    name = _esc(attachment.get("name", source))
+    mime = attachment.get("type", "application/octet-stream")
+    if not source or not path.is_file():
+        return f'<div class="muted">📎 {name} (missing)</div>'
+
+    size = path.stat().st_size
+    if size > MAX_INLINE_ATTACHMENT_BYTES:
+        # Too large to inline — copy beside the report and link it
+        target = report_dir / "attachments" / source
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not target.exists():
+            shutil.copyfile(path, target)
+        return f'<div>📎 <a href="attachments/{_esc(source)}">{name}</a> ({size // 1024} KB)</div>'
+
+    if mime.startswith("image/"):
+        data = base64.b64encode(path.read_bytes()).decode()
+        return f'<div>📎 {name}<br><img class="attachment" alt="{name}" src="data:{_esc(mime)};base64,{data}"></div>'
+    text = path.read_text(errors="replace")
+    return f"<div>📎 {name}<pre>{_esc(text)}</pre></div>"
+
+
+def _render_steps(steps: list, results_dir: Path, report_dir: Path) -> str:
+    parts = []
+    for step in steps:
+        status = step.get("status", "unknown")
+        duration = step.get("stop", 0) - step.get("start", 0)
+        parts.append(
+            f'<div class="step"><span class="s-{_esc(status)}">●</span><span>{_esc(step.get("name", ""))}</span>'
+            f'<span class="dur muted">{_duration(duration)}</span></div>'
+        )
+        message = step.get("statusDetails", {}).get("message")
+        if message and status in ("failed", "broken"):
+            parts.append(f"<pre>{_esc(message)}</pre>")
+        parts.extend(_render_attachment(a, results_dir, report_dir) for a in step.get("attachments", []))
+        if step.get("steps"):
+            parts.append(
+                f'<div style="margin-left:1.5rem">{_render_steps(step["steps"], results_dir, report_dir)}</div>'
+            )
+    return "".join(parts)
+
+
+def render_scenario_body(result: dict, fixtures: list[dict], results_dir: Path, report_dir: Path) -> str:
+    """Render the expandable body of one scenario result."""
+    parts = [_render_steps(result.get("steps", []), results_dir, report_dir)]
+    details = result.get("statusDetails", {})
+    if details.get("message"):
+        parts.append(f"<pre>{_esc(details['message'])}</pre>")
+    if details.get("trace"):
+        parts.append(
+            f'<details><summary class="muted">Stack trace</summary><pre>{_esc(details["trace"])}</pre></details>'
+        )
+    parts.extend(_render_attachment(a, results_dir, report_dir) for a in result.get("attachments", []))
+    failed_fixtures = [fx for fx in fixtures if fx["status"] not in ("passed", "unknown")]
+    for fx in failed_fixtures:
+        parts.append(
+            f'<div class="s-{_esc(fx["status"])}">⚙ {fx["kind"][:-1]} fixture "{_esc(fx["name"])}": {fx["status"]}</div>'
+        )
+    return "".join(parts)
+
+
+def _render_strip(statuses: list[str]) -> str:
+    return '<span class="strip">' + "".join(f'<i class="{_esc(s)}"></i>' for s in statuses) + "</span>"
+
+
+def _render_trend(runs: list[dict]) -> str:
+    """Render pass-rate history as an inline SVG polyline."""
+    if len(runs) < 2:
+        return ""
+    width, height = 600, 80
+    step = width / (len(runs) - 1)
+    points = " ".join(f"{i * step:.1f},{height - r.get('pass_rate', 0) / 100 * height:.1f}" for i, r in enumerate(runs))
+    return (
+        f'<h2>Pass rate — last {len(runs)} runs</h2><svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<polyline fill="none" stroke="#6366f1" stroke-width="2" points="{points}"/></svg>'
+    )
+
+
+def _render_page(entries: list[dict], runs: list[dict], strips: dict, tags_filter: str, elapsed_ms: float) -> str:
+    counts = {s: 0 for s in STATUS_ORDER}
+    for e in entries:
+        counts[e["status"] if e["status"] in counts else "unknown"] += 1
+    total = len(entries)
+    pass_rate = round(counts["passed"] / total * 100, 1) if total else 0
+
+    by_feature: dict[str, list[dict]] = {}
+    for e in sorted(
+        entries, key=lambda e: (STATUS_ORDER.index(e["status"]) if e["status"] in STATUS_ORDER else 4, e["name"])
+    ):
+        by_feature.setdefault(e["feature"], []).append(e)
+
+    sections = []
+    for feature, items in sorted(by_feature.items()):
+        sections.append(f"<h2>{_esc(feature)}</h2>")
+        for e in items:
+            sections.append(
+                f'<details class="scenario {_esc(e["status"])}"><summary><span class="s-{_esc(e["status"])}">●</span>'
+                f'<span class="name">{_esc(e["name"])}</span>{_render_strip(strips.get(e["name"], []))}'
+                f'<span class="muted">{_duration(e["duration_ms"])}</span></summary>'
+                f'<div class="body">{e["body"]}</div></details>'
+            )
+
+    stats = "".join(
+        f'<div class="stat"><span class="muted">{label}</span><b>{value}</b></div>'
+        for label, value in (
+            ("Total", total),
+            ("Passed", counts["passed"]),
+            ("Failed", counts["failed"]),
+            ("Broken", counts["broken"]),
+            ("Skipped", counts["skipped"]),
+            ("Pass rate", f"{pass_rate}%"),
+        )
+    )
+    filters = "".join(
+        f'<button data-status="{s}"{" class=active" if s == "all" else ""}>{s.title()}</button>'
+        for s in ("all", "failed", "broken", "skipped", "passed")
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f"<title>Testify Quick Report</title><style>{PAGE_STYLE}</style></head><body>"
+        f'<h1>Testify Quick Report</h1><div class="muted">{_esc(tags_filter or "regression")} · '
+        f"generated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} in {elapsed_ms:.0f} ms</div>"
+        f'<div class="stats">{stats}</div><div class="filters">{filters}</div>{_render_trend(runs)}'
+        f"{''.join(sections)}<script>{PAGE_SCRIPT}</script></body></html>"
+    )
+
+
+# ── Entry point ─────────────────────────────────────────────────────────────
+
+
+def _load_fragment_cache(report_dir: Path) -> dict:
+    cache = _read_json(report_dir / FRAGMENT_CACHE)
+    return cache if isinstance(cache, dict) else {}
+
+
+def _stream_results(results_dir: Path):
+    for entry in iter_result_files(results_dir, "-result.json"):
+        result = _read_json(entry.path)
+        if result:
+            yield result
+
+
+def generate_report(
+    tags_filter: str = "",
+    results_dir: Path = ALLURE_RESULTS_DIR,
+    report_dir: Path = REPORT_DIR,
+    verbose: bool = True,
+    results: list[dict] | None = None,
+    history: list | None = None,
+) -> Path | None:
+    """Render *results_dir* into ``report_dir/index.html``, reusing cached scenario fragments.
+
+    Already-parsed *results* and *history* may be passed in to avoid reading
+    them again; otherwise result files are streamed from *results_dir*.
+    """
+    if not results_dir.exists():
+        if verbose:
+            print("⚠️  No allure-results directory found. Run tests first.")
+        return None
+
+    start = time.perf_counter()
+    report_dir.mkdir(parents=True, exist_ok=True)
+    old_cache = _load_fragment_cache(report_dir)
+    new_cache = {}
+    fixtures = load_container_fixtures(results_dir)
+    runs, strips = load_scenario_history(tags_filter, history=history)
+
+    entries = []
+    reused = 0
+    for result in results if results is not None else _stream_results(results_dir):
+        # A result is immutable once written: uuid + stop time identifies its rendered fragment
+        key = f"{result.get('uuid', '')}:{result.get('stop', 0)}"
+        cached = old_cache.get(key)
+        if cached:
+            new_cache[key] = cached
+            entries.append(cached)
+            reused += 1
+            continue
+
+        labels = {label["name"]: label["value"] for label in result.get("labels", [])}
+        scenario = {
+            "name": result.get("name", "Unknown"),
+            "status": result.get("status", "unknown"),
+            "duration_ms": result.get("stop", 0) - result.get("start", 0),
+            "feature": labels.get("feature", "Ungrouped"),
+            "body": render_scenario_body(result, fixtures.get(result.get("uuid", ""), []), results_dir, report_dir),
+        }
+        new_cache[key] = scenario
+        entries.append(scenario)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    index = report_dir / "index.html"
+    index.write_text(_render_page(entries, runs, strips, tags_filter, elapsed_ms))
+    (report_dir / FRAGMENT_CACHE).write_text(json.dumps(new_cache))
+
+    if verbose:
+        print(
+            f"📊 Quick report generated: {len(entries)} scenarios ({reused} cached) "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms → {index}"
+        )
+    return index
+
+
+if __name__ == "__main__":
+    tags = sys.argv[1] if len(sys.argv) > 1 else ""
+    generate_report(tags)
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""Select the scenarios affected by a change (test impact analysis).
+
+A dependency map is built statically from the sources:
+
+    scenario step → step function (features/steps/*.py)
+                  → page-object methods and selector constants (pages/*.py,
+                    following ``self.`` calls and base classes)
+                  → config keys (config.py) and imported support modules
+
+A git diff against a base ref is mapped to the symbols whose lines it touches,
+and every scenario that reaches one of them is selected, with the reason.
+Changes to anything every scenario runs through (``features/environment.py``,
+modules it imports, ``behave.ini``, ``requirements.txt``) select everything.
+
+Per-file analyses are cached by content hash in ``reports/impact_cache.json``,
+so only changed files are re-analysed.
+
+Usage:
+    python impact.py                          # vs origin/main, print selection + reasons
+    python impact.py --base HEAD~3            # any git ref
+    python impact.py --base origin/main --run # run behave on the selection
+    python impact.py --run --tags=~@visual    # other arguments are passed on to behave
+    python impact.py --format args            # behave --name arguments only
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from generate_catalog import SCENARIO_KEYWORDS, STEP_KEYWORDS, parse_feature_text
+
+ROOT = Path(__file__).parent
+FEATURES_DIR = ROOT / "features"
+STEPS_DIR = FEATURES_DIR / "steps"
+PAGES_DIR = ROOT / "pages"
+ENVIRONMENT_FILE = "features/environment.py"
+CONFIG_FILE = "config.py"
+CACHE_FILE = ROOT / "reports" / "impact_cache.json"
+
+# Bump whenever an analysis shape changes so stale cache entries are discarded
+ANALYZER_VERSION = 1
+
+# Non-Python files every scenario depends on
+GLOBAL_FILES = {"behave.ini", "requirements.txt", ENVIRONMENT_FILE, "features/steps/__init__.py", "pages/__init__.py"}
+STEP_DECORATORS = {"given", "when", "then", "step"}
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+STEP_PARAM_RE = re.compile(r"\{([^{}:]*)(?::([^{}]*))?\}")
+OUTLINE_PARAM_RE = re.compile(r"<[^<>]+>")
+
+
+# ── Source analysis ─────────────────────────────────────────────────────────
+
+
+def _span(node) -> list[int]:
+    """First and last line of *node*, including its decorators."""
+    start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+    return [start, node.end_lineno]
+
+
+def _references(node) -> dict:
+    """``self.X``, ``config.X``, ``context.A.B`` and bare names used inside *node*."""
+    refs = {"self": set(), "config": set(), "context": set(), "names": set()}
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.Attribute) and isinstance(sub.value, ast.Name):
+            if sub.value.id in ("self", "config"):
+                refs[sub.value.id].add(sub.attr)
+        elif isinstance(sub, ast.Attribute) and isinstance(sub.value, ast.Attribute):
+            inner = sub.value
+            if isinstance(inner.value, ast.Name) and inner.value.id == "context":
+                refs["context"].add(f"{inner.attr}.{sub.attr}")
+        elif isinstance(sub, ast.Name):
+            refs["names"].add(sub.id)
+    return {key: sorted(values) for key, values in refs.items()}
+
+
+def _imports(tree) -> dict[str, str]:
+    """Map local names to the first-party module path they were imported from."""
+    imported = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            for alias in node.names:
+                imported[alias.asname or alias.name] = node.module
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                imported[alias.asname or alias.name] = alias.name
+    return {name: path for name, module in imported.items() if (path := _module_path(module))}
+
+
+def _module_path(module: str) -> str | None:
+    """Repository-relative path of a first-party *module*, or None for third-party ones."""
+    candidate = Path(*module.split("."))
+    for path in (candidate.with_suffix(".py"), candidate / "__init__.py"):
+        if (ROOT / path).is_file():
+            return path.as_posix()
+    return None
+
+
+def analyze_python(text: str) -> dict:
+    """Analyse one module: classes and members, functions, step definitions and module facts."""
+    tree = ast.parse(text)
+    analysis = {
+        "imports": _imports(tree),
+        "config": _references(tree)["config"],  # every config key the module reads anywhere
+        "classes": {},
+        "functions": {},
+        "steps": [],
+        "assignments": {},
+        "context_attrs": {},
+    }
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            members = {}
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef):
+                    members[item.name] = {"lines": _span(item), **_references(item)}
+                elif isinstance(item, ast.AnnAssign | ast.Assign):
+                    targets = [item.target] if isinstance(item, ast.AnnAssign) else item.targets
+                    for target in targets:
+                        if isinstance(target, ast.Name):
+                            members[target.id] = {"lines": _span(item), **_references(item)}
+            bases = [b.id for b in node.bases if isinstance(b, ast.Name)]
+            analysis["classes"][node.name] = {"lines": _span(node), "bases": bases, "members": members}
+        elif isinstance(node, ast.FunctionDef):
+            entry = {"lines": _span(node), **_references(node)}
+            for deco in node.decorator_list:
+                if (
+                    isinstance(deco, ast.Call)
+                    and isinstance(deco.func, ast.Name)
+                    and deco.func.id in STEP_DECORATORS
+                    and deco.args
+                    and isinstance(deco.args[0], ast.Constant)
+                ):
+                    analysis["steps"].append({"type": deco.func.id, "pattern": deco.args[0].value, **entry})
+            analysis["functions"][node.name] = entry
+        elif isinstance(node, ast.AnnAssign | ast.Assign):
+            targets = [node.target] if isinstance(node, ast.AnnAssign) else node.targets
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    analysis["assignments"][target.id] = _span(node)
+
+    # ``context.home_page = HomePage(context.page)`` in the hooks
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Name)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Attribute)
+            and isinstance(node.targets[0].value, ast.Name)
+            and node.targets[0].value.id == "context"
+        ):
+            analysis["context_attrs"][node.targets[0].attr] = node.value.func.id
+    return analysis
+
+
+def analyze_feature(text: str, filename: str) -> dict:
+    """Parse a feature file and attach each scenario's line span."""
+    parsed = parse_feature_text(text, filename)
+    lines = text.splitlines()
+    starts = []
+    for number, raw in enumerate(lines, start=1):
+        if raw.strip().startswith(SCENARIO_KEYWORDS):
+            # Tags and comments directly above the title belong to the scenario
+            start = number
+            while start > 1 and lines[start - 2].strip().startswith(("@", "#")):
+                start -= 1
+            starts.append(start)
+    for index, scenario in enumerate(parsed["scenarios"]):
+        end = starts[index + 1] - 1 if index + 1 < len(starts) else len(lines)
+        scenario["lines"] = [starts[index], end]
+    return parsed
+
+
+# ── Cache ───────────────────────────────────────────────────────────────────
+
+
+class AnalysisCache:
+    """Content-hash keyed cache of per-file analyses."""
+
+    def __init__(self, cache_file: Path = CACHE_FILE) -> None:
+        self.cache_file = cache_file
+        self.entries: dict[str, dict] = {}
+        self.used: dict[str, dict] = {}
+        self.analysed = 0
+        try:
+            cache = json.loads(cache_file.read_text())
+            if cache.get("version") == ANALYZER_VERSION:
+                self.entries = cache.get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def analysis(self, path: str, text: str) -> dict:
+        """Return the analysis of *text* (the content of *path*), computing it only if new."""
+        key = hashlib.sha256(f"{path}\0{text}".encode()).hexdigest()
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = analyze_feature(text, Path(path).name) if path.endswith(".feature") else analyze_python(text)
+            self.analysed += 1
+        self.used[key] = entry
+        return entry
+
+    def save(self) -> None:
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_file.write_text(json.dumps({"version": ANALYZER_VERSION, "entries": self.used}))
+
+
+# ── Dependency map ──────────────────────────────────────────────────────────
+
+
+def step_regex(pattern: str) -> re.Pattern:
+    """Compile a behave ``parse`` step pattern into an equivalent full-match regex."""
+    parts, last = [], 0
+    for m in STEP_PARAM_RE.finditer(pattern):
+        parts.append(re.escape(pattern[last : m.start()]))
+        parts.append(r"-?\d+" if m.group(2) == "d" else ".+?")
+        last = m.end()
+    parts.append(re.escape(pattern[last:]))
+    return re.compile("".join(parts) + r"\Z")
+
+
+class DependencyMap:
+    """Static map from each scenario to the symbols it reaches."""
+
+    def __init__(self, sources: dict[str, str], cache: AnalysisCache) -> None:
+        self.analyses = {path: cache.analysis(path, text) for path, text in sources.items()}
+        self.classes: dict[str, tuple[str, dict]] = {}
+        for path, analysis in self.analyses.items():
+            if path.startswith("pages/"):
+                for name, cls in analysis["classes"].items():
+                    self.classes[name] = (path, cls)
+        environment = self.analyses.get(ENVIRONMENT_FILE, {})
+        # Only attributes holding page objects matter (not the live sink, tracer, ...)
+        self.context_attrs = {
+            attr: cls for attr, cls in environment.get("context_attrs", {}).items() if cls in self.classes
+        }
+        self.step_defs = [
+            (path, step, step_regex(step["pattern"]))
+            for path, analysis in sorted(self.analyses.items())
+            if path.startswith("features/steps/")
+            for step in analysis["steps"]
+        ]
+        self._member_deps: dict[str, set[str]] = {}
+
+    # ── Symbols ─────────────────────────────────────────────────────────
+
+    def resolve_member(self, class_name: str, member: str) -> tuple[str, str] | None:
+        """Return ``(symbol, class)`` for *member* looked up on *class_name* and its bases."""
+        seen = set()
+        queue = [class_name]
+        while queue:
+            name = queue.pop(0)
+            if name in seen or name not in self.classes:
+                continue
+            seen.add(name)
+            path, cls = self.classes[name]
+            if member in cls["members"]:
+                return f"{path}::{name}.{member}", name
+            queue.extend(cls["bases"])
+        return None
+
+    def member_deps(self, class_name: str, member: str) -> set[str]:
+        """Symbols reached from a page-object member: itself, ``self.`` members (transitively) and config keys."""
+        resolved = self.resolve_member(class_name, member)
+        if resolved is None:
+            return set()
+        symbol, owner = resolved
+        key = f"{class_name}.{member}"
+        if key in self._member_deps:
+            return self._member_deps[key]
+        deps = {symbol}
+        self._member_deps[key] = deps  # recursion guard for mutually calling methods
+        _, cls = self.classes[owner]
+        info = cls["members"][member]
+        deps.update(f"{CONFIG_FILE}::{key}" for key in info["config"])
+        for ref in info["self"]:
+            # Resolve on the instance's class, not the owner, so overrides in subclasses count
+            deps |= self.member_deps(class_name, ref)
+        return deps
+
+    def function_deps(self, path: str, info: dict, seen: set | None = None) -> set[str]:
+        """Symbols reached from a step or helper function in the steps module *path*."""
+        seen = seen if seen is not None else set()
+        analysis = self.analyses[path]
+        deps = {f"{CONFIG_FILE}::{key}" for key in info["config"]}
+        for chain in info["context"]:
+            attr, member = chain.split(".", 1)
+            if attr in self.context_attrs:
+                deps |= self.member_deps(self.context_attrs[attr], member)
+        for name in info["names"]:
+            if name in analysis["functions"] and name not in seen and not name.startswith("step_"):
+                seen.add(name)
+                deps.add(f"{path}::{name}")
+                deps |= self.function_deps(path, analysis["functions"][name], seen)
+            if name in analysis["imports"]:
+                module = analysis["imports"][name]
+                deps.add(module)
+                deps |= {f"{CONFIG_FILE}::{key}" for key in self.analyses.get(module, {}).get("config", [])}
+        return deps
+
+    def match_step(self, step_type: str, text: str) -> list[tuple[str, dict]]:
+        """All step definitions that could run *text* (conservative: every match, not just the first)."""
+        candidates = [text]
+        if OUTLINE_PARAM_RE.search(text):
+            candidates.append(OUTLINE_PARAM_RE.sub("0", text))  # typed params in outlines
+        return [
+            (path, step)
+            for path, step, regex in self.step_defs
+            if step["type"] in (step_type, "step") and any(regex.match(c) for c in candidates)
+        ]
+
+    # ── Scenarios ───────────────────────────────────────────────────────
+
+    def scenarios(self) -> list[dict]:
+        """Every scenario with ``deps``: ``{symbol: reason}``."""
+        results = []
+        for path, analysis in sorted(self.analyses.items()):
+            if not path.endswith(".feature"):
+                continue
+            for scenario in analysis["scenarios"]:
+                deps = {f"{path}#L{scenario['lines'][0]}": "the scenario itself changed"}
+                step_type = "given"
+                for line in scenario["background"] + scenario["steps"]:
+                    if not line.startswith(STEP_KEYWORDS):
+                        continue  # data table rows and docstrings
+                    keyword, text = line.split(" ", 1)
+                    if keyword in ("Given", "When", "Then"):
+                        step_type = keyword.lower()
+                    for step_path, step in self.match_step(step_type, text.strip()):
+                        reason = f'via step "{text.strip()}"'
+                        deps.setdefault(f"{step_path}::step '{step['pattern']}'", reason)
+                        for symbol in self.function_deps(step_path, step):
+                            deps.setdefault(symbol, reason)
+                for cls in self.context_attrs.values():
+                    # Every page object is built for every scenario
+                    for symbol in self.member_deps(cls, "__init__"):
+                        deps.setdefault(symbol, "page objects are created for every scenario")
+                results.append({**scenario, "path": path, "deps": deps})
+        return results
+
+    def global_modules(self) -> set[str]:
+        """Modules and config keys that every scenario runs through (hooks and what they import)."""
+        environment = self.analyses.get(ENVIRONMENT_FILE, {"imports": {}, "config": []})
+        modules = {m for m in environment["imports"].values() if not m.startswith("pages/")} - {CONFIG_FILE}
+        keys = {f"{CONFIG_FILE}::{key}" for key in environment["config"]}
+        for module in list(modules):
+            keys |= {f"{CONFIG_FILE}::{key}" for key in self.analyses.get(module, {}).get("config", [])}
+        return modules | keys
+
+    # ── Changed lines → symbols ─────────────────────────────────────────
+
+    def symbols_at(self, path: str, lines: set[int], analysis: dict) -> set[str]:
+        """Symbols of *path* whose definitions overlap *lines*; module-level lines mean every symbol."""
+        if path.endswith(".feature"):
+            hit = {f"{path}#L{s['lines'][0]}" for s in analysis["scenarios"] if _overlaps(s["lines"], lines)}
+            covered = set().union(*(range(s["lines"][0], s["lines"][1] + 1) for s in analysis["scenarios"]))
+            if lines - covered:  # feature header, background or rule: every scenario in the file
+                hit |= {f"{path}#L{s['lines'][0]}" for s in analysis["scenarios"]}
+            return hit
+
+        spans: dict[str, list[int]] = {}
+        for name, cls in analysis["classes"].items():
+            for member, info in cls["members"].items():
+                spans[f"{path}::{name}.{member}"] = info["lines"]
+        for step in analysis["steps"]:
+            spans[f"{path}::step '{step['pattern']}'"] = step["lines"]
+        for name, info in analysis["functions"].items():
+            spans.setdefault(f"{path}::{name}", info["lines"])
+        if path == CONFIG_FILE:
+            spans.update({f"{CONFIG_FILE}::{key}": span for key, span in analysis["assignments"].items()})
+
+        hit = {symbol for symbol, span in spans.items() if _overlaps(span, lines)}
+        covered = set().union(*(range(s[0], s[1] + 1) for s in spans.values())) if spans else set()
+        if lines - covered:
+            # Imports or other module-level code: treat the whole module as changed
+            hit |= set(spans) | {path}
+        return hit
+
+
+def _code_lines(text: str, lines: set[int]) -> set[int]:
+    """Drop blank and comment-only lines, which cannot change behaviour."""
+    source = text.splitlines()
+    kept = set()
+    for n in lines:
+        stripped = source[n - 1].strip() if n <= len(source) else ""
+        if stripped and not stripped.startswith("#"):
+            kept.add(n)
+    return kept
+
+
+def _overlaps(span: list[int], lines: set[int]) -> bool:
+    return any(span[0] <= line <= span[1] for line in lines)
+
+
+# ── Git ─────────────────────────────────────────────────────────────────────
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+
+
+def changed_lines(base: str) -> tuple[dict[str, tuple[set[int], set[int]]], str]:
+    """Map each changed file to ``(old_lines, new_lines)`` between *base* and the working tree.
+
+    Returns the map and the merge base the diff was taken against.
+    """
+    try:
+        merge_base = _git("merge-base", base, "HEAD").strip()
+    except subprocess.CalledProcessError:
+        merge_base = base
+    diff = _git("diff", "-U0", "--no-color", "--no-renames", merge_base)
+    changes: dict[str, tuple[set[int], set[int]]] = {}
+    old_path = new_path = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            old_path = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            new_path = line[6:] if line.startswith("+++ b/") else None
+            changes.setdefault(new_path or old_path, (set(), set()))
+        elif m := HUNK_RE.match(line):
+            old_start, old_count = int(m.group(1)), int(m.group(2) or 1)
+            new_start, new_count = int(m.group(3)), int(m.group(4) or 1)
+            old_lines, new_lines = changes[new_path or old_path]
+            old_lines.update(range(old_start, old_start + old_count))
+            new_lines.update(range(new_start, new_start + new_count))
+            if new_count == 0:
+                new_lines.add(max(new_start, 1))  # pure deletion: the surrounding symbol changed
+    changes.update({path: (set(), set()) for path in _git("ls-files", "--others", "--exclude-standard").split()})
+    return {path: lines for path, lines in changes.items() if path}, merge_base
+
+
+def _old_text(ref: str, path: str) -> str | None:
+    try:
+        return _git("show", f"{ref}:{path}")
+    except subprocess.CalledProcessError:
+        return None
+
+
+def current_sources() -> dict[str, str]:
+    """Repository-relative path → text of every file the map is built from."""
+    files = [ROOT / CONFIG_FILE, FEATURES_DIR / "environment.py"]
+    files += sorted(FEATURES_DIR.glob("*.feature")) + sorted(STEPS_DIR.glob("*.py")) + sorted(PAGES_DIR.glob("*.py"))
+    files += sorted((ROOT / "support").glob("*.py"))
+    return {f.relative_to(ROOT).as_posix(): f.read_text() for f in files if f.is_file()}
+
+
+# ── Selection ───────────────────────────────────────────────────────────────
+
+
+def select(base: str, cache: AnalysisCache | None = None) -> dict:
+    """Return ``{"changed", "scenarios", "selected", "all"}`` for the diff against *base*."""
+    cache = cache or AnalysisCache()
+    sources = current_sources()
+    dep_map = DependencyMap(sources, cache)
+    diff, merge_base = changed_lines(base)
+
+    changed: set[str] = set()
+    for path, (old_lines, new_lines) in diff.items():
+        if path in GLOBAL_FILES:
+            changed.add(path)
+            continue
+        if not path.endswith((".py", ".feature")):
+            continue
+        if path not in sources:
+            changed.add(path)  # other first-party module (e.g. one the hooks import), or a deleted file
+        else:
+            # Untracked files have no hunks: every line is new
+            lines = _code_lines(sources[path], new_lines or set(range(1, len(sources[path].splitlines()) + 1)))
+            changed |= dep_map.symbols_at(path, lines, dep_map.analyses[path])
+        if path.endswith(".py") and old_lines and (old := _old_text(merge_base, path)) is not None:
+            try:
+                changed |= dep_map.symbols_at(path, _code_lines(old, old_lines), cache.analysis(path, old))
+            except SyntaxError:
+                changed.add(path)
+
+    global_hits = changed & (dep_map.global_modules() | GLOBAL_FILES)
+    if CONFIG_FILE in changed:
+        global_hits.add(CONFIG_FILE)  # module-level code in config.py
+    scenarios = dep_map.scenarios()
+    selected = []
+    for scenario in scenarios:
+        if global_hits:
+            reasons = [f"{symbol} (runs for every scenario)" for symbol in sorted(global_hits)]
+        else:
+            reasons = [f"{symbol} {scenario['deps'][symbol]}" for symbol in sorted(changed & set(scenario["deps"]))]
+        if reasons:
+            selected.append({**scenario, "reasons": reasons})
+    cache.save()
+    return {"base": merge_base, "changed": sorted(changed), "scenarios": scenarios, "selected": selected}
+
+
+def name_pattern(scenario: dict) -> str:
+    """A behave ``--name`` regex matching exactly this scenario (outline rows included)."""
+    if scenario["tc_id"]:
+        return rf"^{re.escape(scenario['tc_id'])}\b"
+    return "^" + OUTLINE_PARAM_RE.sub(".*", re.escape(scenario["name"]))
+
+
+def behave_args(selection: dict) -> list[str]:
+    args = []
+    for scenario in selection["selected"]:
+        args += ["--name", name_pattern(scenario)]
+    return args
+
+
+def print_selection(selection: dict, base: str) -> None:
+    selected, total = selection["selected"], len(selection["scenarios"])
+    print(f"🎯 Impact vs {base}: {len(selection['changed'])} changed symbols → {len(selected)} of {total} scenarios")
+    for symbol in selection["changed"]:
+        print(f"   Δ {symbol}")
+    for scenario in selected:
+        title = f"{scenario['tc_id']} - {scenario['name']}" if scenario["tc_id"] else scenario["name"]
+        print(f"✔ {title}  [{scenario['file']}]")
+        for reason in scenario["reasons"][:5]:
+            print(f"     ← {reason}")
+        if len(scenario["reasons"]) > 5:
+            print(f"     ← … {len(scenario['reasons']) - 5} more")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Select scenarios affected by a git diff.")
+    parser.add_argument("--base", default="origin/main", help="Git ref to diff against (default: origin/main)")
+    parser.add_argument("--format", choices=("text", "args", "json"), default="text", help="Output format")
+    parser.add_argument("--run", action="store_true", help="Run behave on the selected scenarios")
+    args, extra = parser.parse_known_args()
+    if extra and not args.run:
+        parser.error(f"unrecognized arguments: {' '.join(extra)} (only --run passes arguments on to behave)")
+
+    selection = select(args.base)
+    if args.format == "args":
+        print(" ".join(f"'{a}'" for a in behave_args(selection)))
+    elif args.format == "json":
+        out = [{k: s[k] for k in ("tc_id", "name", "file", "reasons")} for s in selection["selected"]]
+        print(json.dumps({"base": selection["base"], "changed": selection["changed"], "selected": out}, indent=2))
+    else:
+        print_selection(selection, args.base)
+
+    if args.run:
+        if not selection["selected"]:
+            print("✅ No scenarios affected — nothing to run")
+            sys.exit(0)
+        command = [sys.executable, "-m", "behave", "--no-capture", *behave_args(selection), *extra]
+        sys.exit(subprocess.call(command, cwd=ROOT))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Append-only live result stream written while Behave is still running.
+
+``features/environment.py`` appends one JSON line per finished scenario (with
+per-step timings) to ``reports/live_results.jsonl`` and flushes it to disk
+immediately, so a long run can be followed live and a crashed run still
+leaves every completed scenario behind. ``collect_results.py`` merges the
+stream with the Allure results, preferring Allure where both exist.
+
+Usage:
+    python live_results.py            # print the current (latest) session
+    python live_results.py --follow   # tail the stream as scenarios finish
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPORTS_DIR = Path(__file__).parent / "reports"
+LIVE_RESULTS_FILE = REPORTS_DIR / "live_results.jsonl"
+
+STATUS_ICONS = {"passed": "✅", "failed": "❌", "error": "💥", "skipped": "⏭️", "untested": "⏭️"}
+
+
+def _status_name(status) -> str:
+    """Normalise a Behave ``Status`` enum (or plain string) to its lowercase name."""
+    return getattr(status, "name", str(status)).lower()
+
+
+class LiveResultSink:
+    """Crash-safe JSONL writer for scenario results.
+
+    Each record is written with a single ``write`` call, flushed and (by
+    default) fsynced, so readers only ever see whole lines plus at most one
+    truncated trailing line, which they skip.
+    """
+
+    def __init__(self, path: Path = LIVE_RESULTS_FILE, session: str | None = None, fsync: bool = True) -> None:
+        self.path = path
+        # Parallel workers share a session id through the environment so their records group together
+        self.session = session or os.getenv("TESTIFY_SESSION") or uuid.uuid4().hex[:12]
+        self.fsync = fsync
+        self._file = None
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        """Open the stream for appending and write the session header."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115 — held open for the whole run
+        self.emit({"event": "session_start", "pid": os.getpid()})
+
+    def close(self) -> None:
+        """Write the session footer and close the stream."""
+        if self._file is None:
+            return
+        self.emit({"event": "session_end"})
+        self._file.close()
+        self._file = None
+
+    def emit(self, record: dict) -> None:
+        """Append *record* as one line and push it to disk."""
+        if self._file is None:
+            return
+        with self._lock:
+            self._seq += 1
+            record = {
+                "session": self.session,
+                "seq": self._seq,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                **record,
+            }
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def emit_scenario(self, scenario, extra: dict | None = None) -> None:
+        """Record a finished Behave *scenario* with its step timings, plus any *extra* fields."""
+        steps = [
+            {
+                "keyword": step.keyword,
+                "name": step.name,
+                "status": _status_name(step.status),
+                "duration_ms": round(step.duration * 1000),
+            }
+            for step in scenario.all_steps
+        ]
+        failed = next((s for s in scenario.all_steps if _status_name(s.status) in ("failed", "error")), None)
+        self.emit(
+            {
+                "event": "scenario",
+                "name": scenario.name,
+                "feature": scenario.feature.name,
+                "location": str(scenario.location),
+                "tags": list(scenario.effective_tags),
+                "status": _status_name(scenario.status),
+                "duration_ms": round(scenario.duration * 1000),
+                "steps": steps,
+                "error": str(failed.error_message).split("\n")[0] if failed and failed.error_message else None,
+                **(extra or {}),
+            }
+        )
+
+
+# ── Readers ─────────────────────────────────────────────────────────────────
+
+
+def iter_records(path: Path = LIVE_RESULTS_FILE, offset: int = 0):
+    """Yield ``(record, next_offset)`` for each complete line from byte *offset* on."""
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # partially written tail — picked up on the next read
+            offset += len(line)
+            try:
+                yield json.loads(line), offset
+            except json.JSONDecodeError:
+                continue
+
+
+def read_session_records(path: Path = LIVE_RESULTS_FILE, session: str | None = None) -> list[dict]:
+    """Return every record of *session* (default: the most recent one)."""
+    by_session: dict[str, list[dict]] = {}
+    latest = None
+    for record, _ in iter_records(path):
+        sid = record.get("session")
+        if record.get("event") == "session_start":
+            latest = sid
+        by_session.setdefault(sid, []).append(record)
+    return by_session.get(session or latest, [])
+
+
+def read_session(path: Path = LIVE_RESULTS_FILE, session: str | None = None) -> list[dict]:
+    """Return the scenario records of *session* (default: the most recent one)."""
+    return [r for r in read_session_records(path, session) if r.get("event") == "scenario"]
+
+
+def first_failure(records: list[dict]) -> dict | None:
+    """Summarise how soon a session reported its first failed scenario.
+
+    Returns ``{"mode", "time_to_first_failure_s", "first_failure", "position"}``
+    (the last three are None if nothing failed), or None for an empty session.
+    """
+    starts = [r["timestamp"] for r in records if r.get("event") == "session_start"]
+    scenarios = sorted((r for r in records if r.get("event") == "scenario"), key=lambda r: r["timestamp"])
+    if not starts or not scenarios:
+        return None
+    ordering = next((r for r in records if r.get("event") == "ordering"), None)
+    summary = {
+        "mode": ordering["mode"] if ordering else "file",
+        "time_to_first_failure_s": None,
+        "first_failure": None,
+        "position": None,
+    }
+    for position, record in enumerate(scenarios, start=1):
+        if record["status"] in ("failed", "error"):
+            elapsed = datetime.fromisoformat(record["timestamp"]) - datetime.fromisoformat(min(starts))
+            summary.update(
+                time_to_first_failure_s=round(elapsed.total_seconds(), 1),
+                first_failure=record["name"].strip(),
+                position=position,
+            )
+            break
+    return summary
+
+
+def to_history_scenarios(records: list[dict]) -> list[dict]:
+    """Convert live records into the scenario shape stored in ``run_history.json``."""
+    scenarios = []
+    for r in records:
+        status = "broken" if r["status"] == "error" else r["status"]
+        tags = [t for t in r.get("tags", []) if t not in ("regression", "accessibility", "performance")]
+        scenarios.append(
+            {
+                "name": r["name"],
+                "status": status,
+                "duration_ms": r["duration_ms"],
+                "tags": tags[0] if tags else "",
+                "source": "live",
+                **({"ipc_calls": r["ipc_calls"]} if "ipc_calls" in r else {}),
+                **({"browser": r["browser"], "environment": r["environment"]} if "environment" in r else {}),
+            }
+        )
+    return scenarios
+
+
+def _print_record(record: dict) -> None:
+    if record.get("event") == "session_start":
+        print(f"▶ Session {record['session']} started {record['timestamp']}")
+    elif record.get("event") == "session_end":
+        print(f"◼ Session {record['session']} finished {record['timestamp']}")
+    elif record.get("event") == "ordering":
+        print(f"↕ Scenario order: {record['mode']} ({record['scenarios']} scenarios)")
+    elif record.get("event") == "scenario":
+        icon = STATUS_ICONS.get(record["status"], "•")
+        line = f"{icon} {record['name']} [{record['status']}] {record['duration_ms'] / 1000:.1f}s"
+        if record.get("error"):
+            line += f" — {record['error']}"
+        print(line, flush=True)
+        for device, result in record.get("devices", {}).items():
+            icon = STATUS_ICONS.get(result["status"], "•")
+            print(f"    {icon} {device} {result['navigate_ms'] / 1000:.1f}s", flush=True)
+
+
+def follow(path: Path = LIVE_RESULTS_FILE, interval: float = 0.5) -> None:
+    """Print records as they are appended, like ``tail -f``."""
+    offset = 0
+    try:
+        while True:
+            if path.exists() and path.stat().st_size < offset:
+                offset = 0  # stream was reset for a new run
+            for record, next_offset in iter_records(path, offset):
+                _print_record(record)
+                offset = next_offset
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show or follow the live scenario result stream.")
+    parser.add_argument("--follow", "-f", action="store_true", help="Keep printing results as they arrive")
+    parser.add_argument("--file", type=Path, default=LIVE_RESULTS_FILE, help="Stream to read")
+    args = parser.parse_args()
+    if args.follow:
+        follow(args.file)
+    else:
+        for rec in read_session_records(args.file):
+            _print_record(rec)
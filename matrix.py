@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Run the suite on a browser-by-environment matrix.
+
+Each cell (e.g. ``firefox/staging``) is a Behave process with its own
+``BROWSER`` and ``BASE_URL``. Every browser engine is launched once, as a
+Playwright browser server, and all environments of that engine connect to it
+(``BROWSER_WS_ENDPOINT``), each in its own browser contexts. Cells run
+concurrently, at most ``--jobs`` at a time (default: one per CPU).
+
+Scenario names get a `` [browser/env]`` suffix and Allure ``browser`` and
+``environment`` labels, so every result in Allure, the live stream and
+``run_history.json`` carries its cell. ``collect_results.py`` then lists the
+scenarios whose outcome differs between cells. Each cell's Behave output, JUnit
+files, step profile and selector profile are in ``reports/matrix/<browser>-<env>/``.
+
+Usage (through orchestrate.py / run_tests.sh):
+    ./run_tests.sh --browsers=chromium,firefox,webkit smoke
+    ./run_tests.sh --browsers=chromium,webkit --envs=staging=https://staging.example.com,prod=https://example.com
+    ./run_tests.sh --envs=https://staging.example.com,https://artasheskocharyan.com --jobs=2
+"""
+
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import config
+
+logger = logging.getLogger("testify")
+
+SCRIPT_DIR = Path(__file__).parent
+MATRIX_DIR = SCRIPT_DIR / "reports" / "matrix"
+SERVER_START_TIMEOUT_S = 30
+
+
+@dataclass(frozen=True)
+class Cell:
+    """One browser and environment combination."""
+
+    browser: str
+    env: str
+    base_url: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.browser}/{self.env}"
+
+    @property
+    def dir(self) -> Path:
+        return cell_dir(self.browser, self.env)
+
+
+def cell_dir(browser: str, env: str) -> Path:
+    """Output directory of the *browser*/*env* cell (also used from inside the cell's Behave run)."""
+    return MATRIX_DIR / f"{browser}-{env}"
+
+
+def parse_envs(spec: str) -> dict[str, str]:
+    """``name=url,name=url`` (a bare URL is named after its host) → ``{name: url}``."""
+    envs = {}
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        name, sep, url = item.partition("=")
+        if not sep:
+            url, name = item, urlparse(item).hostname or item
+        envs[name] = url
+    return envs
+
+
+def parse_cells(browsers: str | None, envs: str | None) -> list[Cell]:
+    """Every combination of the comma-separated *browsers* and *envs* (defaults: the configured ones)."""
+    engines = [b.strip() for b in (browsers or config.BROWSER).split(",") if b.strip()]
+    unknown = [b for b in engines if b not in ("chromium", "firefox", "webkit")]
+    if unknown:
+        raise ValueError(f"Unknown browser(s) {', '.join(unknown)}: use chromium, firefox or webkit")
+    targets = parse_envs(envs) if envs else {"default": os.getenv("BASE_URL", config.BASE_URL)}
+    return [Cell(browser, env, url) for browser in engines for env, url in targets.items()]
+
+
+# ── Browser servers ─────────────────────────────────────────────────────────
+
+
+class BrowserServer:
+    """One browser engine launched once through ``playwright launch-server`` and shared over WebSocket."""
+
+    def __init__(self, browser: str, headless: bool = config.HEADLESS) -> None:
+        self.browser = browser
+        self.headless = headless
+        self.ws_endpoint: str | None = None
+        self._process: subprocess.Popen | None = None
+
+    def start(self) -> str | None:
+        """Launch the engine and return its WebSocket endpoint, or None if it could not be started."""
+        MATRIX_DIR.mkdir(parents=True, exist_ok=True)
+        launch_config = MATRIX_DIR / f"{self.browser}-server.json"
+        launch_config.write_text(json.dumps({"headless": self.headless}))
+        command = [sys.executable, "-m", "playwright", "launch-server", "--browser", self.browser]
+        self._process = subprocess.Popen(
+            [*command, "--config", str(launch_config)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        lines: queue.Queue = queue.Queue()
+        threading.Thread(target=lambda: [lines.put(line) for line in self._process.stdout], daemon=True).start()
+        deadline = time.monotonic() + SERVER_START_TIMEOUT_S
+        while time.monotonic() < deadline and self._process.poll() is None:
+            try:
+                line = lines.get(timeout=0.2).strip()
+            except queue.Empty:
+                continue
+            if line.startswith("ws://"):
+                self.ws_endpoint = line
+                return line
+        logger.warning("Could not start a shared %s server; its cells will launch their own browser", self.browser)
+        self.stop()
+        return None
+
+    def stop(self) -> None:
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+
+
+# ── Scheduling ──────────────────────────────────────────────────────────────
+
+
+def run_cell(cell: Cell, behave_args: list[str], ws_endpoint: str | None, session: str) -> dict:
+    """Run Behave for one *cell*; its output goes to ``<cell dir>/behave.log``."""
+    cell.dir.mkdir(parents=True, exist_ok=True)
+    env = {
+        **os.environ,
+        "BROWSER": cell.browser,
+        "BASE_URL": cell.base_url,
+        "MATRIX_ENV": cell.env,
+        "BROWSER_WS_ENDPOINT": ws_endpoint or "",
+        "TESTIFY_SESSION": session,  # one live stream session for the whole matrix
+    }
+    command = [sys.executable, "-m", "behave", "--no-capture", "--junit-directory", str(cell.dir), *behave_args]
+    start = time.perf_counter()
+    with open(cell.dir / "behave.log", "w") as log:
+        exit_code = subprocess.call(command, cwd=SCRIPT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    seconds = time.perf_counter() - start
+    icon = "✅" if exit_code == 0 else "❌"
+    print(f"{icon} {cell.label:<28} {seconds:7.1f}s  (exit {exit_code}, log: {cell.dir / 'behave.log'})", flush=True)
+    return {"cell": cell.label, "base_url": cell.base_url, "exit_code": exit_code, "seconds": round(seconds, 1)}
+
+
+def run_matrix(cells: list[Cell], behave_args: list[str], jobs: int | None = None) -> dict:
+    """Run every cell, sharing one browser server per engine; returns per-cell exit codes and timings."""
+    jobs = max(1, min(len(cells), jobs or os.cpu_count() or 1))
+    shutil.rmtree(MATRIX_DIR, ignore_errors=True)
+    session = os.getenv("TESTIFY_SESSION") or uuid.uuid4().hex[:12]
+    start = time.perf_counter()
+
+    servers = {browser: BrowserServer(browser) for browser in dict.fromkeys(c.browser for c in cells)}
+    with ThreadPoolExecutor(max_workers=len(servers)) as pool:
+        endpoints = dict(zip(servers, pool.map(BrowserServer.start, servers.values()), strict=True))
+    print(f"🧮 Matrix: {len(cells)} cells on {len(servers)} engine(s), {jobs} at a time")
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(lambda cell: run_cell(cell, behave_args, endpoints[cell.browser], session), cells))
+    finally:
+        for server in servers.values():
+            server.stop()
+    return {
+        "cells": results,
+        "jobs": jobs,
+        "shared_engines": sorted(b for b, endpoint in endpoints.items() if endpoint),
+        "wall_s": round(time.perf_counter() - start, 1),
+    }
+
+
+def label_cell(features, label: str) -> None:
+    """Suffix every scenario (and outline) name in the parsed *features* with `` [label]``."""
+    suffix = f" [{label}]"
+    for feature in features:
+        for scenario in feature.walk_scenarios(with_outlines=True):
+            if suffix not in scenario.name:  # outline rows built after the rename already carry it
+                scenario.name += suffix
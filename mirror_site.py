@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""Mirror the target site to disk and serve it locally for offline, low-latency runs.
+
+``crawl`` fetches every same-origin page, asset and document (the resume PDF)
+reachable from ``config.BASE_URL``. Off-site assets (fonts, CDN scripts) are
+mirrored too. Links to other sites, such as the social links, are left
+untouched. Absolute URLs to the site are rewritten to root-relative ones, and
+off-site asset URLs to ``/__ext__/<host>/...``, so the mirror works from any
+host and port.
+
+Each crawl is an immutable snapshot in ``mirrors/<snapshot id>/``. Bodies are
+stored once by SHA-256 under ``objects/``, and ``manifest.json`` maps request
+paths to objects and content types. ``mirrors/LATEST`` names the newest
+snapshot.
+
+Usage:
+    python mirror_site.py crawl                        # snapshot config.BASE_URL
+    python mirror_site.py list                         # show available snapshots
+    python mirror_site.py serve --port 8100            # serve the latest snapshot
+    python mirror_site.py serve --snapshot 20261019T101500Z
+    BASE_URL=http://127.0.0.1:8100 ./run_tests.sh      # run against it
+    ./run_tests.sh --mirror smoke                      # or let orchestrate.py start it
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from html.parser import HTMLParser
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+from urllib.error import HTTPError, URLError
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import Request, urlopen
+
+import config
+from serve_reports import ReportRequestHandler
+
+MIRRORS_DIR = Path(__file__).parent / "mirrors"
+LATEST_FILE = MIRRORS_DIR / "LATEST"
+EXTERNAL_PREFIX = "/__ext__/"
+USER_AGENT = "Mozilla/5.0 (compatible; TestifyMirror/1.0)"
+FETCH_TIMEOUT_S = 30
+TEXT_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+
+# Attributes that load a resource into the page (mirrored from any host)
+ASSET_ATTRS = {
+    "img": ("src", "srcset"),
+    "source": ("src", "srcset"),
+    "script": ("src",),
+    "link": ("href",),
+    "video": ("src", "poster"),
+    "audio": ("src",),
+    "iframe": ("src",),
+    "embed": ("src",),
+    "object": ("data",),
+}
+# Attributes that navigate somewhere (mirrored only when same-origin)
+PAGE_ATTRS = {"a": ("href",), "area": ("href",)}
+SKIPPED_LINK_RELS = {"canonical", "alternate", "dns-prefetch", "preconnect"}
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)|@import\s+(['"])([^'"]+)\3""")
+
+
+class LinkExtractor(HTMLParser):
+    """Collects ``(raw_url, is_asset)`` references from an HTML document."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.refs: list[tuple[str, bool]] = []
+        self.inline_css: list[str] = []
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs) -> None:
+        attrs = dict(attrs)
+        if tag == "style":
+            self._in_style = True
+        if attrs.get("style"):
+            self.inline_css.append(attrs["style"])
+        if tag == "link" and SKIPPED_LINK_RELS & set((attrs.get("rel") or "").lower().split()):
+            return
+        if tag == "meta" and (attrs.get("property") or "").startswith("og:image") and attrs.get("content"):
+            self.refs.append((attrs["content"], True))
+        for attr in ASSET_ATTRS.get(tag, ()):
+            for url in _split_srcset(attrs[attr]) if attr == "srcset" and attrs.get(attr) else [attrs.get(attr)]:
+                if url:
+                    self.refs.append((url, True))
+        for attr in PAGE_ATTRS.get(tag, ()):
+            if attrs.get(attr):
+                self.refs.append((attrs[attr], False))
+
+    def handle_endtag(self, tag) -> None:
+        if tag == "style":
+            self._in_style = False
+
+    def handle_data(self, data) -> None:
+        if self._in_style:
+            self.inline_css.append(data)
+
+
+def _split_srcset(srcset: str) -> list[str]:
+    return [candidate.split()[0] for candidate in srcset.split(",") if candidate.strip()]
+
+
+def _css_refs(css: str) -> list[str]:
+    return [m.group(2) or m.group(4) for m in CSS_URL_RE.finditer(css)]
+
+
+# ── Crawl ───────────────────────────────────────────────────────────────────
+
+
+def request_key(url: str) -> str:
+    """Return the path (plus query) a resource is requested under."""
+    parts = urlsplit(url)
+    return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+
+class SiteCrawler:
+    """Breadth-first crawler writing one content-addressed snapshot."""
+
+    def __init__(self, base_url: str, mirrors_dir: Path = MIRRORS_DIR, workers: int = 8, limit: int = 2000) -> None:
+        self.base_url = base_url.rstrip("/") + "/"
+        self.origin = urlsplit(self.base_url).netloc.lower()
+        self.mirrors_dir = mirrors_dir
+        self.workers = workers
+        self.limit = limit
+        self.snapshot_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.snapshot_dir = mirrors_dir / self.snapshot_id
+        self.resources: dict[str, dict] = {}
+        self.errors: list[dict] = []
+        self._seen: set[str] = set()
+        host = re.escape(self.origin.removeprefix("www."))
+        # Absolute references to the site itself; an empty remainder must still stay a valid URL
+        self._origin_re = re.compile(rf"(?:https?:)?//(?:www\.)?{host}(?=([/\"'\s)?#]|$))", re.IGNORECASE)
+
+    def _is_same_origin(self, url: str) -> bool:
+        return urlsplit(url).netloc.lower().removeprefix("www.") == self.origin.removeprefix("www.")
+
+    def local_url(self, url: str) -> str:
+        """Return the URL a mirrored resource is served under."""
+        if self._is_same_origin(url):
+            return request_key(url)
+        parts = urlsplit(url)
+        return EXTERNAL_PREFIX + parts.netloc.lower() + request_key(url)
+
+    def _normalize(self, raw: str, page_url: str) -> str | None:
+        raw = raw.strip()
+        if not raw or raw.startswith(("#", "data:", "mailto:", "tel:", "javascript:", "blob:")):
+            return None
+        url = urljoin(page_url, raw).split("#", 1)[0]
+        return url if urlsplit(url).scheme in ("http", "https") else None
+
+    def _fetch(self, url: str) -> tuple[str, str, bytes]:
+        request = Request(url, headers={"User-Agent": USER_AGENT, "Accept-Encoding": "identity"})
+        with urlopen(request, timeout=FETCH_TIMEOUT_S) as response:
+            content_type = response.headers.get_content_type()
+            return response.geturl(), content_type, response.read()
+
+    def _rewrite(self, text: str, references: dict[str, str]) -> str:
+        """Point off-site asset URLs at their mirrored copies and make site URLs root-relative."""
+        for raw, url in references.items():
+            if raw.startswith(("http://", "https://", "//")) and not self._is_same_origin(url):
+                # The parser decoded entities; the document may still spell "&" as "&amp;"
+                for spelling in {raw, raw.replace("&", "&amp;")}:
+                    text = text.replace(spelling, self.local_url(url))
+        return self._origin_re.sub(lambda m: "" if m.group(1) == "/" else "/", text)
+
+    def _process(self, url: str) -> list[str]:
+        """Fetch and store *url*; return the URLs it references that should be crawled next."""
+        final_url, content_type, body = self._fetch(url)
+        found: list[tuple[str, bool]] = []
+        if content_type == "text/html":
+            parser = LinkExtractor()
+            parser.feed(body.decode("utf-8", errors="replace"))
+            found = parser.refs + [(ref, True) for css in parser.inline_css for ref in _css_refs(css)]
+        elif content_type == "text/css":
+            found = [(ref, True) for ref in _css_refs(body.decode("utf-8", errors="replace"))]
+
+        references: dict[str, str] = {}
+        follow: list[str] = []
+        for raw, is_asset in found:
+            target = self._normalize(raw, final_url)
+            if target is None or not (is_asset or self._is_same_origin(target)):
+                continue
+            references[raw.strip()] = target
+            follow.append(target)
+
+        if content_type.startswith(TEXT_TYPES):
+            body = self._rewrite(body.decode("utf-8", errors="replace"), references).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        obj = self.snapshot_dir / "objects" / digest[:2] / digest
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            obj.write_bytes(body)
+        entry = {"object": digest, "content_type": content_type, "size": len(body), "url": url}
+        self.resources[self.local_url(url)] = entry
+        if final_url != url:  # e.g. "/" redirected to "/index.html": serve both
+            self.resources[self.local_url(final_url)] = entry
+        return follow
+
+    def crawl(self) -> Path:
+        """Crawl the whole site and write the snapshot; returns its directory."""
+        frontier = [self.base_url]
+        self._seen.add(self.base_url)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while frontier and len(self.resources) < self.limit:
+                batch, frontier = frontier, []
+                for url, future in [(url, pool.submit(self._process, url)) for url in batch]:
+                    try:
+                        found = future.result()
+                    except (HTTPError, URLError, TimeoutError, OSError) as e:
+                        self.errors.append({"url": url, "error": str(e)})
+                        print(f"   ⚠️  {url}: {e}")
+                        continue
+                    for target in found:
+                        if target not in self._seen:
+                            self._seen.add(target)
+                            frontier.append(target)
+        self._write_manifest()
+        return self.snapshot_dir
+
+    def _write_manifest(self) -> None:
+        digest = hashlib.sha256()
+        for key in sorted(self.resources):
+            digest.update(f"{key}\0{self.resources[key]['object']}\n".encode())
+        manifest = {
+            "snapshot": self.snapshot_id,
+            "base_url": self.base_url,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "content_digest": digest.hexdigest(),
+            "resources": dict(sorted(self.resources.items())),
+            "errors": self.errors,
+        }
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        (self.snapshot_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        (self.mirrors_dir / LATEST_FILE.name).write_text(self.snapshot_id + "\n")
+
+
+# ── Snapshots ───────────────────────────────────────────────────────────────
+
+
+def resolve_snapshot(snapshot: str | None = None, mirrors_dir: Path = MIRRORS_DIR) -> Path:
+    """Return the directory of *snapshot* (default: the latest one)."""
+    if not snapshot:
+        latest = mirrors_dir / LATEST_FILE.name
+        if not latest.exists():
+            raise FileNotFoundError("No mirror snapshot yet — run `python mirror_site.py crawl` first")
+        snapshot = latest.read_text().strip()
+    snapshot_dir = mirrors_dir / snapshot
+    if not (snapshot_dir / "manifest.json").exists():
+        raise FileNotFoundError(f"Mirror snapshot '{snapshot}' not found in {mirrors_dir}")
+    return snapshot_dir
+
+
+def list_snapshots(mirrors_dir: Path = MIRRORS_DIR) -> list[dict]:
+    """Return the manifest header of every snapshot, oldest first."""
+    snapshots = []
+    for manifest_file in sorted(mirrors_dir.glob("*/manifest.json")):
+        manifest = json.loads(manifest_file.read_text())
+        snapshots.append(
+            {
+                "snapshot": manifest["snapshot"],
+                "base_url": manifest["base_url"],
+                "resources": len(manifest["resources"]),
+                "errors": len(manifest["errors"]),
+                "content_digest": manifest["content_digest"][:12],
+            }
+        )
+    return snapshots
+
+
+# ── Serve ───────────────────────────────────────────────────────────────────
+
+
+class MirrorRequestHandler(ReportRequestHandler):
+    """Serves one snapshot from its manifest, with gzip, ETags and cache headers."""
+
+    server_version = "TestifyMirror/1.0"
+    snapshot_dir: Path
+    resources: ClassVar[dict[str, dict]] = {}
+
+    def _handle(self, send_body: bool) -> None:
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        entry = (
+            self.resources.get(f"{path}?{url.query}" if url.query else path)
+            or self.resources.get(path)
+            or self.resources.get(path.rstrip("/") + "/index.html")
+        )
+        if entry is None:
+            self._respond(HTTPStatus.NOT_FOUND, None, lambda: b"Not found", "text/plain", "no-store", send_body)
+            return
+
+        # Objects are content-addressed, so the digest is a perfect ETag
+        etag = f'"{entry["object"][:32]}"'
+        cache_control = "no-cache" if entry["content_type"] == "text/html" else "public, max-age=86400"
+        self._respond(
+            HTTPStatus.OK,
+            etag,
+            lambda: _read_object(self.snapshot_dir, entry["object"]),
+            entry["content_type"],
+            cache_control,
+            send_body,
+        )
+
+
+@lru_cache(maxsize=512)
+def _read_object(snapshot_dir: Path, digest: str) -> bytes:
+    return (snapshot_dir / "objects" / digest[:2] / digest).read_bytes()
+
+
+def start_server(snapshot: str | None = None, host: str = "127.0.0.1", port: int = 0) -> tuple:
+    """Serve *snapshot* on a background thread; returns ``(server, snapshot_id)``.
+
+    Pass ``port=0`` to pick a free port (read it from ``server.server_port``).
+    """
+    snapshot_dir = resolve_snapshot(snapshot)
+    manifest = json.loads((snapshot_dir / "manifest.json").read_text())
+    handler = type(
+        "SnapshotHandler",
+        (MirrorRequestHandler,),
+        {"snapshot_dir": snapshot_dir, "resources": manifest["resources"]},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mirror-server", daemon=True).start()
+    return server, manifest["snapshot"]
+
+
+def serve(snapshot: str | None = None, host: str = "127.0.0.1", port: int = 8100) -> None:
+    """Serve a snapshot until interrupted."""
+    server, snapshot_id = start_server(snapshot, host, port)
+    print(f"🪞 Serving mirror {snapshot_id} on http://{host}:{server.server_port}/ (Ctrl+C to stop)")
+    print(f"   BASE_URL=http://{host}:{server.server_port} ./run_tests.sh")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mirror the target site for offline runs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    crawl_cmd = sub.add_parser("crawl", help="Crawl the site into a new snapshot")
+    crawl_cmd.add_argument("--url", default=config.BASE_URL, help="Site to mirror (default: config.BASE_URL)")
+    crawl_cmd.add_argument("--workers", type=int, default=8, help="Concurrent downloads (default: 8)")
+    crawl_cmd.add_argument("--limit", type=int, default=2000, help="Maximum resources to fetch (default: 2000)")
+    sub.add_parser("list", help="List available snapshots")
+    serve_cmd = sub.add_parser("serve", help="Serve a snapshot")
+    serve_cmd.add_argument("--snapshot", help="Snapshot id (default: latest)")
+    serve_cmd.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    serve_cmd.add_argument("--port", type=int, default=8100, help="Port to listen on (default: 8100)")
+    args = parser.parse_args()
+
+    if args.command == "crawl":
+        print(f"🕸️  Mirroring {args.url} ...")
+        crawler = SiteCrawler(args.url, workers=args.workers, limit=args.limit)
+        snapshot_dir = crawler.crawl()
+        print(f"✅ Snapshot {crawler.snapshot_id}: {len(crawler.resources)} resources, {len(crawler.errors)} errors")
+        print(f"   {snapshot_dir}")
+        sys.exit(1 if not crawler.resources else 0)
+    elif args.command == "list":
+        for snap in list_snapshots():
+            print(
+                f"{snap['snapshot']}  {snap['resources']:>5} resources  {snap['errors']:>3} errors  "
+                f"{snap['content_digest']}  {snap['base_url']}"
+            )
+    else:
+        serve(args.snapshot, args.host, args.port)
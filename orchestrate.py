@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Run the suite and its whole post-run pipeline in a single Python process.
+
+Replaces the serial ``collect_results.py`` → ``generate_catalog.py`` →
+``allure generate`` chain: Allure results and run history are parsed once and
+shared in memory, independent stages run concurrently, and each stage's wall
+time is printed at the end.
+
+Usage:
+    python orchestrate.py                     # full regression
+    python orchestrate.py smoke               # smoke | sanity | a11y | perf | visual
+    python orchestrate.py --tags=@contact     # raw behave arguments pass through
+    python orchestrate.py --skip-tests smoke  # post-run stages only, on existing results
+    python orchestrate.py --mirror smoke      # against the latest local mirror (--mirror=<snapshot id>)
+    python orchestrate.py --impact            # only scenarios affected by the diff vs origin/main (--impact=<ref>)
+    python orchestrate.py --order --fail-fast # likely failures first, stop at the first one (--order=file|history)
+    python orchestrate.py --browsers=chromium,firefox --envs=staging=<url>,prod=<url>  # matrix run (see matrix.py)
+
+Set FULL_REPORT=true to also build the Allure report (started in parallel).
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import collect_results
+import generate_catalog
+import generate_report
+import impact
+import matrix
+import mirror_site
+from live_results import LIVE_RESULTS_FILE
+from support.circuit_breaker import STATE_FILE as BREAKER_STATE_FILE
+from support.circuit_breaker import environment_state_file
+
+SCRIPT_DIR = Path(__file__).parent
+RESULTS_DIR = collect_results.ALLURE_RESULTS_DIR
+REPORT_DIR = SCRIPT_DIR / "reports" / "allure-report"
+HISTORY_DIR = SCRIPT_DIR / "reports" / "allure-history"
+
+# Suite shortcut → (behave args, tags filter recorded in history, display name)
+SUITES: dict[str, tuple[list[str], str, str]] = {
+    "smoke": (["--tags=@smoke"], "@smoke", "smoke"),
+    "sanity": (["--tags=@sanity"], "@sanity", "sanity"),
+    "a11y": (["features/accessibility.feature"], "@a11y", "accessibility"),
+    "accessibility": (["features/accessibility.feature"], "@a11y", "accessibility"),
+    "perf": (["features/performance.feature"], "@performance", "performance"),
+    "performance": (["features/performance.feature"], "@performance", "performance"),
+    "visual": (["features/visual.feature"], "@visual", "visual"),
+}
+
+
+def resolve_suite(args: list[str]) -> tuple[list[str], str, str]:
+    """Map CLI *args* to ``(behave_args, tags_filter, suite_name)`` like run_tests.sh did."""
+    if args and args[0] in SUITES:
+        behave_args, tags_filter, name = SUITES[args[0]]
+        return behave_args + args[1:], tags_filter, name
+
+    tags_filter = ""
+    for arg in args:
+        if arg.startswith("--tags="):
+            tags_filter = arg[len("--tags=") :]
+    return args, tags_filter, "regression"
+
+
+class StageTimer:
+    """Records wall time per pipeline stage; safe to use from worker threads."""
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+
+    def run(self, name: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def report(self) -> None:
+        print("⏱️  Stage timings:")
+        for name, seconds in self.timings.items():
+            print(f"   {name:<20} {seconds * 1000:9.1f} ms")
+
+
+# ── Stages ──────────────────────────────────────────────────────────────────
+
+
+def _copy_tree(src: Path, dst: Path) -> None:
+    if src.is_dir():
+        shutil.copytree(src, dst, dirs_exist_ok=True)
+
+
+def prepare_results(full_report: bool) -> None:
+    """Reset allure-results, the live stream and breaker state, carrying Allure history over when needed."""
+    if full_report:
+        _copy_tree(REPORT_DIR / "history", HISTORY_DIR)
+    shutil.rmtree(RESULTS_DIR, ignore_errors=True)
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    LIVE_RESULTS_FILE.unlink(missing_ok=True)
+    BREAKER_STATE_FILE.unlink(missing_ok=True)
+    for state_file in BREAKER_STATE_FILE.parent.glob(environment_state_file("*").name):
+        state_file.unlink()
+    if full_report:
+        _copy_tree(HISTORY_DIR, RESULTS_DIR / "history")
+
+
+def run_behave(behave_args: list[str]) -> int:
+    """Run Behave in a child process (browser state stays out of this one)."""
+    return subprocess.call([sys.executable, "-m", "behave", "--no-capture", *behave_args], cwd=SCRIPT_DIR)
+
+
+def start_mirror(snapshot: str | None) -> ThreadingHTTPServer:
+    """Serve a mirror snapshot on a free port and point the Behave run at it."""
+    server, snapshot_id = mirror_site.start_server(snapshot)
+    os.environ["BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["MIRROR_SNAPSHOT"] = snapshot_id  # recorded on the run by collect_results
+    print(f"🪞 Using mirror snapshot {snapshot_id} at {os.environ['BASE_URL']}")
+    return server
+
+
+def run_allure() -> None:
+    """Build the full Allure report if the CLI is available."""
+    if shutil.which("allure") is None:
+        print("⚠️  FULL_REPORT=true but the allure CLI is not installed — skipping the Allure report")
+        return
+    subprocess.run(
+        ["allure", "generate", str(RESULTS_DIR), "--clean", "-o", str(REPORT_DIR)],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def run_pipeline(tags_filter: str, full_report: bool, timer: StageTimer) -> bool:
+    """Collect results, build the catalog, inject the dashboard and render reports.
+
+    Returns False, recording nothing, when there are neither Allure results nor
+    live records to collect (an empty run must not enter the history).
+    """
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        # Independent of everything else: the catalog only reads .feature files
+        catalog = pool.submit(timer.run, "catalog", generate_catalog.build_catalog)
+        allure = pool.submit(timer.run, "allure report", run_allure) if full_report else None
+
+        # Parse inputs once, concurrently, and share them with the stages below
+        results = pool.submit(
+            timer.run, "parse results", lambda: list(collect_results.iter_allure_results(RESULTS_DIR))
+        )
+        history = pool.submit(timer.run, "load history", collect_results.load_history)
+
+        run_data = collect_results.summarize_results(results.result())
+        if not run_data["total"] and not any(
+            r.get("event") == "scenario" for r in collect_results.live_session_records()
+        ):
+            print(f"⚠️  No Allure results in {RESULTS_DIR} and no live results. Run tests first.")
+            catalog.result()
+            return False
+        _, updated_history = timer.run(
+            "collect",
+            collect_results.collect_and_save,
+            tags_filter,
+            run_data=run_data,
+            history=history.result(),
+            inject=False,
+        )
+
+        dashboard = pool.submit(timer.run, "dashboard", collect_results.inject_into_dashboard, updated_history)
+        report = pool.submit(
+            timer.run,
+            "quick report",
+            generate_report.generate_report,
+            tags_filter,
+            results=results.result(),
+            history=updated_history,
+        )
+        for future in (catalog, dashboard, report, allure):
+            if future is not None:
+                future.result()
+    return True
+
+
+def _flag(argv: list[str], name: str) -> str | None:
+    """Return ``--name`` or ``--name=value`` from *argv*, if present."""
+    return next((a for a in argv if a == name or a.startswith(f"{name}=")), None)
+
+
+def _value(flag: str | None) -> str | None:
+    """The value of a ``--name=value`` flag returned by :func:`_flag` (None if absent or bare)."""
+    return (flag.partition("=")[2] or None) if flag else None
+
+
+def main(argv: list[str]) -> int:
+    skip_tests = "--skip-tests" in argv
+    mirror = _flag(argv, "--mirror")
+    impact_base = _flag(argv, "--impact")
+    order = _flag(argv, "--order")
+    fail_fast = "--fail-fast" in argv
+    browsers, envs, jobs = _flag(argv, "--browsers"), _flag(argv, "--envs"), _flag(argv, "--jobs")
+    args = [
+        a for a in argv if a not in ("--skip-tests", "--fail-fast", mirror, impact_base, order, browsers, envs, jobs)
+    ]
+    behave_args, tags_filter, suite_name = resolve_suite(args)
+    if order:
+        # Read by features/environment.py in the behave subprocess
+        os.environ["SCENARIO_ORDER"] = order.partition("=")[2] or "history"
+    if fail_fast:
+        behave_args.append("--stop")
+    full_report = os.getenv("FULL_REPORT", "false").lower() == "true"
+    timer = StageTimer()
+    exit_code = 0
+
+    if impact_base and not skip_tests:
+        base = impact_base.partition("=")[2] or "origin/main"
+        selection = timer.run("impact", impact.select, base)
+        impact.print_selection(selection, base)
+        if not selection["selected"]:
+            print("✅ No scenarios affected by the change — nothing to run")
+            return 0
+        behave_args += impact.behave_args(selection)
+        tags_filter, suite_name = tags_filter or "impact", f"impact ({len(selection['selected'])} scenarios)"
+
+    if not skip_tests:
+        timer.run("prepare", prepare_results, full_report)
+        server = timer.run("mirror", start_mirror, mirror.partition("=")[2] or None) if mirror else None
+        print(f"🧪 Running {suite_name} suite...")
+        try:
+            if browsers or envs:
+                cells = matrix.parse_cells(_value(browsers), _value(envs))
+                summary = timer.run("behave", matrix.run_matrix, cells, behave_args, int(_value(jobs) or 0))
+                exit_code = max(cell["exit_code"] for cell in summary["cells"])
+            else:
+                exit_code = timer.run("behave", run_behave, behave_args)
+        finally:
+            if server:
+                server.shutdown()
+        print("")
+
+    # A failing stage raises out of here, so the process exits non-zero
+    if not timer.run("post-run total", run_pipeline, tags_filter, full_report, timer):
+        return exit_code or 1
+
+    print("")
+    timer.report()
+    print("")
+    print(f"{'✅' if exit_code == 0 else '❌'} Done! ({suite_name})")
+    print(f"   Dashboard:    open {SCRIPT_DIR / 'reports' / 'dashboard.html'}")
+    print(f"   Test Catalog: open {SCRIPT_DIR / 'reports' / 'catalog.html'}")
+    print(f"   Report:       open {generate_report.REPORT_DIR / 'index.html'}")
+    if full_report:
+        print(f"   Allure:       allure open {REPORT_DIR}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
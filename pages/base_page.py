@@ -3,9 +3,13 @@
 import logging
 import time
 
-from playwright.sync_api import Page, expect
+from playwright.sync_api import Locator, Page, expect
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 import config
+from support.adaptive_timeouts import adaptive_timeouts
+from support.circuit_breaker import backoff_delay, breaker
+from support.selector_cache import selector_cache
 
 logger = logging.getLogger("testify")
 
@@ -16,32 +20,77 @@ class BasePage:
 
     def __init__(self, page: Page) -> None:
         self.page = page
+        self.navigation_retries = 0  # a scenario that only passed after retrying is flaky
+        if config.SELECTOR_CACHE:
+            selector_cache.register(type(self))
 
     def navigate(self, url: str, wait_until: str = "networkidle", retries: int | None = None) -> None:
         """Navigate to *url*, retrying on transient network errors.
 
+        Retries back off exponentially with jitter, and every connection failure
+        feeds the run-wide circuit breaker: once it opens, navigation fails fast
+        with :class:`~support.circuit_breaker.CircuitOpenError`. The timeout is
+        learned from earlier navigations to the same path (see
+        :mod:`support.adaptive_timeouts`), ``config.NAVIGATION_TIMEOUT_MS`` at most.
+
         Args:
             url: The URL to navigate to.
             wait_until: When to consider navigation succeeded ("domcontentloaded", "load", "networkidle").
             retries: Override retry count (defaults to ``config.RETRY_ATTEMPTS``).
         """
         max_attempts = retries if retries is not None else config.RETRY_ATTEMPTS
+        timeout = config.NAVIGATION_TIMEOUT_MS
+        if config.ADAPTIVE_TIMEOUTS:
+            timeout = adaptive_timeouts.navigation_timeout(url, wait_until)
         for attempt in range(max_attempts):
+            if config.CIRCUIT_BREAKER:
+                breaker.before_call()
+            start = time.perf_counter()
             try:
-                self.page.goto(url, timeout=config.NAVIGATION_TIMEOUT_MS, wait_until=wait_until)
-                return
+                self.page.goto(url, timeout=timeout, wait_until=wait_until)
             except Exception as e:
-                if attempt < max_attempts - 1 and "net::ERR_" in str(e):
+                transient = "net::ERR_" in str(e)
+                if config.ADAPTIVE_TIMEOUTS and isinstance(e, PlaywrightTimeoutError):
+                    adaptive_timeouts.navigation_timed_out(timeout)
+                if config.CIRCUIT_BREAKER and transient:  # a slow but reachable site must not open the circuit
+                    breaker.record_failure(str(e).split("\n")[0])
+                if attempt < max_attempts - 1 and transient:
+                    delay = backoff_delay(attempt, config.RETRY_DELAY_S, config.RETRY_MAX_DELAY_S)
                     logger.warning(
-                        "Navigation attempt %d/%d failed (%s) — retrying in %ds",
+                        "Navigation attempt %d/%d failed (%s) — retrying in %.1fs",
                         attempt + 1,
                         max_attempts,
                         str(e).split("\n")[0],
-                        config.RETRY_DELAY_S,
+                        delay,
                     )
-                    time.sleep(config.RETRY_DELAY_S)
+                    self.navigation_retries += 1
+                    time.sleep(delay)
                 else:
                     raise
+            else:
+                if config.CIRCUIT_BREAKER:
+                    breaker.record_success()
+                if config.ADAPTIVE_TIMEOUTS:
+                    adaptive_timeouts.navigated(url, wait_until, (time.perf_counter() - start) * 1000)
+                return
+
+    def locate(self, selector: str) -> Locator:
+        """Return a locator for *selector*, built on the pinned alternative of a fallback union.
+
+        See :mod:`support.selector_cache`. With ``SELECTOR_CACHE=false`` this is plain ``page.locator``.
+        Pass :meth:`action_timeout` or :meth:`expect_timeout` as ``timeout=`` on each wait on the locator.
+        """
+        if config.SELECTOR_CACHE:
+            return selector_cache.locator(self.page, selector)
+        return self.page.locator(selector)
+
+    def action_timeout(self, selector: str) -> int | None:
+        """Timeout learned for the next action on *selector*; None for the step's (:mod:`support.adaptive_timeouts`)."""
+        return adaptive_timeouts.locator_timeout(selector, "action") if config.ADAPTIVE_TIMEOUTS else None
+
+    def expect_timeout(self, selector: str) -> int | None:
+        """Timeout learned for the next ``expect`` on *selector*; None for the step's."""
+        return adaptive_timeouts.locator_timeout(selector, "expect") if config.ADAPTIVE_TIMEOUTS else None
 
     def verify_title(self, title: str) -> None:
         """Assert the page title matches *title*."""
@@ -49,11 +98,11 @@ class BasePage:
 
     def is_visible(self, selector: str) -> None:
         """Assert the first element matching *selector* is visible."""
-        expect(self.page.locator(selector).first).to_be_visible()
+        expect(self.locate(selector).first).to_be_visible(timeout=self.expect_timeout(selector))
 
     def is_in_viewport(self, selector: str) -> None:
         """Assert the first element matching *selector* is in the viewport."""
-        expect(self.page.locator(selector).first).to_be_in_viewport()
+        expect(self.locate(selector).first).to_be_in_viewport(timeout=self.expect_timeout(selector))
 
     def get_current_url(self) -> str:
         """Return the current page URL."""
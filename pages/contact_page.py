@@ -4,8 +4,59 @@ from typing import ClassVar
 
 from playwright.sync_api import Page, expect
 
+import config
 from pages.base_page import BasePage
 
+VALIDITY_FLAGS = (
+    "valueMissing",
+    "typeMismatch",
+    "patternMismatch",
+    "tooLong",
+    "tooShort",
+    "rangeUnderflow",
+    "rangeOverflow",
+    "stepMismatch",
+    "badInput",
+    "customError",
+    "valid",
+)
+
+# Optionally sets field values (native value setter + input/change events, as a framework would see them),
+# then reads every field's value, visibility and full ValidityState; run against the form element
+FORM_STATE_SCRIPT = """
+(form, [fields, values, flags]) => {
+    const state = {};
+    for (const [name, selector] of Object.entries(fields)) {
+        const el = form.querySelector(selector);
+        if (!el) {
+            state[name] = null;
+            continue;
+        }
+        if (values && name in values) {
+            if (el.disabled || el.readOnly) {
+                state[name] = {error: "not editable"};
+                continue;
+            }
+            const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), "value")?.set;
+            setter ? setter.call(el, values[name]) : (el.value = values[name]);
+            el.dispatchEvent(new Event("input", {bubbles: true}));
+            el.dispatchEvent(new Event("change", {bubbles: true}));
+        }
+        const validity = {};
+        for (const flag of flags) validity[flag] = el.validity[flag];
+        state[name] = {
+            value: el.value,
+            visible: el.checkVisibility ? el.checkVisibility() : el.getClientRects().length > 0,
+            required: el.required,
+            type: el.type,
+            validity,
+            validationMessage: el.validationMessage,
+        };
+    }
+    return state;
+}
+"""
+
 
 class ContactPage(BasePage):
     """Encapsulates interactions with the contact form: field filling,
@@ -30,40 +81,96 @@ class ContactPage(BasePage):
 
     def navigate_to_contact(self) -> None:
         """Click the in-page link to scroll to the contact section."""
-        self.page.click(self.CONTACT_NAV_LINK)
+        self.locate(self.CONTACT_NAV_LINK).first.click(timeout=self.action_timeout(self.CONTACT_NAV_LINK))
 
     def verify_form_visible(self) -> None:
         """Assert the contact form is visible."""
-        expect(self.page.locator(self.CONTACT_FORM)).to_be_visible()
+        expect(self.locate(self.CONTACT_FORM)).to_be_visible(timeout=self.expect_timeout(self.CONTACT_FORM))
 
     def verify_field_visible(self, field_name: str) -> None:
         """Assert a specific form field is visible."""
-        expect(self.page.locator(self.FIELDS[field_name])).to_be_visible()
+        selector = self.FIELDS[field_name]
+        expect(self.locate(selector)).to_be_visible(timeout=self.expect_timeout(selector))
 
     def verify_send_button_visible(self) -> None:
         """Assert the Send Message button is visible."""
-        expect(self.page.locator(self.SEND_MESSAGE_BTN)).to_be_visible()
+        expect(self.locate(self.SEND_MESSAGE_BTN)).to_be_visible(timeout=self.expect_timeout(self.SEND_MESSAGE_BTN))
 
     def fill_field(self, field_name: str, value: str) -> None:
         """Fill a form field with a value."""
-        self.page.locator(self.FIELDS[field_name]).fill(value)
+        selector = self.FIELDS[field_name]
+        self.locate(selector).fill(value, timeout=self.action_timeout(selector))
+
+    def fill_fields(self, values: dict[str, str], native: bool = config.FORM_FILL == "native") -> dict[str, dict]:
+        """Fill several fields and return the state of every field (see :meth:`form_state`).
+
+        By default all values are set and the state read back in one round trip,
+        once the form is visible. With *native*, each field goes through Playwright's ``fill`` (actionability
+        checks, focus, real input events) at one round trip per field.
+        """
+        if native:
+            for field_name, value in values.items():
+                self.fill_field(field_name, value)
+            return self.form_state()
+        state = self._evaluate_form(self.FIELDS, {self._field(name): value for name, value in values.items()})
+        not_editable = [name for name in values if (state[name] or {}).get("error")]
+        assert not not_editable, f"Contact form field(s) not editable: {', '.join(not_editable)}"
+        return state
+
+    def form_state(self, field_names: list[str] | None = None) -> dict[str, dict]:
+        """Read the value, visibility and full ``ValidityState`` of the given (default: all) fields at once.
+
+        Waits for the form to be visible, then reads every field in one ``evaluate``.
+        Each field maps to ``{"value", "visible", "required", "type", "validity",
+        "validationMessage"}``, or None if it is not in the form.
+        """
+        names = field_names if field_names is not None else list(self.FIELDS)
+        return self._evaluate_form({name: self.FIELDS[self._field(name)] for name in names}, None)
+
+    def _field(self, field_name: str) -> str:
+        if field_name not in self.FIELDS:
+            raise KeyError(f"Unknown contact form field {field_name!r}; known: {', '.join(self.FIELDS)}")
+        return field_name
+
+    def _evaluate_form(self, fields: dict[str, str], values: dict[str, str] | None) -> dict[str, dict]:
+        form = self.locate(self.CONTACT_FORM).first
+        # evaluate() reads the form once; wait (retrying) for it first, as fill() and expect() would
+        expect(form).to_be_visible(timeout=self.expect_timeout(self.CONTACT_FORM))
+        return form.evaluate(FORM_STATE_SCRIPT, [fields, values, VALIDITY_FLAGS])
 
     def verify_field_has_value(self, field_name: str, value: str) -> None:
         """Assert a form field retains the expected value."""
-        expect(self.page.locator(self.FIELDS[field_name])).to_have_value(value)
+        selector = self.FIELDS[field_name]
+        expect(self.locate(selector)).to_have_value(value, timeout=self.expect_timeout(selector))
+
+    def verify_fields_have_values(self, expected: dict[str, str]) -> None:
+        """Assert every field in *expected* holds its value, reading them all in one round trip."""
+        state = self.form_state(list(expected))
+        actual = {name: (state[name] or {}).get("value") for name in expected}
+        wrong = {name: value for name, value in actual.items() if value != expected[name]}
+        assert not wrong, f"Contact form fields lost their values (now: {wrong}, expected: {expected})"
+
+    def verify_fields_visible(self, field_names: list[str]) -> None:
+        """Assert all *field_names* are present and visible, checking them in one round trip."""
+        state = self.form_state(field_names)
+        hidden = [name for name in field_names if not (state[name] or {}).get("visible")]
+        assert not hidden, f"Contact form field(s) missing or hidden: {', '.join(hidden)}"
 
     def click_send_message(self) -> None:
         """Click the Send Message submit button."""
-        self.page.locator(self.SEND_MESSAGE_BTN).click()
+        self.locate(self.SEND_MESSAGE_BTN).click(timeout=self.action_timeout(self.SEND_MESSAGE_BTN))
 
     def verify_field_validation_active(self, field_name: str) -> None:
         """Verify the browser's HTML5 validation is triggered on a required field."""
-        locator = self.page.locator(self.FIELDS[field_name])
-        validity = locator.evaluate("el => !el.validity.valid && el.validationMessage !== ''")
-        assert validity, f"Expected HTML5 validation on '{field_name}' but it was valid"
+        field = self.form_state([field_name])[field_name]
+        assert field, f"Field '{field_name}' not found in the contact form"
+        assert not field["validity"]["valid"] and field["validationMessage"], (
+            f"Expected HTML5 validation on '{field_name}' but it was valid"
+        )
 
     def verify_email_type_validation(self) -> None:
         """Verify the browser rejects an invalid email format via type=email validation."""
-        locator = self.page.locator(self.FIELDS["Email Address"])
-        validity = locator.evaluate("el => !el.validity.valid && el.validity.typeMismatch")
-        assert validity, "Expected email type validation error but field was valid"
+        field = self.form_state(["Email Address"])["Email Address"]
+        assert field and field["validity"]["typeMismatch"], (
+            f"Expected email type validation error but field was valid: {field and field['validity']}"
+        )
@@ -1,11 +1,14 @@
 """Page object for the main site: navigation, hero, about, portfolio, resume, footer, and meta."""
 
 from typing import ClassVar
+from urllib.parse import urlsplit
 
 from playwright.sync_api import Page, expect
 
 import config
 from pages.base_page import BasePage
+from support.link_checker import COLLECT_SCRIPT, link_checker
+from support.visual_diff import MASK_COLOR, describe, visual_baselines
 
 
 class HomePage(BasePage):
@@ -68,6 +71,15 @@ class HomePage(BasePage):
     RESUME_IFRAME: str = "#resume iframe"
     RESUME_DOWNLOAD_LINK: str = '#resume a[href$=".pdf"]'
 
+    # ── Visual Regression ───────────────────────────────────────────────
+    VISUAL_REGIONS: ClassVar[dict[str, str | None]] = {
+        "page": None,  # full page
+        "hero": "#top, #intro",
+        "sidebar": "#header",
+        "portfolio grid": "#portfolio",
+    }
+    VISUAL_MASKS: ClassVar[list[str]] = [PDF_VIEWER]  # rendered by the browser's PDF plugin, differs run to run
+
     # ── Footer ──────────────────────────────────────────────────────────
     FOOTER_COPYRIGHT: str = "#footer .copyright, footer .copyright, #copyright"
 
@@ -82,100 +94,155 @@ class HomePage(BasePage):
 
     def click_nav_link(self, link_name: str) -> None:
         """Click a navigation link by its display name."""
-        self.page.click(self.NAV_LINKS[link_name])
+        selector = self.NAV_LINKS[link_name]
+        self.locate(selector).first.click(timeout=self.action_timeout(selector))
 
     def verify_heading_visible(self, heading_text: str) -> None:
         """Assert a section heading is visible and contains *heading_text*."""
-        expect(self.page.locator(self.HEADINGS[heading_text])).to_contain_text(heading_text)
+        selector = self.HEADINGS[heading_text]
+        expect(self.locate(selector)).to_contain_text(heading_text, timeout=self.expect_timeout(selector))
 
     # ── Social Links ────────────────────────────────────────────────────
 
     def verify_social_link_visible(self, platform: str) -> None:
         """Assert the social link for *platform* is visible."""
-        expect(self.page.locator(self.SOCIAL_LINKS[platform]).first).to_be_visible()
+        selector = self.SOCIAL_LINKS[platform]
+        expect(self.locate(selector).first).to_be_visible(timeout=self.expect_timeout(selector))
 
     def verify_social_link_url(self, platform: str) -> None:
         """Assert the social link href contains the expected URL fragment."""
-        href = self.page.locator(self.SOCIAL_LINKS[platform]).first.get_attribute("href")
+        selector = self.SOCIAL_LINKS[platform]
+        href = self.locate(selector).first.get_attribute("href", timeout=self.action_timeout(selector))
         expected_fragment = self.SOCIAL_URLS[platform]
         assert expected_fragment in href, f"Expected {platform} link to contain '{expected_fragment}', got '{href}'"
 
+    def check_links(self) -> list[dict]:
+        """Collect every link and asset URL on the page in one evaluate and check them concurrently."""
+        found = self.page.evaluate(COLLECT_SCRIPT)
+        if config.LINK_CHECK_SCOPE == "internal":
+            host = urlsplit(self.page.url).hostname
+            found = [item for item in found if urlsplit(item["url"]).hostname == host]
+        results = link_checker.check_all([item["url"] for item in found])
+        for item, result in zip(found, results, strict=True):
+            result["kind"] = item["kind"]
+        return results
+
+    def verify_links_resolve(self) -> None:
+        """Assert no link or asset on the page is broken (unverified ones are logged as warnings)."""
+        results = self.check_links()
+        assert results, "No links or assets found on the page"
+        broken = [r for r in results if r["outcome"] == "broken"]
+        details = "; ".join(f"{r['kind']} {r['url']} → {r['error'] or r['status']}" for r in broken)
+        assert not broken, f"{len(broken)}/{len(results)} links or assets are broken: {details}"
+
     # ── Hero Section ────────────────────────────────────────────────────
 
     def verify_profile_image_visible(self) -> None:
         """Assert the hero profile image is visible."""
-        expect(self.page.locator(self.HERO_PROFILE_IMAGE).first).to_be_visible()
+        expect(self.locate(self.HERO_PROFILE_IMAGE).first).to_be_visible(
+            timeout=self.expect_timeout(self.HERO_PROFILE_IMAGE)
+        )
 
     def verify_tagline_visible(self) -> None:
         """Assert the hero tagline is visible."""
-        expect(self.page.locator(self.HERO_TAGLINE).first).to_be_visible()
+        expect(self.locate(self.HERO_TAGLINE).first).to_be_visible(timeout=self.expect_timeout(self.HERO_TAGLINE))
 
     def verify_sidebar_name_visible(self, name: str) -> None:
         """Assert the sidebar displays *name*."""
-        expect(self.page.locator(self.SIDEBAR_NAME).first).to_contain_text(name)
+        expect(self.locate(self.SIDEBAR_NAME).first).to_contain_text(
+            name, timeout=self.expect_timeout(self.SIDEBAR_NAME)
+        )
 
     def click_hero_portfolio_button(self) -> None:
         """Click the CTA button in the hero section."""
-        self.page.locator(self.HERO_PORTFOLIO_BTN).first.click()
+        self.locate(self.HERO_PORTFOLIO_BTN).first.click(timeout=self.action_timeout(self.HERO_PORTFOLIO_BTN))
 
     def verify_portfolio_in_viewport(self) -> None:
         """Assert the portfolio heading has scrolled into the viewport."""
-        expect(self.page.locator(self.PORTFOLIO_HEADING)).to_be_in_viewport()
+        expect(self.locate(self.PORTFOLIO_HEADING)).to_be_in_viewport(
+            timeout=self.expect_timeout(self.PORTFOLIO_HEADING)
+        )
 
     # ── About Me ────────────────────────────────────────────────────────
 
     def verify_about_contains_text(self, text: str) -> None:
         """Assert the about section contains *text*."""
-        expect(self.page.locator(self.ABOUT_TEXT).first).to_contain_text(text)
+        expect(self.locate(self.ABOUT_TEXT).first).to_contain_text(text, timeout=self.expect_timeout(self.ABOUT_TEXT))
 
     # ── Portfolio ───────────────────────────────────────────────────────
 
     def verify_portfolio_item_count(self, count: int) -> None:
         """Assert the number of portfolio items matches *count*."""
-        expect(self.page.locator(self.PORTFOLIO_ITEMS)).to_have_count(count)
+        expect(self.locate(self.PORTFOLIO_ITEMS)).to_have_count(
+            count, timeout=self.expect_timeout(self.PORTFOLIO_ITEMS)
+        )
 
     def verify_portfolio_item_title_visible(self, title: str) -> None:
         """Assert a portfolio item with *title* is visible."""
-        expect(self.page.locator(self.PORTFOLIO_ITEM_TITLES).filter(has_text=title).first).to_be_visible()
+        titled = self.locate(self.PORTFOLIO_ITEM_TITLES).filter(has_text=title).first
+        expect(titled).to_be_visible(timeout=self.expect_timeout(self.PORTFOLIO_ITEM_TITLES))
 
     def get_portfolio_item_link(self, title: str) -> str:
         """Return the href of the link inside the portfolio item with *title*."""
-        article = self.page.locator(self.PORTFOLIO_ITEMS).filter(has_text=title).first
-        return article.locator("a").first.get_attribute("href")
+        article = self.locate(self.PORTFOLIO_ITEMS).filter(has_text=title).first
+        return article.locator("a").first.get_attribute("href", timeout=self.action_timeout(self.PORTFOLIO_ITEMS))
 
     def verify_portfolio_item_images(self) -> None:
         """Assert every portfolio item has a visible image with non-zero dimensions."""
-        images = self.page.locator(self.PORTFOLIO_ITEM_IMAGES)
+        images = self.locate(self.PORTFOLIO_ITEM_IMAGES)
         count = images.count()
         assert count > 0, "No portfolio item images found"
         for i in range(count):
-            expect(images.nth(i)).to_be_visible()
+            expect(images.nth(i)).to_be_visible(timeout=self.expect_timeout(self.PORTFOLIO_ITEM_IMAGES))
 
     # ── Resume ──────────────────────────────────────────────────────────
 
     def verify_pdf_viewer_visible(self) -> None:
         """Assert the PDF viewer element is visible in the Resume section."""
-        expect(self.page.locator(self.PDF_VIEWER).first).to_be_visible()
+        expect(self.locate(self.PDF_VIEWER).first).to_be_visible(timeout=self.expect_timeout(self.PDF_VIEWER))
 
     def verify_resume_download_link(self) -> None:
         """Assert a visible download link pointing to a PDF exists."""
-        locator = self.page.locator(self.RESUME_DOWNLOAD_LINK).first
-        expect(locator).to_be_visible()
-        href = locator.get_attribute("href")
+        locator = self.locate(self.RESUME_DOWNLOAD_LINK).first
+        expect(locator).to_be_visible(timeout=self.expect_timeout(self.RESUME_DOWNLOAD_LINK))
+        href = locator.get_attribute("href", timeout=self.action_timeout(self.RESUME_DOWNLOAD_LINK))
         assert href and ".pdf" in href, f"Expected resume link to point to a PDF, got '{href}'"
 
     def verify_resume_iframe_src(self) -> None:
         """Assert the resume iframe's src attribute points to a PDF file."""
-        locator = self.page.locator(self.RESUME_IFRAME).first
-        expect(locator).to_be_visible()
-        src = locator.get_attribute("src")
+        locator = self.locate(self.RESUME_IFRAME).first
+        expect(locator).to_be_visible(timeout=self.expect_timeout(self.RESUME_IFRAME))
+        src = locator.get_attribute("src", timeout=self.action_timeout(self.RESUME_IFRAME))
         assert src and ".pdf" in src, f"Expected resume iframe to load a PDF, got '{src}'"
 
     # ── Footer ──────────────────────────────────────────────────────────
 
     def verify_footer_copyright(self, text: str) -> None:
         """Assert the footer copyright contains *text*."""
-        expect(self.page.locator(self.FOOTER_COPYRIGHT).first).to_contain_text(text)
+        expect(self.locate(self.FOOTER_COPYRIGHT).first).to_contain_text(
+            text, timeout=self.expect_timeout(self.FOOTER_COPYRIGHT)
+        )
+
+    # ── Visual Regression ───────────────────────────────────────────────
+
+    def screenshot_region(self, region: str) -> bytes:
+        """Screenshot a region from :attr:`VISUAL_REGIONS`, with animations stopped and :attr:`VISUAL_MASKS` masked."""
+        options = {
+            "animations": "disabled",
+            "caret": "hide",
+            "mask": [self.locate(selector) for selector in self.VISUAL_MASKS],
+            "mask_color": MASK_COLOR,
+        }
+        selector = self.VISUAL_REGIONS[region]
+        if selector is None:
+            return self.page.screenshot(full_page=True, **options)
+        return self.locate(selector).first.screenshot(timeout=self.action_timeout(selector), **options)
+
+    def verify_matches_baseline(self, region: str, scenario: str, device: str | None = None) -> None:
+        """Assert *region* looks like its baseline for *scenario* and the current viewport or *device* profile."""
+        screenshot = self.screenshot_region(region)
+        result = visual_baselines.check(screenshot, scenario, region, self.page.viewport_size, device)
+        assert result is None or result.passed, f"'{region}' differs from its visual baseline: {describe(result)}"
 
     # ── Meta Tags ───────────────────────────────────────────────────────
 
@@ -14,28 +14,40 @@ class ResponsivePage(BasePage):
 
     SIDEBAR: str = "#header"
     HERO_TAGLINE: str = "#top h2, #intro h2, .blurb h2"
+    MAIN_CONTENT: str = "#main, main, .wrapper"
 
     def __init__(self, page: Page) -> None:
         super().__init__(page)
 
     def navigate_home(self) -> None:
         """Navigate to the home page and wait for network idle."""
-        self.navigate(self.URL)
+        self.start_navigation_home()
+        self.wait_until_settled()
+
+    def start_navigation_home(self) -> None:
+        """Start loading the home page, returning as soon as the response starts arriving."""
+        self.navigate(self.URL, wait_until="commit")
+
+    def wait_until_settled(self) -> None:
+        """Wait for the page being loaded to reach network idle."""
         self.page.wait_for_load_state("networkidle")
 
     def verify_sidebar_not_in_viewport(self) -> None:
         """Assert the sidebar is positioned off-screen on mobile."""
-        is_off_screen = self.page.locator(self.SIDEBAR).evaluate(
+        is_off_screen = self.locate(self.SIDEBAR).evaluate(
             """el => {
                 const rect = el.getBoundingClientRect();
                 return rect.right <= 0 || rect.left >= window.innerWidth;
-            }"""
+            }""",
+            timeout=self.action_timeout(self.SIDEBAR),
         )
         assert is_off_screen, "Expected sidebar to be off-screen on mobile viewport"
 
     def verify_content_fills_viewport(self) -> None:
         """Assert the main content fills at least 90% of the viewport width."""
-        main_width = self.page.locator("#main, main, .wrapper").first.evaluate("el => el.getBoundingClientRect().width")
+        main_width = self.locate(self.MAIN_CONTENT).first.evaluate(
+            "el => el.getBoundingClientRect().width", timeout=self.action_timeout(self.MAIN_CONTENT)
+        )
         viewport_width = self.page.evaluate("window.innerWidth")
         assert main_width >= viewport_width * 0.9, (
             f"Expected content to fill viewport ({viewport_width}px), but it's {main_width}px"
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""Serve the reports directory over HTTP with incremental JSON endpoints.
+
+The dashboard and catalog normally carry their whole dataset injected into the
+HTML so they work from ``file://``. When served from here, the injected data is
+blanked out and the pages fetch only what they display from these endpoints:
+
+    GET /api/runs                    paginated run history (slim runs)
+        ?offset=0&limit=50           page window (limit capped at 500)
+        &order=asc|desc              history order (default asc)
+        &tags_filter=smoke           runs recorded with this tags filter
+        &status=passed|failed        runs with / without failures
+        &since=2026-01-01            ISO timestamp lower bound (inclusive)
+        &until=2026-02-01            ISO timestamp upper bound (exclusive)
+        &fields=full                 include per-scenario details
+    GET /api/runs/summary            aggregate metrics (same filters)
+    GET /api/runs/<run_id>           one run, including scenarios (same filters)
+    GET /api/catalog                 catalog summary (no feature bodies)
+        ?full=1                      the complete catalog
+    GET /api/catalog/scenarios       paginated, filterable scenario list
+        ?suite=smoke&tag=@ui&q=hero&file=regression.feature
+    GET /api/live?offset=0           live-stream records appended since byte offset
+
+Every response carries an ETag and honours If-None-Match; bodies are gzipped
+when the client accepts it.
+
+Usage:
+    python serve_reports.py                 # http://127.0.0.1:8000/dashboard.html
+    python serve_reports.py --port 9000 --host 0.0.0.0
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from collect_results import HISTORY_FILE, REPORTS_DIR, slim_run
+from generate_catalog import CATALOG_FILE
+from live_results import LIVE_RESULTS_FILE, iter_records
+
+MAX_PAGE_SIZE = 500
+DEFAULT_PAGE_SIZE = 50
+GZIP_MIN_BYTES = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+# HTML pages whose injected data line is blanked when served, so they use the API instead
+INJECTED_PAGES = {
+    "dashboard.html": ("        window.__RUN_DATA__ = ", "[]"),
+    "catalog.html": ("        window.__CATALOG__ = ", "null"),
+}
+
+
+class JsonSource:
+    """A JSON file parsed once and re-read only when its size or mtime changes."""
+
+    def __init__(self, path: Path, default) -> None:
+        self.path = path
+        self.default = default
+        self._stamp: tuple[int, int] | None = None
+        self._data = default
+        self._lock = threading.Lock()
+
+    def load(self) -> tuple[object, str]:
+        """Return ``(data, version)`` where *version* changes whenever the file does."""
+        try:
+            stat = self.path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return self.default, "missing"
+
+        with self._lock:
+            if stamp != self._stamp:
+                try:
+                    self._data = json.loads(self.path.read_text())
+                except json.JSONDecodeError:
+                    self._data = self.default
+                self._stamp = stamp
+            return self._data, f"{stamp[0]:x}-{stamp[1]:x}"
+
+
+history_source = JsonSource(HISTORY_FILE, [])
+catalog_source = JsonSource(CATALOG_FILE, None)
+
+
+# ── Query helpers ───────────────────────────────────────────────────────────
+
+
+def _param(query: dict, name: str, default: str = "") -> str:
+    return query.get(name, [default])[0]
+
+
+def _page(query: dict) -> tuple[int, int]:
+    """Return a clamped ``(offset, limit)`` pair from *query*."""
+    try:
+        offset = max(0, int(_param(query, "offset", "0")))
+        limit = int(_param(query, "limit", str(DEFAULT_PAGE_SIZE)))
+    except ValueError:
+        offset, limit = 0, DEFAULT_PAGE_SIZE
+    return offset, min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def _paginate(items: list, query: dict) -> dict:
+    offset, limit = _page(query)
+    return {"total": len(items), "offset": offset, "limit": limit, "items": items[offset : offset + limit]}
+
+
+def filter_runs(history: list, query: dict) -> list:
+    """Apply the run filters in *query* to *history*, preserving order."""
+    tags_filter = query.get("tags_filter")
+    status = _param(query, "status")
+    since = _param(query, "since")
+    until = _param(query, "until")
+
+    runs = history
+    if tags_filter is not None:
+        runs = [r for r in runs if r.get("tags_filter", "") == tags_filter[0]]
+    if status == "passed":
+        runs = [r for r in runs if r.get("failed", 0) == 0 and r.get("broken", 0) == 0]
+    elif status == "failed":
+        runs = [r for r in runs if r.get("failed", 0) > 0 or r.get("broken", 0) > 0]
+    if since:
+        runs = [r for r in runs if r.get("timestamp", "") >= since]
+    if until:
+        runs = [r for r in runs if r.get("timestamp", "") < until]
+    return runs
+
+
+def summarize_runs(runs: list, history: list) -> dict:
+    """Aggregate the metrics the dashboard header and stat cards need."""
+    latest = slim_run(runs[-1]) if runs else None
+    previous = slim_run(runs[-2]) if len(runs) > 1 else None
+    count = len(runs)
+    return {
+        "count": count,
+        "latest": latest,
+        "previous": previous,
+        "avg_duration_s": sum(r.get("duration_s", 0) for r in runs) / count if count else 0,
+        "overall_pass_rate": (
+            sum(r.get("passed", 0) / max(r.get("total", 0), 1) * 100 for r in runs) / count if count else 0
+        ),
+        "tags": sorted({r.get("tags_filter", "") for r in history if r.get("tags_filter")}),
+    }
+
+
+def filter_scenarios(catalog: dict, query: dict) -> list:
+    """Flatten the catalog into scenarios matching the suite/tag/search/file filters."""
+    suite = _param(query, "suite")
+    tag = _param(query, "tag")
+    text = _param(query, "q").lower()
+    filename = _param(query, "file")
+
+    suite_tests = set(catalog["suites"].get(suite, {}).get("tests", [])) if suite else None
+    scenarios = []
+    for feature in catalog.get("features", []):
+        if filename and feature["file"] != filename:
+            continue
+        for s in feature["scenarios"]:
+            if suite_tests is not None and s["tc_id"] not in suite_tests:
+                continue
+            if tag and tag not in s["tags"]:
+                continue
+            if text and text not in f"{s['tc_id']} {s['name']} {' '.join(s['tags'])}".lower():
+                continue
+            scenarios.append(s)
+    return scenarios
+
+
+# ── Routes ──────────────────────────────────────────────────────────────────
+
+
+def route_api(path: str, query: dict) -> tuple[HTTPStatus, str, object]:
+    """Resolve an ``/api/...`` request to ``(status, etag_seed, payload_factory)``.
+
+    The payload is returned as a zero-argument callable so a matching
+    If-None-Match can be answered without building the body at all.
+    """
+    parts = [p for p in path.split("/") if p][1:]  # drop "api"
+    canonical_query = json.dumps(sorted(query.items()))
+
+    if parts[:1] == ["runs"]:
+        history, version = history_source.load()
+        seed = f"runs:{version}:{'/'.join(parts)}:{canonical_query}"
+        if len(parts) == 1:
+            full = _param(query, "fields") == "full"
+
+            def runs_page():
+                runs = filter_runs(history, query)
+                if _param(query, "order") == "desc":
+                    runs = runs[::-1]
+                page = _paginate(runs, query)
+                if not full:
+                    page["items"] = [slim_run(r) for r in page["items"]]
+                return page
+
+            return HTTPStatus.OK, seed, runs_page
+        if parts[1:] == ["summary"]:
+            return HTTPStatus.OK, seed, lambda: summarize_runs(filter_runs(history, query), history)
+        if len(parts) == 2:
+            # run_id is per-second, so parallel CI suites can share one — ?tags_filter= disambiguates
+            run = next((r for r in reversed(filter_runs(history, query)) if r.get("run_id") == parts[1]), None)
+            if run is not None:
+                return HTTPStatus.OK, seed, lambda: run
+
+    elif parts[:1] == ["catalog"]:
+        catalog, version = catalog_source.load()
+        if catalog is None:
+            return (
+                HTTPStatus.NOT_FOUND,
+                "catalog:missing",
+                lambda: {"error": "Catalog not generated. Run generate_catalog.py"},
+            )
+        seed = f"catalog:{version}:{'/'.join(parts)}:{canonical_query}"
+        if len(parts) == 1:
+            if _param(query, "full") in ("1", "true"):
+                return HTTPStatus.OK, seed, lambda: catalog
+            return HTTPStatus.OK, seed, lambda: {k: v for k, v in catalog.items() if k != "features"}
+        if parts[1:] == ["scenarios"]:
+            return HTTPStatus.OK, seed, lambda: _paginate(filter_scenarios(catalog, query), query)
+
+    elif parts == ["live"]:
+        try:
+            offset = max(0, int(_param(query, "offset", "0")))
+        except ValueError:
+            offset = 0
+        size = LIVE_RESULTS_FILE.stat().st_size if LIVE_RESULTS_FILE.exists() else 0
+        offset = 0 if offset > size else offset  # stream was reset for a new run
+
+        def live_page():
+            records, next_offset = [], offset
+            for record, record_end in iter_records(LIVE_RESULTS_FILE, offset):
+                records.append(record)
+                next_offset = record_end
+            return {"offset": next_offset, "records": records}
+
+        return HTTPStatus.OK, f"live:{size}:{offset}", live_page
+
+    return HTTPStatus.NOT_FOUND, f"404:{path}", lambda: {"error": f"Unknown endpoint: {path}"}
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Serves static report files and the JSON API with ETag + gzip support."""
+
+    server_version = "TestifyReports/1.0"
+    reports_dir: Path = REPORTS_DIR
+
+    def do_HEAD(self) -> None:
+        self._handle(send_body=False)
+
+    def do_GET(self) -> None:
+        self._handle(send_body=True)
+
+    def log_message(self, *args) -> None:
+        """Silence the default per-request stderr logging."""
+
+    # ── Dispatch ────────────────────────────────────────────────────────
+
+    def _handle(self, send_body: bool) -> None:
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        if path == "/":
+            self.send_response(HTTPStatus.FOUND)
+            self.send_header("Location", "/dashboard.html")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if path == "/api" or path.startswith("/api/"):
+            status, seed, payload = route_api(path, parse_qs(url.query))
+            etag = '"' + hashlib.sha1(seed.encode()).hexdigest() + '"'
+            self._respond(
+                status,
+                etag,
+                lambda: json.dumps(payload(), separators=(",", ":")).encode(),
+                "application/json",
+                "no-cache",
+                send_body,
+            )
+            return
+
+        self._serve_static(path, send_body)
+
+    def _serve_static(self, path: str, send_body: bool) -> None:
+        target = (self.reports_dir / path.lstrip("/")).resolve()
+        root = self.reports_dir.resolve()
+        if target.is_dir():
+            target = target / "index.html"
+        if root not in target.parents or not target.is_file():
+            self._respond(HTTPStatus.NOT_FOUND, None, lambda: b"Not found", "text/plain", "no-store", send_body)
+            return
+
+        stat = target.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        content_type = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+        # Reports change every run; everything else (Allure assets) is safe to cache briefly
+        cache_control = "no-cache" if content_type in ("text/html", "application/json") else "max-age=3600"
+
+        def body() -> bytes:
+            data = target.read_bytes()
+            if target.parent == root and target.name in INJECTED_PAGES:
+                data = _blank_injected_data(data, *INJECTED_PAGES[target.name])
+            return data
+
+        self._respond(HTTPStatus.OK, etag, body, content_type, cache_control, send_body)
+
+    # ── Response ────────────────────────────────────────────────────────
+
+    def _respond(self, status, etag, body_factory, content_type, cache_control, send_body) -> None:
+        if etag and status == HTTPStatus.OK and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return
+
+        body = body_factory()
+        compress = (
+            "gzip" in self.headers.get("Accept-Encoding", "")
+            and len(body) >= GZIP_MIN_BYTES
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+        )
+        if compress:
+            body = gzip.compress(body, compresslevel=6)
+
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8" if "text" in content_type else content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        if etag:
+            self.send_header("ETag", etag)
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+def _blank_injected_data(html: bytes, marker: str, empty: str) -> bytes:
+    """Replace the injected dataset line in *html* with an empty value."""
+    marker_bytes = marker.encode()
+    start = html.find(marker_bytes)
+    if start == -1:
+        return html
+    end = html.find(b"\n", start)
+    end = len(html) if end == -1 else end
+    return html[:start] + marker_bytes + empty.encode() + b";" + html[end:]
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000) -> None:
+    """Serve the reports directory until interrupted."""
+    server = ThreadingHTTPServer((host, port), ReportRequestHandler)
+    print(f"📡 Serving reports on http://{host}:{server.server_port}/dashboard.html (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Testify reports with incremental JSON endpoints.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    args = parser.parse_args()
+    serve(args.host, args.port)
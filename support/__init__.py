@@ -0,0 +1 @@
+"""Runtime support shared by the page objects and the Behave environment hooks."""
@@ -0,0 +1,220 @@
+"""Single-pass accessibility audit, computed in the page and cached there.
+
+One DOM walk collects everything the accessibility steps check: image alt
+text, heading levels, ``lang``, link hrefs, submit focusability, font sizes
+and WCAG 2.x contrast ratios. The result is kept on ``window`` and reused by
+every later query until a DOM mutation or user interaction (input, click,
+keydown, resize) marks it stale. A navigation starts a fresh document, so it
+drops the cache too.
+
+Structural checks always cover the whole document. Style checks
+(``getComputedStyle``, layout, contrast) stop once the time budget is spent.
+Such results carry ``complete: false`` and cover only the elements checked so
+far.
+"""
+
+import config
+
+# Self-installing: defines window.__testifyA11y on first use in each document, then answers the query
+AUDIT_SCRIPT = """
+([name, arg, budgetMs]) => {
+    if (!window.__testifyA11y) {
+        const FONT_TAGS = new Set(["P", "LI", "TD", "SPAN", "A", "LABEL"]);
+        const state = {result: null, dirty: true, runs: 0};
+        const markDirty = () => { state.dirty = true; };
+        new MutationObserver(markDirty).observe(document.documentElement, {
+            subtree: true, childList: true, attributes: true, characterData: true,
+        });
+        for (const ev of ["input", "change", "click", "keydown", "resize"]) {
+            window.addEventListener(ev, markDirty, true);
+        }
+
+        const parseColor = (value) => {
+            const m = /^rgba?\\(([^)]+)\\)$/.exec(value || "");
+            if (!m) return null;
+            const p = m[1].split(/[\\s,\\/]+/).filter(Boolean).map(parseFloat);
+            return [p[0], p[1], p[2], p.length > 3 ? p[3] : 1];
+        };
+        const blend = (top, bottom) => {
+            const a = top[3] + bottom[3] * (1 - top[3]);
+            if (a === 0) return [0, 0, 0, 0];
+            const mix = (i) => (top[i] * top[3] + bottom[i] * bottom[3] * (1 - top[3])) / a;
+            return [mix(0), mix(1), mix(2), a];
+        };
+        const luminance = (c) => {
+            const [r, g, b] = c.slice(0, 3).map((v) => {
+                v /= 255;
+                return v <= 0.03928 ? v / 12.92 : Math.pow((v + 0.055) / 1.055, 2.4);
+            });
+            return 0.2126 * r + 0.7152 * g + 0.0722 * b;
+        };
+        const contrast = (a, b) => {
+            const [hi, lo] = [luminance(a), luminance(b)].sort((x, y) => y - x);
+            return (hi + 0.05) / (lo + 0.05);
+        };
+        const hasDirectText = (el) => {
+            for (const n of el.childNodes) if (n.nodeType === 3 && n.data.trim()) return true;
+            return false;
+        };
+
+        const run = (budgetMs) => {
+            const start = performance.now();
+            const styleCache = new Map();
+            const bgCache = new Map();
+            const styles = (el) => {
+                let s = styleCache.get(el);
+                if (!s) { s = getComputedStyle(el); styleCache.set(el, s); }
+                return s;
+            };
+            // Opaque colour painted behind el, or null when an image (or unknown colour) is in the way
+            const background = (el) => {
+                if (!el) return [255, 255, 255, 1];
+                if (bgCache.has(el)) return bgCache.get(el);
+                const s = styles(el);
+                let out = null;
+                if (s.backgroundImage === "none") {
+                    const own = parseColor(s.backgroundColor);
+                    const below = background(el.parentElement);
+                    if (below === null) out = own && own[3] === 1 ? own : null;
+                    else out = own ? blend(own, below) : below;
+                }
+                bgCache.set(el, out);
+                return out;
+            };
+
+            const r = {
+                lang: document.documentElement.lang || "", images: [], headings: [], links: [],
+                submit: null, text: [], nodes: 0, textTotal: 0, fontTotal: 0, complete: true,
+            };
+            const textEls = [];
+            const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_ELEMENT);
+            for (let el = walker.currentNode; el; el = walker.nextNode()) {
+                r.nodes++;
+                const tag = el.tagName;
+                if (tag === "IMG") r.images.push({src: el.src, alt: el.alt});
+                else if (tag.length === 2 && tag[0] === "H" && tag[1] >= "1" && tag[1] <= "6") r.headings.push(+tag[1]);
+                else if (tag === "A") r.links.push({text: el.textContent.trim().substring(0, 50), href: el.href});
+                if (r.submit === null && el.matches('input[type="submit"], button[type="submit"]')) {
+                    r.submit = {tag, focusable: el.tabIndex >= 0 && !el.disabled};
+                }
+                const font = FONT_TAGS.has(tag);
+                if (font) r.fontTotal++;
+                if (font || hasDirectText(el)) textEls.push(el);
+            }
+            r.textTotal = textEls.length;
+
+            for (let i = 0; i < textEls.length; i++) {
+                if ((i & 63) === 0 && performance.now() - start > budgetMs) { r.complete = false; break; }
+                const el = textEls[i];
+                if (!(el.offsetWidth > 0 && el.offsetHeight > 0)) continue;
+                const s = styles(el);
+                const size = parseFloat(s.fontSize);
+                const entry = {
+                    tag: el.tagName, text: el.textContent.trim().substring(0, 30), size,
+                    font: FONT_TAGS.has(el.tagName), ratio: undefined,
+                };
+                if (hasDirectText(el) && s.visibility === "visible" && parseFloat(s.opacity) > 0) {
+                    const fg = parseColor(s.color);
+                    const bg = background(el);
+                    if (fg && bg) {
+                        entry.ratio = Math.round(contrast(blend(fg, bg), bg) * 100) / 100;
+                        const bold = parseInt(s.fontWeight, 10) >= 700;
+                        entry.required = size >= 24 || (bold && size >= 18.66) ? 3 : 4.5;
+                    } else {
+                        entry.ratio = null;
+                    }
+                }
+                r.text.push(entry);
+            }
+            r.durationMs = Math.round(performance.now() - start);
+            return r;
+        };
+
+        window.__testifyA11y = {
+            query(name, arg, budgetMs) {
+                if (state.dirty || !state.result) {
+                    state.result = run(budgetMs);
+                    state.dirty = false;
+                    state.runs++;
+                }
+                const r = state.result;
+                switch (name) {
+                    case "images": {
+                        const missing = r.images.filter((img) => !img.alt || img.alt.trim() === "");
+                        return {total: r.images.length, missing: missing.map((img) => img.src)};
+                    }
+                    case "headings": return r.headings;
+                    case "lang": return r.lang;
+                    case "links": {
+                        const bad = r.links.filter((a) => !a.href || a.href === "#");
+                        return {total: r.links.length, bad};
+                    }
+                    case "submit": return r.submit;
+                    case "font_size": {
+                        const tooSmall = r.text.filter((t) => t.font && t.size < arg)
+                            .map(({tag, text, size}) => ({tag, text, size}));
+                        return {total: r.fontTotal, tooSmall, complete: r.complete};
+                    }
+                    case "contrast": {
+                        const measured = r.text.filter((t) => typeof t.ratio === "number");
+                        const failures = measured.filter((t) => t.ratio < t.required)
+                            .map(({tag, text, size, ratio, required}) => ({tag, text, size, ratio, required}));
+                        const indeterminate = r.text.filter((t) => t.ratio === null).length;
+                        return {checked: measured.length, failures, indeterminate, complete: r.complete};
+                    }
+                    case "stats": {
+                        const {nodes, textTotal, complete, durationMs} = r;
+                        return {nodes, textTotal, styled: r.text.length, complete, durationMs, runs: state.runs};
+                    }
+                }
+                throw new Error(`Unknown audit query: ${name}`);
+            },
+        };
+    }
+    return window.__testifyA11y.query(name, arg, budgetMs);
+}
+"""
+
+
+class AccessibilityAudit:
+    """Query interface over the in-page audit of *page*; each query is one small round trip."""
+
+    def __init__(self, page, budget_ms: int = config.A11Y_AUDIT_BUDGET_MS) -> None:
+        self.page = page
+        self.budget_ms = budget_ms
+
+    def query(self, name: str, arg=None):
+        """Run *name* against the cached audit, re-auditing first if the page changed."""
+        return self.page.evaluate(AUDIT_SCRIPT, [name, arg, self.budget_ms])
+
+    def images(self) -> dict:
+        """``{"total", "missing": [src, ...]}`` for images without alt text."""
+        return self.query("images")
+
+    def heading_levels(self) -> list[int]:
+        """Heading levels in document order."""
+        return self.query("headings")
+
+    def lang(self) -> str:
+        """The ``lang`` attribute of the html element ("" if missing)."""
+        return self.query("lang")
+
+    def links(self) -> dict:
+        """``{"total", "bad": [{"text", "href"}, ...]}`` for links with an empty or ``#`` href."""
+        return self.query("links")
+
+    def submit_button(self) -> dict | None:
+        """``{"tag", "focusable"}`` for the first submit button, or None if there is none."""
+        return self.query("submit")
+
+    def small_text(self, min_px: float) -> dict:
+        """``{"total", "tooSmall", "complete"}`` for visible body text below *min_px*."""
+        return self.query("font_size", min_px)
+
+    def contrast(self) -> dict:
+        """``{"checked", "failures", "indeterminate", "complete"}`` against WCAG AA (4.5:1, large text 3:1)."""
+        return self.query("contrast")
+
+    def stats(self) -> dict:
+        """Node counts, audit duration, completeness and how many times the page was audited."""
+        return self.query("stats")
@@ -0,0 +1,275 @@
+"""Adaptive timeouts learned from the durations of earlier runs.
+
+A static ``DEFAULT_TIMEOUT`` makes a missing element that normally renders in
+200 ms cost 30 s before the step fails. Here, every passed step, every
+successful wait on a located selector and every navigation records its
+duration in ``reports/timeout_history.json``, keeping the last
+``TIMEOUT_HISTORY_SAMPLES`` per key. Keys are grouped by browser and target
+host, so a local mirror does not tighten timeouts for the live site.
+
+Once a key has ``TIMEOUT_MIN_SAMPLES`` samples, its timeout is the
+``TIMEOUT_PERCENTILE`` duration times ``TIMEOUT_SAFETY_FACTOR``, at least
+``TIMEOUT_FLOOR_MS``. The static value is both the fallback and the ceiling:
+``DEFAULT_TIMEOUT`` for actions, Playwright's 5 s for ``expect``, and
+``NAVIGATION_TIMEOUT`` for ``goto``. A wait inside a step can never take longer
+than the step itself, so the step's timeout also caps its locators' timeouts.
+
+Steps are keyed by feature, scenario and step text, so one step text used on
+pages with very different costs learns a timeout per use. A step's timeout
+applies to its whole page (``set_default_timeout``, ``expect.set_options``, both
+local settings with no round trip). A locator's timeout is passed as
+``timeout=`` on the action or ``expect`` call itself
+(:meth:`AdaptiveTimeouts.locator_timeout`, via ``BasePage.action_timeout`` and
+``BasePage.expect_timeout``), so it never leaks to another locator's wait.
+``@timeout=MS`` on a feature or scenario fixes every timeout in it, and
+``@timeout=static`` keeps the static values.
+
+Waits that time out under an adaptive timeout are counted, and the time saved
+against the static timeout is reported for the run.
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from playwright.sync_api import expect
+
+import config
+from support.playwright_hooks import observe
+
+try:
+    import fcntl
+except ImportError:  # Windows — concurrent workers may then drop each other's samples
+    fcntl = None
+
+logger = logging.getLogger("testify")
+
+HISTORY_FILE = Path(__file__).parent.parent / "reports" / "timeout_history.json"
+TIMEOUT_TAG = "timeout="
+EXPECT_TIMEOUT_MS = 5000  # Playwright's default for expect()
+KINDS = ("steps", "locators", "navigation")
+
+
+def timeout_from_tags(tags) -> int | str | None:
+    """*MS* from a ``timeout=MS`` tag, ``"static"`` for ``timeout=static``, else None."""
+    for tag in tags:
+        if tag.startswith(TIMEOUT_TAG):
+            value = tag[len(TIMEOUT_TAG) :]
+            return "static" if value == "static" else int(value)
+    return None
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """The *pct* percentile of *samples* (nearest rank)."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))]
+
+
+class AdaptiveTimeouts:
+    """Learns per-step, per-locator and per-navigation timeouts from recorded durations."""
+
+    def __init__(
+        self,
+        history_file: Path | None = HISTORY_FILE,
+        pct: float = config.TIMEOUT_PERCENTILE,
+        factor: float = config.TIMEOUT_SAFETY_FACTOR,
+        floor_ms: int = config.TIMEOUT_FLOOR_MS,
+        min_samples: int = config.TIMEOUT_MIN_SAMPLES,
+        max_samples: int = config.TIMEOUT_HISTORY_SAMPLES,
+    ) -> None:
+        self.history_file = history_file
+        self.pct = pct
+        self.factor = factor
+        self.floor_ms = floor_ms
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.target = f"{config.BROWSER}@{urlsplit(config.BASE_URL).hostname or config.BASE_URL}"
+        self.override: int | str | None = None
+        self.stats = {"adapted": 0, "static": 0, "timeouts": 0, "saved_s": 0.0}
+        self._history: dict[str, dict[str, list]] | None = None
+        self._new: dict[str, dict[str, list]] = {kind: {} for kind in KINDS}
+        self._scenario = ""
+        self._step: str | None = None
+        self._step_start = 0.0
+        self._step_ms: int | None = None  # learned timeout of the running step
+        self._selector: str | None = None  # selector of the next locator call, set by locator_timeout
+        self._call_ms: int | None = None  # timeout passed to that call, None for the step's
+        self._applied = {"action": config.DEFAULT_TIMEOUT_MS, "expect": EXPECT_TIMEOUT_MS}
+
+    # ── History ─────────────────────────────────────────────────────────
+
+    def _samples(self, kind: str, key: str) -> list:
+        if self._history is None:
+            self._history = {}
+            if self.history_file:
+                with suppress(FileNotFoundError, json.JSONDecodeError):
+                    self._history = json.loads(self.history_file.read_text()).get(self.target, {})
+        return self._history.get(kind, {}).get(key, [])
+
+    def learned(self, kind: str, key: str) -> int | None:
+        """Timeout learned for *key*, or None while it has too few samples."""
+        if isinstance(self.override, int):
+            return self.override
+        samples = self._samples(kind, key)
+        if self.override == "static" or len(samples) < self.min_samples:
+            return None
+        return max(self.floor_ms, round(percentile(samples, self.pct) * self.factor))
+
+    def record(self, kind: str, key: str, ms: float) -> None:
+        self._new[kind].setdefault(key, []).append(round(ms, 1))
+
+    @contextmanager
+    def _locked(self):
+        lock_path = self.history_file.with_suffix(".lock")
+        with open(lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def save(self) -> dict:
+        """Merge this run's samples into the history file and return the run's stats (logged once)."""
+        if self.history_file and any(self._new.values()):
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._locked():
+                try:
+                    history = json.loads(self.history_file.read_text())
+                except (FileNotFoundError, json.JSONDecodeError):
+                    history = {}
+                target = history.setdefault(self.target, {})
+                for kind, keys in self._new.items():
+                    section = target.setdefault(kind, {})
+                    for key, samples in keys.items():
+                        section[key] = (section.get(key, []) + samples)[-self.max_samples :]
+                tmp = self.history_file.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(history))
+                os.replace(tmp, self.history_file)
+        stats = {**self.stats, "saved_s": round(self.stats["saved_s"], 1)}
+        logger.info(
+            "Timeouts: %d adaptive, %d static; %d adaptive timeouts hit, %.1fs saved against static timeouts",
+            stats["adapted"],
+            stats["static"],
+            stats["timeouts"],
+            stats["saved_s"],
+        )
+        return stats
+
+    # ── Applying ────────────────────────────────────────────────────────
+
+    def _apply(self, pages, timeout_ms: int | None) -> None:
+        """Set the action and ``expect`` timeouts of *pages* (the static ones when *timeout_ms* is None)."""
+        if timeout_ms is None:
+            action, expect_ms = config.DEFAULT_TIMEOUT_MS, EXPECT_TIMEOUT_MS
+            self.stats["static"] += 1
+        elif isinstance(self.override, int):
+            action = expect_ms = timeout_ms  # an explicit override may exceed the static values
+            self.stats["adapted"] += 1
+        else:
+            action, expect_ms = min(timeout_ms, config.DEFAULT_TIMEOUT_MS), min(timeout_ms, EXPECT_TIMEOUT_MS)
+            self.stats["adapted"] += 1
+        for page in pages:
+            page.set_default_timeout(action)
+        expect.set_options(timeout=expect_ms)
+        self._applied = {"action": action, "expect": expect_ms}
+
+    def navigation_timeout(self, url: str, wait_until: str) -> int:
+        learned = self.learned("navigation", _navigation_key(url, wait_until))
+        if learned is None or isinstance(self.override, int):
+            return learned or config.NAVIGATION_TIMEOUT_MS
+        return min(learned, config.NAVIGATION_TIMEOUT_MS)
+
+    def navigated(self, url: str, wait_until: str, ms: float) -> None:
+        self.record("navigation", _navigation_key(url, wait_until), ms)
+
+    def navigation_timed_out(self, timeout_ms: int) -> None:
+        self._timed_out(config.NAVIGATION_TIMEOUT_MS, timeout_ms)
+
+    def locator_timeout(self, selector: str, kind: str) -> int | None:
+        """Timeout for the next *kind* (``"action"`` or ``"expect"``) call on *selector*; None keeps the step's.
+
+        Within the running step's timeout. The call that follows is timed and recorded under *selector*.
+        """
+        self._selector = selector
+        self._call_ms = learned = self.learned("locators", selector)
+        if learned is None:
+            self.stats["static"] += 1
+            return None
+        self.stats["adapted"] += 1
+        if self._step_ms is not None:
+            learned = min(learned, self._step_ms)
+        if not isinstance(self.override, int):  # an explicit override may exceed the static values
+            learned = min(learned, config.DEFAULT_TIMEOUT_MS if kind == "action" else EXPECT_TIMEOUT_MS)
+        self._call_ms = learned
+        return learned
+
+    def _timed_out(self, static_ms: int, applied_ms: int) -> None:
+        if applied_ms < static_ms:
+            self.stats["timeouts"] += 1
+            self.stats["saved_s"] += (static_ms - applied_ms) / 1000
+
+    # ── Behave hooks ────────────────────────────────────────────────────
+
+    def start_scenario(self, scenario) -> None:
+        self.override = timeout_from_tags(scenario.effective_tags)
+        self._scenario = f"{scenario.feature.name} / {scenario.name}"
+
+    def start_step(self, step, pages) -> None:
+        """Apply the learned timeout of *step* to *pages* (the scenario's page and any device-matrix pages)."""
+        self._step = f"{self._scenario}: {step.name}"
+        self._selector = self._call_ms = None
+        self._step_ms = self.learned("steps", self._step)
+        self._apply(pages, self._step_ms)
+        self._step_start = time.perf_counter()
+
+    def stop_step(self, step) -> None:
+        if self._step is not None and step.status == "passed":
+            self.record("steps", self._step, (time.perf_counter() - self._step_start) * 1000)
+        self._step = self._selector = self._call_ms = None
+
+    # ── Locator waits ───────────────────────────────────────────────────
+
+    def install(self) -> None:
+        """Time the Playwright calls made on located selectors (see :func:`support.playwright_hooks.observe`)."""
+        observe(self._observe_call)
+
+    def _observe_call(self, call, obj, coro):
+        if self._step is None:
+            return call(obj, coro)
+        selector = call_ms = None
+        if type(obj).__name__ in ("Locator", "LocatorAssertions"):  # only the call right after locator_timeout
+            selector, call_ms, self._selector, self._call_ms = self._selector, self._call_ms, None, None
+        start = time.perf_counter()
+        try:
+            result = call(obj, coro)
+        except Exception as e:
+            self._failed(obj, e, (time.perf_counter() - start) * 1000, call_ms)
+            raise
+        if selector is not None:
+            self.record("locators", selector, (time.perf_counter() - start) * 1000)
+        return result
+
+    def _failed(self, obj, error: Exception, elapsed_ms: float, call_ms: int | None) -> None:
+        """Count a locator wait or assertion that ran into its adaptive timeout (not errors that failed fast)."""
+        name = type(obj).__name__
+        if name not in ("Locator", "LocatorAssertions", "PageAssertions"):
+            return  # navigation is counted by BasePage.navigate, against its own timeout
+        kind = "expect" if name.endswith("Assertions") else "action"
+        applied = call_ms if call_ms is not None else self._applied[kind]
+        if elapsed_ms >= applied * 0.9 and (kind == "expect" or type(error).__name__ == "TimeoutError"):
+            self._timed_out(config.DEFAULT_TIMEOUT_MS if kind == "action" else EXPECT_TIMEOUT_MS, applied)
+
+
+def _navigation_key(url: str, wait_until: str) -> str:
+    parts = urlsplit(url)
+    return f"{wait_until} {parts.path or '/'}"
+
+
+# Shared for the run, so the learned history is loaded once and its stats cover every scenario
+adaptive_timeouts = AdaptiveTimeouts()
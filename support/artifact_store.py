@@ -0,0 +1,204 @@
+"""Content-addressed store for failure artifacts, with a manifest of runs and scenarios.
+
+Each artifact is stored once, named by the SHA-256 of its bytes:
+``reports/artifacts/blobs/<2 hex>/<digest>.png``. When a scenario fails the
+same way every night, each night's screenshot adds one manifest line and no new
+blob. ``manifest.jsonl`` has one line per stored artifact (run, scenario,
+attachment name, blob, size, time), so the artifacts of any run or scenario
+can be found again.
+
+Allure attachments are hard links to the blob, so no bytes are copied. A copy
+is made only when the filesystem cannot link, or when blobs are
+gzip-compressed (``ARTIFACT_COMPRESS=true``).
+
+When a run closes the store, it is trimmed to ``ARTIFACT_STORE_MAX_MB``. The
+blobs whose last reference is oldest are evicted first, and so are their
+manifest lines. Blobs of the current run are never evicted. The manifest is
+appended and rewritten under an ``fcntl`` lock, so parallel workers can share
+the store.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows — the manifest is then only guarded between threads of one process
+    fcntl = None
+
+logger = logging.getLogger("testify")
+
+STORE_DIR = Path(__file__).parent.parent / "reports" / "artifacts"
+
+
+class ArtifactStore:
+    """Hash-named blobs plus an append-only manifest, trimmed to a size bound."""
+
+    def __init__(
+        self,
+        root: Path = STORE_DIR,
+        run: str = "",
+        max_bytes: int = config.ARTIFACT_STORE_MAX_MB * 1024 * 1024,
+        compress: bool = config.ARTIFACT_COMPRESS,
+    ) -> None:
+        self.root = root
+        self.run = run
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.manifest = root / "manifest.jsonl"
+        self._thread_lock = threading.Lock()
+        self.stats = {
+            "stored": 0,
+            "new_blobs": 0,
+            "deduplicated": 0,
+            "bytes_in": 0,  # artifact bytes handed to the store
+            "bytes_written": 0,  # bytes that reached the disk (new blobs and copies)
+            "evicted": 0,
+            "bytes_evicted": 0,
+            "store_bytes": 0,  # blob bytes on disk after retention
+            "write_s": 0.0,
+        }
+
+    @contextmanager
+    def _locked(self):
+        """Hold the manifest lock (threads and, where ``fcntl`` exists, processes)."""
+        with self._thread_lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / "manifest.lock", "a") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # ── Blobs ───────────────────────────────────────────────────────────
+
+    def blob_path(self, digest: str, extension: str) -> Path:
+        suffix = f".{extension}.gz" if self.compress else f".{extension}"
+        return self.root / "blobs" / digest[:2] / f"{digest}{suffix}"
+
+    def _existing(self, digest: str, extension: str) -> Path | None:
+        """The stored blob for *digest*, compressed or not."""
+        plain = self.root / "blobs" / digest[:2] / f"{digest}.{extension}"
+        for path in (plain, plain.with_name(f"{plain.name}.gz")):
+            if path.exists():
+                return path
+        return None
+
+    def put(self, data: bytes, scenario: str, name: str, extension: str = "png") -> Path:
+        """Store *data* (unless an identical blob exists) and record it for *scenario*; returns the blob."""
+        start = time.perf_counter()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._existing(digest, extension)
+        if path is None:
+            path = self.blob_path(digest, extension)
+            stored = gzip.compress(data, compresslevel=6) if self.compress else data
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(stored)
+            os.replace(tmp, path)  # a worker storing the same bytes at once just replaces it with an identical file
+            self.stats["new_blobs"] += 1
+            self.stats["bytes_written"] += len(stored)
+        else:
+            self.stats["deduplicated"] += 1
+        entry = {
+            "run": self.run,
+            "scenario": scenario,
+            "name": name,
+            "blob": path.relative_to(self.root).as_posix(),
+            "bytes": len(data),
+            "at": round(time.time(), 3),
+        }
+        with self._locked(), open(self.manifest, "a", encoding="utf-8") as out:
+            out.write(json.dumps(entry) + "\n")
+        self.stats["stored"] += 1
+        self.stats["bytes_in"] += len(data)
+        self.stats["write_s"] += time.perf_counter() - start
+        return path
+
+    def link(self, blob: Path, target: Path, data: bytes) -> None:
+        """Make *target* (e.g. an Allure attachment file) refer to *blob*; *data* are its raw bytes."""
+        start = time.perf_counter()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if blob.suffix == ".gz":
+                raise OSError("compressed blob")
+            os.link(blob, target)
+        except OSError:  # compressed, cross-device, or a filesystem without hard links
+            target.write_bytes(data)
+            self.stats["bytes_written"] += len(data)
+        self.stats["write_s"] += time.perf_counter() - start
+
+    # ── Retention ───────────────────────────────────────────────────────
+
+    def _entries(self) -> list[dict]:
+        entries = []
+        try:
+            with open(self.manifest, encoding="utf-8") as lines:
+                for line in lines:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by a crash
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def prune(self) -> None:
+        """Evict the least recently referenced blobs until the store fits in ``max_bytes``."""
+        start = time.perf_counter()
+        with self._locked():
+            sizes = {
+                path.relative_to(self.root).as_posix(): path.stat().st_size
+                for path in (self.root / "blobs").glob("*/*")
+                if not path.name.endswith(".tmp")
+            }
+            total = sum(sizes.values())
+            if self.max_bytes > 0 and total > self.max_bytes:
+                entries = self._entries()
+                last_used = dict.fromkeys(sizes, 0.0)  # blobs missing from the manifest go first
+                protected = set()
+                for entry in entries:
+                    last_used[entry["blob"]] = max(last_used.get(entry["blob"], 0.0), entry["at"])
+                    if entry["run"] == self.run:
+                        protected.add(entry["blob"])
+                evicted = set()
+                for blob in sorted(sizes, key=last_used.__getitem__):
+                    if total <= self.max_bytes:
+                        break
+                    if blob in protected:
+                        continue
+                    (self.root / blob).unlink(missing_ok=True)
+                    total -= sizes[blob]
+                    evicted.add(blob)
+                    self.stats["bytes_evicted"] += sizes[blob]
+                self.stats["evicted"] += len(evicted)
+                if evicted:
+                    tmp = self.manifest.with_suffix(f".{os.getpid()}.tmp")
+                    tmp.write_text("".join(json.dumps(e) + "\n" for e in entries if e["blob"] not in evicted))
+                    os.replace(tmp, self.manifest)
+                    logger.info("Artifact store: evicted %d blob(s) (limit %d MB)", len(evicted), self.max_bytes >> 20)
+            self.stats["store_bytes"] = total
+        self.stats["write_s"] += time.perf_counter() - start
+
+    def find(self, run: str | None = None, scenario: str | None = None) -> list[dict]:
+        """Manifest entries of *run* and/or *scenario*, each with the blob's absolute ``path``."""
+        return [
+            {**entry, "path": self.root / entry["blob"]}
+            for entry in self._entries()
+            if (run is None or entry["run"] == run) and (scenario is None or entry["scenario"] == scenario)
+        ]
+
+    def summary(self) -> dict:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats.items()}
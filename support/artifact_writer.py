@@ -0,0 +1,156 @@
+"""Background writer for failure artifacts (screenshots and their Allure attachments).
+
+Hooks only capture the raw bytes and reserve an Allure attachment entry for the
+running scenario; optional downscaling, storing the bytes in the
+content-addressed :class:`~support.artifact_store.ArtifactStore` and linking the
+attachment file to the stored blob happen on one worker thread fed by a bounded
+queue. ``close()`` drains the queue and applies the store's retention, so
+``after_all`` always leaves every artifact on disk.
+"""
+
+import io
+import logging
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from allure_commons import plugin_manager
+from allure_commons.logger import AllureFileLogger
+from allure_commons.reporter import AllureReporter
+from allure_commons.types import AttachmentType
+
+import config
+from support.artifact_store import ArtifactStore
+
+logger = logging.getLogger("testify")
+
+
+@dataclass
+class ArtifactJob:
+    """One captured artifact waiting to be written."""
+
+    data: bytes
+    scenario: str
+    name: str
+    allure_files: tuple[Path, ...] = ()  # attachment files reserved in the Allure output dirs
+
+
+def _reserve_allure_attachment(name: str) -> tuple[Path, ...]:
+    """Add a PNG attachment entry to the running Allure test and return the files it refers to.
+
+    Only the reference is recorded here; the worker writes the bytes later, into
+    the directory of each registered ``AllureFileLogger`` (the formatter's
+    ``-o``), where the Allure report looks for them. Returns nothing when the
+    Allure formatter is not active.
+    """
+    plugins = plugin_manager.get_plugins()
+    report_dirs = [plugin._report_dir for plugin in plugins if isinstance(plugin, AllureFileLogger)]
+    reporter = next((p.logger for p in plugins if isinstance(getattr(p, "logger", None), AllureReporter)), None)
+    if not report_dirs or reporter is None:
+        return ()
+    file_name = reporter._attach(uuid.uuid4(), name=name, attachment_type=AttachmentType.PNG)
+    return tuple(report_dir / file_name for report_dir in report_dirs)
+
+
+def downscale_png(data: bytes, max_width: int) -> bytes:
+    """Return *data* scaled down to *max_width* pixels wide (unchanged if Pillow is missing)."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+    with Image.open(io.BytesIO(data)) as image:
+        if image.width <= max_width:
+            return data
+        height = round(image.height * max_width / image.width)
+        out = io.BytesIO()
+        image.resize((max_width, height)).save(out, format="PNG", optimize=True)
+        return out.getvalue()
+
+
+class ArtifactWriter:
+    """Single worker thread writing queued artifacts, with backlog and timing stats."""
+
+    def __init__(
+        self,
+        store: ArtifactStore | None = None,
+        max_queue: int = config.ARTIFACT_QUEUE_SIZE,
+        max_width: int = config.SCREENSHOT_MAX_WIDTH,
+    ):
+        self.store = store or ArtifactStore()
+        self.max_width = max_width
+        self._queue: queue.Queue[ArtifactJob | None] = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self.stats = {
+            "artifacts": 0,
+            "errors": 0,
+            "max_backlog": 0,
+            "enqueue_wait_s": 0.0,  # hook time spent blocked on a full queue
+            "worker_s": 0.0,
+            "flush_s": 0.0,
+        }
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def submit_screenshot(self, data: bytes, scenario: str, attachment_name: str = "Failure Screenshot") -> None:
+        """Queue screenshot *data* of *scenario*, linking it to the current Allure test now."""
+        job = ArtifactJob(data, scenario, attachment_name, allure_files=_reserve_allure_attachment(attachment_name))
+        if self._thread is None:
+            self._write(job)  # writer disabled or already closed — write inline
+            return
+        start = time.perf_counter()
+        self._queue.put(job)  # blocks when full: backpressure instead of unbounded memory
+        self.stats["enqueue_wait_s"] += time.perf_counter() - start
+        self.stats["max_backlog"] = max(self.stats["max_backlog"], self._queue.qsize())
+
+    def close(self) -> dict:
+        """Drain the queue, stop the worker, trim the store and return the stats (the store's included)."""
+        backlog = 0
+        if self._thread is not None:
+            start = time.perf_counter()
+            backlog = self._queue.qsize()
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self.stats["flush_s"] = time.perf_counter() - start
+        self.store.prune()
+        store = self.store.summary()
+        if self.stats["artifacts"] or store["evicted"]:
+            logger.info(
+                "Artifacts: %d stored (%d new, %d deduplicated), %.1f KB written in %.2fs, store %.1f MB, "
+                "%d evicted, backlog at shutdown %d, max %d, flush %.2fs",
+                store["stored"],
+                store["new_blobs"],
+                store["deduplicated"],
+                store["bytes_written"] / 1024,
+                store["write_s"],
+                store["store_bytes"] / 1024 / 1024,
+                store["evicted"],
+                backlog,
+                self.stats["max_backlog"],
+                self.stats["flush_s"],
+            )
+        return {**{k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats.items()}, **store}
+
+    def _run(self) -> None:
+        while (job := self._queue.get()) is not None:
+            start = time.perf_counter()
+            try:
+                self._write(job)
+            except Exception as e:  # one bad artifact must not stop the rest
+                self.stats["errors"] += 1
+                logger.error("Failed to store artifact of %s: %s", job.scenario, e)
+            self.stats["worker_s"] += time.perf_counter() - start
+
+    def _write(self, job: ArtifactJob) -> None:
+        data = downscale_png(job.data, self.max_width) if self.max_width else job.data
+        blob = self.store.put(data, job.scenario, job.name)
+        for allure_file in job.allure_files:
+            self.store.link(blob, allure_file, data)
+        self.stats["artifacts"] += 1
+        logger.warning("📸 Screenshot stored: %s", blob)
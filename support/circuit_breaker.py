@@ -0,0 +1,212 @@
+"""Run-wide circuit breaker for navigation, shared across worker processes.
+
+When the target site is down, every scenario would otherwise burn its full
+retry budget before failing. The breaker counts consecutive navigation
+failures across scenarios; once it opens, remaining scenarios fail (or are
+skipped) immediately until a single half-open probe succeeds.
+
+State lives in a small JSON file guarded by an ``fcntl`` lock, so parallel
+Behave workers sharing a ``TESTIFY_SESSION`` see the same breaker.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows — state is then only shared between threads of one process
+    fcntl = None
+
+logger = logging.getLogger("testify")
+
+STATE_FILE = Path(__file__).parent.parent / "reports" / "circuit_breaker.json"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of navigating while the circuit is open."""
+
+
+def backoff_delay(attempt: int, base_s: float, cap_s: float) -> float:
+    """Return an equal-jitter exponential backoff delay for retry *attempt* (0-based)."""
+    ceiling = min(cap_s, base_s * 2**attempt)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(
+        self,
+        threshold: int = config.CIRCUIT_BREAKER_THRESHOLD,
+        cooldown_s: float = config.CIRCUIT_BREAKER_COOLDOWN_S,
+        state_file: Path | None = STATE_FILE,
+    ) -> None:
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.state_file = state_file
+        self.session = ""
+        self._memory_state: dict = {}
+        self._thread_lock = threading.Lock()
+
+    # ── State storage ───────────────────────────────────────────────────
+
+    def _fresh_state(self) -> dict:
+        return {
+            "session": self.session,
+            "state": CLOSED,
+            "failures": 0,
+            "opened_at": 0.0,
+            "probe_pid": None,
+            "probe_started": 0.0,
+            "short_circuited": 0,
+            "events": [],
+        }
+
+    @contextmanager
+    def _state(self):
+        """Yield the shared state dict under an exclusive lock; write it back only if it changed."""
+        with self._thread_lock:
+            if self.state_file is None:
+                if not self._memory_state:
+                    self._memory_state = self._fresh_state()
+                yield self._memory_state
+                return
+
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            lock_path = self.state_file.with_suffix(".lock")
+            with open(lock_path, "a") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    try:
+                        stored = self.state_file.read_text()
+                        state = json.loads(stored)
+                    except (FileNotFoundError, json.JSONDecodeError):
+                        stored, state = None, self._fresh_state()
+                    if state.get("session") != self.session:
+                        stored, state = None, self._fresh_state()
+                    try:
+                        yield state
+                    finally:
+                        # Persist even when the caller raises (e.g. a short-circuited call was counted)
+                        updated = json.dumps(state)
+                        if updated != stored:
+                            tmp = self.state_file.with_suffix(".tmp")
+                            tmp.write_text(updated)
+                            os.replace(tmp, self.state_file)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _record(state: dict, event: str, **details) -> None:
+        state["events"].append({"event": event, "timestamp": datetime.now(timezone.utc).isoformat(), **details})
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def start_session(self, session: str) -> None:
+        """Bind the breaker to a run; state from any other session is discarded."""
+        self.session = session
+        self._memory_state = {}
+        with self._state():
+            pass
+
+    # ── Gate ────────────────────────────────────────────────────────────
+
+    def is_open(self) -> bool:
+        """Return True if calls should be short-circuited right now (no probe is due)."""
+        with self._state() as state:
+            if state["state"] == CLOSED:
+                return False
+            return not self._probe_due(state) and state["probe_pid"] != os.getpid()
+
+    def _probe_due(self, state: dict) -> bool:
+        """True once the cooldown has elapsed, or a half-open probe has gone quiet for as long."""
+        now = time.time()
+        if state["state"] == OPEN:
+            return now - state["opened_at"] >= self.cooldown_s
+        return state["state"] == HALF_OPEN and now - state["probe_started"] >= self.cooldown_s
+
+    def before_call(self) -> None:
+        """Admit a call, turning it into the half-open probe if the cooldown has elapsed.
+
+        Raises:
+            CircuitOpenError: The circuit is open (or another worker is probing).
+        """
+        with self._state() as state:
+            if state["state"] == CLOSED:
+                return
+            if self._probe_due(state):
+                state.update(state=HALF_OPEN, probe_pid=os.getpid(), probe_started=time.time())
+                self._record(state, HALF_OPEN)
+                logger.info("Circuit half-open — probing target")
+                return
+            if state["state"] == HALF_OPEN and state["probe_pid"] == os.getpid():
+                return
+            state["short_circuited"] += 1
+            remaining = max(0.0, self.cooldown_s - (time.time() - state["opened_at"]))
+            raise CircuitOpenError(
+                f"Circuit open after {state['failures']} consecutive navigation failures — "
+                f"target considered down (next probe in {remaining:.0f}s)"
+            )
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._state() as state:
+            if state["state"] != CLOSED:
+                self._record(state, CLOSED, failures=state["failures"])
+                logger.info("Circuit closed — target reachable again")
+            state.update(state=CLOSED, failures=0, probe_pid=None)
+
+    def record_failure(self, error: str) -> None:
+        """Count a failed call, opening the circuit at the threshold or on a failed probe."""
+        with self._state() as state:
+            state["failures"] += 1
+            probe_failed = state["state"] == HALF_OPEN
+            if probe_failed or (state["state"] == CLOSED and state["failures"] >= self.threshold):
+                state.update(state=OPEN, opened_at=time.time(), probe_pid=None)
+                self._record(state, OPEN, failures=state["failures"], error=error)
+                logger.error("Circuit opened after %d consecutive failures: %s", state["failures"], error)
+
+    def count_short_circuit(self) -> None:
+        """Count a scenario skipped in ``before_scenario`` because the circuit is open."""
+        with self._state() as state:
+            state["short_circuited"] += 1
+
+    def summary(self) -> dict:
+        """Return the events and short-circuit count for this session."""
+        with self._state() as state:
+            return {"state": state["state"], "short_circuited": state["short_circuited"], "events": state["events"]}
+
+
+def environment_state_file(env: str) -> Path:
+    """State file of the breaker shared by the matrix cells that target environment *env*."""
+    return STATE_FILE.with_name(f"circuit_breaker.{env}.json")
+
+
+def read_breaker_summary(state_file: Path = STATE_FILE) -> dict | None:
+    """Return the recorded breaker summary, or None if the circuit never tripped."""
+    try:
+        state = json.loads(state_file.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not state.get("events"):
+        return None
+    return {"state": state["state"], "short_circuited": state["short_circuited"], "events": state["events"]}
+
+
+# Shared by every page object in this process; bound to the run in ``before_all``
+breaker = CircuitBreaker()
@@ -0,0 +1,230 @@
+"""Run one scenario across several device profiles at once.
+
+A scenario tagged ``@device_matrix`` gets one browser context per profile in
+``DEVICE_MATRIX`` (Playwright device names such as ``"iPhone 8"``, which carry
+viewport, device scale factor, touch and user agent, or custom
+``WIDTHxHEIGHT[@DPR]`` sizes), all in the scenario's browser. Navigation is
+started on every profile first and only then awaited, so the page loads
+overlap and ten profiles cost roughly as much as the slowest one.
+
+Steps decorated with :func:`per_device` run once per profile with
+``context.page``, the page objects and ``context.device`` (the profile name)
+swapped to that profile. A profile that fails a step is left out of the
+remaining steps, and the step fails naming every profile that failed it. Each
+profile is reported as its own Allure result (``"<scenario> [<profile>]"``)
+next to the scenario's own entry.
+"""
+
+import functools
+import hashlib
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from allure_commons import plugin_manager
+from allure_commons.model2 import Label, Parameter, StatusDetails, TestResult, TestStepResult
+from playwright.sync_api import Browser, BrowserContext, Page
+
+import config
+from pages.contact_page import ContactPage
+from pages.home_page import HomePage
+from pages.responsive_page import ResponsivePage
+
+logger = logging.getLogger("testify")
+
+MATRIX_TAG = "device_matrix"
+SWAPPED = ("device", "page", "browser_context", "home_page", "contact_page", "responsive_page")
+
+
+def profile_options(spec: str, devices: dict, browser_name: str = "chromium") -> dict:
+    """``new_context`` options for a Playwright device name or a ``WIDTHxHEIGHT[@DPR]`` size."""
+    if spec in devices:
+        options = {k: v for k, v in devices[spec].items() if k != "default_browser_type"}
+        if browser_name == "firefox":
+            options.pop("is_mobile", None)  # not supported by Firefox
+        return options
+    size, _, scale = spec.partition("@")
+    width, sep, height = size.partition("x")
+    if not sep or not width.isdigit() or not height.isdigit():
+        raise ValueError(f"Unknown device profile {spec!r}: use a Playwright device name or WIDTHxHEIGHT[@DPR]")
+    options = {"viewport": {"width": int(width), "height": int(height)}}
+    if scale:
+        options["device_scale_factor"] = float(scale)
+    return options
+
+
+@dataclass
+class DeviceRun:
+    """One profile's context, page objects and outcome within a matrix scenario."""
+
+    name: str
+    browser_context: BrowserContext
+    page: Page
+    home_page: HomePage
+    contact_page: ContactPage
+    responsive_page: ResponsivePage
+    status: str = "passed"
+    error: str | None = None
+    navigate_ms: float = 0.0
+    start_ms: int = field(default_factory=lambda: int(time.time() * 1000))
+    steps: list[dict] = field(default_factory=list)
+
+    @property
+    def device(self) -> str:
+        return self.name
+
+
+class DeviceMatrix:
+    """The device profiles of one ``@device_matrix`` scenario, sharing a single browser."""
+
+    def __init__(self, browser: Browser, profiles: list[str], devices: dict) -> None:
+        self.runs: list[DeviceRun] = []
+        self.step = ""
+        self.wall_ms = 0.0  # time spent in matrix navigations, all profiles together
+        browser_name = browser.browser_type.name
+        for name in profiles:
+            browser_context = browser.new_context(**profile_options(name, devices, browser_name))
+            browser_context.set_default_timeout(config.DEFAULT_TIMEOUT_MS)
+            page = browser_context.new_page()
+            self.runs.append(
+                DeviceRun(name, browser_context, page, HomePage(page), ContactPage(page), ResponsivePage(page))
+            )
+        logger.debug("Device matrix: %s", ", ".join(profiles))
+
+    @property
+    def active(self) -> list[DeviceRun]:
+        return [run for run in self.runs if run.status == "passed"]
+
+    @property
+    def failed(self) -> list[DeviceRun]:
+        return [run for run in self.runs if run.status != "passed"]
+
+    def start_step(self, step) -> None:
+        self.step = f"{step.keyword} {step.name}"
+
+    def navigate_home(self) -> None:
+        """Load the home page on every profile, with the page loads overlapping."""
+        start = time.perf_counter()
+        failed, started = [], []
+        for run in self.active:
+            step_start = int(time.time() * 1000)
+            try:
+                run.responsive_page.start_navigation_home()
+                started.append((run, step_start))
+            except Exception as e:
+                failed.append(self._fail(run, step_start, e))
+        for run, step_start in started:
+            try:
+                run.responsive_page.wait_until_settled()
+            except Exception as e:
+                failed.append(self._fail(run, step_start, e))
+            else:
+                self._pass(run, step_start)
+            run.navigate_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.wall_ms += (time.perf_counter() - start) * 1000
+        self._raise_failures(failed)
+
+    def run_step(self, context, fn, *args, **kwargs) -> None:
+        """Call step function *fn* once per active profile with *context* pointed at that profile."""
+        saved = {attr: getattr(context, attr, None) for attr in SWAPPED}
+        failed = []
+        try:
+            for run in self.active:
+                for attr in SWAPPED:
+                    setattr(context, attr, getattr(run, attr))
+                step_start = int(time.time() * 1000)
+                try:
+                    fn(context, *args, **kwargs)
+                except Exception as e:
+                    failed.append(self._fail(run, step_start, e))
+                else:
+                    self._pass(run, step_start)
+        finally:
+            for attr, value in saved.items():
+                setattr(context, attr, value)
+        self._raise_failures(failed)
+
+    def _pass(self, run: DeviceRun, step_start: int) -> None:
+        self._record(run, step_start, "passed")
+
+    def _fail(self, run: DeviceRun, step_start: int, error: Exception) -> DeviceRun:
+        run.status = "failed" if isinstance(error, AssertionError) else "broken"
+        run.error = str(error).split("\n")[0]
+        self._record(run, step_start, run.status)
+        return run
+
+    def _record(self, run: DeviceRun, step_start: int, status: str) -> None:
+        run.steps.append({"name": self.step, "status": status, "start": step_start, "stop": int(time.time() * 1000)})
+
+    def _raise_failures(self, failed: list[DeviceRun]) -> None:
+        if failed:
+            details = "; ".join(f"{run.name}: {run.error}" for run in failed)
+            raise AssertionError(f"Failed on {len(failed)}/{len(self.runs)} device profile(s) — {details}")
+
+    @property
+    def navigation_retries(self) -> int:
+        return sum(run.responsive_page.navigation_retries + run.home_page.navigation_retries for run in self.runs)
+
+    # ── Reporting ───────────────────────────────────────────────────────
+
+    def report(self, scenario) -> None:
+        """Write one Allure result per profile (a no-op without the Allure formatter).
+
+        A profile that passed every step it ran is reported as skipped if the
+        scenario stopped early because another profile failed.
+        """
+        stop = int(time.time() * 1000)
+        stopped_early = scenario.steps[-1].status.name in ("untested", "skipped")
+        labels = [Label(name="feature", value=scenario.feature.name)]
+        labels += [Label(name="tag", value=tag) for tag in scenario.effective_tags]
+        if config.MATRIX_ENV:  # also running as a browser/environment matrix cell (see matrix.py)
+            labels += [Label(name="browser", value=config.BROWSER), Label(name="environment", value=config.MATRIX_ENV)]
+        for run in self.runs:
+            status, message = run.status, run.error
+            if status == "passed" and stopped_early:
+                status, message = "skipped", "Stopped early: another device profile failed"
+            name = f"{scenario.name} [{run.name}]"
+            full_name = f"{scenario.feature.name}: {name}"
+            result = TestResult(
+                uuid=str(uuid.uuid4()),
+                historyId=hashlib.md5(full_name.encode()).hexdigest(),
+                name=name,
+                fullName=full_name,
+                status=status,
+                statusDetails=StatusDetails(message=message) if message else None,
+                start=run.start_ms,
+                stop=stop,
+                labels=[*labels, Label(name="device", value=run.name)],
+                parameters=[Parameter(name="device", value=run.name)],
+                steps=[TestStepResult(**step) for step in run.steps],
+            )
+            plugin_manager.hook.report_result(result=result)
+
+    def summary(self) -> dict:
+        """Per-profile outcome and navigation time, plus the wall time of the overlapped navigations."""
+        return {
+            "devices": {
+                run.name: {"status": run.status, "navigate_ms": run.navigate_ms, "error": run.error}
+                for run in self.runs
+            },
+            "matrix_wall_ms": round(self.wall_ms, 1),
+        }
+
+    def close(self) -> None:
+        for run in self.runs:
+            run.page.close()
+            run.browser_context.close()
+
+
+def per_device(fn):
+    """Run a step once per device profile when the scenario has a :class:`DeviceMatrix`."""
+
+    @functools.wraps(fn)
+    def step(context, *args, **kwargs):
+        matrix = getattr(context, "matrix", None)
+        if matrix is None:
+            return fn(context, *args, **kwargs)
+        return matrix.run_step(context, fn, *args, **kwargs)
+
+    return step
@@ -0,0 +1,187 @@
+"""Event-driven image load tracking.
+
+An :class:`ImageTracker` attached to a page before it navigates records every
+image request from Playwright's network events: status code, size, load time
+and failure reason. Scenarios tagged ``@track_images`` get one from the start
+of the scenario.
+
+:meth:`ImageTracker.settle` then waits in the page, in a single ``evaluate``,
+until every ``<img>`` has fired ``load`` or ``error``. It resolves as soon as
+the last one does, with no polling or fixed sleeps, and gives up at
+``DEFAULT_TIMEOUT_MS``. Lazy images outside the viewport that were never
+requested are reported as such instead of being awaited. Sizes come from the
+``Content-Length`` header, or from the page's Resource Timing entries when
+there is none.
+"""
+
+import logging
+import time
+
+from playwright.sync_api import Page, Request, Response
+
+import config
+
+logger = logging.getLogger("testify")
+
+IMAGE_TAG = "track_images"
+
+# Resolves once every <img> has loaded or failed (or at the deadline); lazy images never requested are not awaited
+SETTLE_SCRIPT = """
+([requested, timeoutMs]) => new Promise((resolve) => {
+    const start = performance.now();
+    const images = Array.from(document.images);
+    const seen = new Set(requested);
+    const url = (img) => img.currentSrc || img.src;
+    const lazy = (img) => img.loading === "lazy" && !seen.has(url(img)) && !seen.has(img.src);
+    const state = (img) => {
+        if (!url(img)) return "broken";
+        if (img.complete) return img.naturalWidth > 0 ? "loaded" : "broken";
+        return lazy(img) ? "lazy" : "pending";
+    };
+    const report = () => {
+        clearTimeout(timer);
+        resolve({
+            wait_ms: performance.now() - start,
+            images: images.map((img) => {
+                const entry = performance.getEntriesByName(url(img), "resource").pop();
+                return {
+                    src: url(img),
+                    state: state(img),
+                    loading: img.loading,
+                    width: img.naturalWidth,
+                    height: img.naturalHeight,
+                    perf_ms: entry ? entry.duration : null,
+                    perf_bytes: entry && entry.encodedBodySize ? entry.encodedBodySize : null,
+                };
+            }),
+        });
+    };
+    const waiting = images.filter((img) => state(img) === "pending");
+    let left = waiting.length;
+    const timer = setTimeout(report, timeoutMs);
+    if (!left) return report();
+    for (const img of waiting) {
+        const done = () => { if (--left === 0) report(); };
+        img.addEventListener("load", done, {once: true});
+        img.addEventListener("error", done, {once: true});
+    }
+})
+"""
+
+
+class ImageTracker:
+    """Records a page's image requests from network events and settles its ``<img>`` elements."""
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self.requests: dict[str, dict] = {}  # original (pre-redirect) URL → network record
+        self.report: dict | None = None
+        page.on("request", self._on_request)
+        page.on("response", self._on_response)
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_failed)
+
+    # ── Network events (all data read here is local: no round trips) ────
+
+    def _record(self, request: Request) -> dict | None:
+        if request.resource_type != "image":
+            return None
+        first = request
+        while first.redirected_from:
+            first = first.redirected_from
+        return self.requests.get(first.url)
+
+    def _on_request(self, request: Request) -> None:
+        if request.resource_type == "image" and not request.redirected_from:
+            self.requests[request.url] = {
+                "status": None,
+                "bytes": None,
+                "ms": None,
+                "error": None,
+                "redirects": 0,
+                "started": time.perf_counter(),
+            }
+        elif (record := self._record(request)) is not None:
+            record["redirects"] += 1
+
+    def _on_response(self, response: Response) -> None:
+        record = self._record(response.request)
+        if record is not None:
+            length = response.headers.get("content-length")
+            record.update(status=response.status, bytes=int(length) if length and length.isdigit() else None)
+
+    def _on_finished(self, request: Request) -> None:
+        record = self._record(request)
+        if record is not None:
+            response_end = request.timing.get("responseEnd", -1)
+            elapsed = (time.perf_counter() - record["started"]) * 1000
+            record["ms"] = round(response_end if response_end >= 0 else elapsed, 1)
+
+    def _on_failed(self, request: Request) -> None:
+        record = self._record(request)
+        if record is not None:
+            record.update(error=request.failure, ms=round((time.perf_counter() - record["started"]) * 1000, 1))
+
+    # ── Settling ────────────────────────────────────────────────────────
+
+    def settle(self, timeout_ms: int = config.DEFAULT_TIMEOUT_MS) -> dict:
+        """Wait until every image has loaded or failed, then report each one.
+
+        Returns ``{"images": [...], "loaded", "broken", "lazy", "pending", "wait_ms"}``,
+        where each image has its state, status code, bytes, load time and error.
+        """
+        result = self.page.evaluate(SETTLE_SCRIPT, [list(self.requests), timeout_ms])
+        images = []
+        for image in result["images"]:
+            record = self.requests.get(image["src"], {})
+            status, error = record.get("status"), record.get("error")
+            state = image["state"]
+            if state == "loaded" and (error or (status is not None and status >= 400)):
+                state = "broken"
+            images.append(
+                {
+                    "src": image["src"],
+                    "state": state,
+                    "status": status,
+                    "bytes": record.get("bytes") or image["perf_bytes"],
+                    "ms": record.get("ms") if record.get("ms") is not None else _round(image["perf_ms"]),
+                    "error": error,
+                    "redirects": record.get("redirects", 0),
+                    "size": f"{image['width']}x{image['height']}",
+                    "loading": image["loading"],
+                }
+            )
+        self.report = {
+            "images": images,
+            **{state: sum(i["state"] == state for i in images) for state in ("loaded", "broken", "lazy", "pending")},
+            "wait_ms": round(result["wait_ms"], 1),
+        }
+        logger.debug(
+            "Images: %d loaded, %d broken, %d lazy (never requested), %d pending after %.0f ms",
+            *(self.report[k] for k in ("loaded", "broken", "lazy", "pending", "wait_ms")),
+        )
+        return self.report
+
+    def summary(self) -> dict | None:
+        """Counts from the last :meth:`settle` and the lazy images never requested (for the live stream)."""
+        if self.report is None:
+            return None
+        never_requested = [i["src"] for i in self.report["images"] if i["state"] == "lazy"]
+        return {**{k: v for k, v in self.report.items() if k != "images"}, "never_requested": never_requested}
+
+
+def describe_failure(image: dict) -> str:
+    """Why *image* did not load, e.g. ``"404, 512 B"`` or ``"net::ERR_NAME_NOT_RESOLVED"``."""
+    if image["error"]:
+        return image["error"]
+    if not image["src"]:
+        return "no src"
+    if image["status"] is not None and image["status"] >= 400:
+        return f"{image['status']}, {image['bytes'] or 0} B"
+    if image["state"] == "pending":
+        return "still loading at the deadline"
+    return f"decoded to {image['size']}" + (f" (status {image['status']})" if image["status"] else "")
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
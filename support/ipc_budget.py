@@ -0,0 +1,139 @@
+"""Playwright round-trip accounting with per-step call budgets.
+
+Every blocking Playwright sync API call (``goto``, ``get_attribute``, each
+``expect`` assertion, ``evaluate`` …) is a round trip to the driver process.
+Building locators (``locator``, ``first``, ``filter``) is not. The counter
+observes the sync API's dispatch point, ``SyncBase._sync`` (see
+:mod:`support.playwright_hooks`), and counts calls made while a step runs: per
+step, and per page-object method (the outermost ``pages/`` method on the call
+stack; calls made directly from step code count as ``(step)``). With the step
+profiler running, the method comes from its frame stack. Without it, the
+Python stack is walked only in steps that have a budget, so plain counting
+costs one increment per call.
+
+A scenario or feature tagged ``@max_calls=N`` gets a per-step budget of *N*
+calls (``IPC_STEP_BUDGET`` sets a default). With ``IPC_BUDGET_ACTION=fail``,
+the call that goes over the budget fails the step. With ``warn``, a warning is
+logged when the step ends.
+"""
+
+import logging
+import sys
+from collections import Counter
+from pathlib import Path
+
+import config
+from support.playwright_hooks import observe
+
+logger = logging.getLogger("testify")
+
+PAGES_DIR = str(Path(__file__).parent.parent / "pages")
+BUDGET_TAG = "max_calls="
+
+
+class IpcBudgetExceededError(AssertionError):
+    """Raised by the call that takes a step over its round-trip budget (``IPC_BUDGET_ACTION=fail``)."""
+
+
+def budget_from_tags(tags) -> int | None:
+    """Return *N* from a ``max_calls=N`` tag, if there is one."""
+    for tag in tags:
+        if tag.startswith(BUDGET_TAG):
+            return int(tag[len(BUDGET_TAG) :])
+    return None
+
+
+def _caller() -> str:
+    """``Class.method`` of the outermost page-object frame on the stack, or ``(step)``."""
+    frame = sys._getframe(2)
+    found = None
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(PAGES_DIR):
+            owner = frame.f_locals.get("self")
+            found = f"{type(owner).__name__}.{frame.f_code.co_name}" if owner is not None else frame.f_code.co_name
+        frame = frame.f_back
+    return found or "(step)"
+
+
+class IpcCounter:
+    """Counts driver round trips per step and page-object method for one Behave run."""
+
+    def __init__(
+        self,
+        default_budget: int = config.IPC_STEP_BUDGET,
+        action: str = config.IPC_BUDGET_ACTION,
+        caller=None,
+    ) -> None:
+        self.default_budget = default_budget or None
+        self.action = action
+        self.caller = caller  # returns the running page-object method, e.g. StepProfiler.page_method
+        self.budget: int | None = None
+        self.run_by_method: Counter = Counter()
+        self.over_budget: list[dict] = []
+        self._step: str | None = None
+        self._step_calls = 0
+        self._step_by_method: Counter = Counter()
+        self._scenario = ""
+        self._scenario_steps: list[int] = []
+
+    def install(self) -> None:
+        """Hook the Playwright sync API (see :func:`support.playwright_hooks.observe`)."""
+        observe(self._observe_call)
+
+    def _observe_call(self, call, obj, coro):
+        if self._step is not None:
+            self._count(coro)
+        return call(obj, coro)
+
+    def _count(self, coro) -> None:
+        self._step_calls += 1
+        if self.caller is not None:
+            self._step_by_method[self.caller() or "(step)"] += 1
+        elif self.budget:
+            self._step_by_method[_caller()] += 1
+        if self.action == "fail" and self.budget and self._step_calls == self.budget + 1:
+            coro.close()  # never awaited: closing it avoids a "coroutine was never awaited" warning
+            raise IpcBudgetExceededError(
+                f"Step made more than {self.budget} Playwright round trips: {dict(self._step_by_method)}"
+            )
+
+    # ── Behave hooks ────────────────────────────────────────────────────
+
+    def start_scenario(self, scenario) -> None:
+        self._scenario = scenario.name
+        self._scenario_steps = []
+        self.budget = budget_from_tags(scenario.effective_tags) or self.default_budget
+
+    def start_step(self, step) -> None:
+        self._step = f"{step.keyword} {step.name}"
+        self._step_calls = 0
+        self._step_by_method = Counter()
+
+    def stop_step(self, step) -> None:
+        self._scenario_steps.append(self._step_calls)
+        self.run_by_method.update(self._step_by_method)
+        if self.budget and self._step_calls > self.budget:
+            self.over_budget.append(
+                {"scenario": self._scenario, "step": self._step, "calls": self._step_calls, "budget": self.budget}
+            )
+            if self.action != "fail":
+                logger.warning(
+                    "Step '%s' made %d Playwright round trips (budget %d): %s",
+                    self._step,
+                    self._step_calls,
+                    self.budget,
+                    dict(self._step_by_method.most_common(5)),
+                )
+        self._step = None
+
+    def finish_scenario(self) -> dict:
+        """Round trips of the scenario that just ended, in total and per step."""
+        return {"ipc_calls": sum(self._scenario_steps), "ipc_steps": list(self._scenario_steps)}
+
+    def summary(self, top_n: int = config.PROFILE_TOP_N) -> dict:
+        """Run totals: calls, the busiest page-object methods, and steps that went over budget."""
+        return {
+            "calls": sum(self.run_by_method.values()),
+            "by_method": dict(self.run_by_method.most_common(top_n)),
+            "over_budget": self.over_budget,
+        }
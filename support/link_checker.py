@@ -0,0 +1,267 @@
+"""Concurrent link and asset checker with pooled connections and a TTL cache.
+
+Page objects collect every link and asset URL on a page in one evaluate
+(:data:`COLLECT_SCRIPT`). The checker then requests them concurrently, at most
+``LINK_CHECK_PER_HOST`` at a time per host, over reused keep-alive
+connections. Each URL gets a ``HEAD`` first, falling back to ``GET`` when the
+server rejects ``HEAD`` or errors. Redirects are followed.
+
+Results are cached in ``reports/link_cache.json``. A URL that resolved is not
+checked again for ``LINK_CHECK_TTL`` seconds, by this scenario, later ones, or
+later runs. Failures are only cached for a minute, so a transient error is
+retried soon. Statuses in ``LINK_CHECK_UNVERIFIED`` (rate limiting, bot
+walls) count as unverified rather than broken.
+
+Only ``http``/``https`` URLs are checked, so a local stand-in server (the
+benchmark fixture or a ``mirror_site.py`` snapshot) works like the live site.
+With ``LINK_CHECK_SCOPE=internal`` only URLs on the page's own host are
+checked, which keeps offline runs offline.
+"""
+
+import http.client
+import json
+import logging
+import os
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import config
+
+logger = logging.getLogger("testify")
+
+CACHE_FILE = Path(__file__).parent.parent / "reports" / "link_cache.json"
+USER_AGENT = "Mozilla/5.0 (compatible; TestifyLinkCheck/1.0)"
+REDIRECTS = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+FAILURE_TTL_S = 60
+GET_READ_LIMIT = 64 * 1024  # bytes of a GET body read before the connection is dropped instead of reused
+MAX_WORKERS = 32
+
+# Every link and asset URL in the document, absolute and without fragments, deduplicated
+COLLECT_SCRIPT = """
+() => {
+    const found = new Map();
+    const add = (raw, kind) => {
+        if (!raw) return;
+        let url;
+        try { url = new URL(raw, document.baseURI); } catch (e) { return; }
+        if (url.protocol !== "http:" && url.protocol !== "https:") return;
+        url.hash = "";
+        if (!found.has(url.href)) found.set(url.href, kind);
+    };
+    const srcset = (value, kind) => (value || "").split(",").forEach((c) => add(c.trim().split(/\\s+/)[0], kind));
+    document.querySelectorAll("a[href], area[href]").forEach((el) => add(el.getAttribute("href"), "link"));
+    document.querySelectorAll("link[href]").forEach((el) => add(el.getAttribute("href"), `link[${el.rel}]`));
+    document.querySelectorAll("img, source, video, audio, iframe, embed, script[src], object[data]").forEach((el) => {
+        const kind = el.tagName.toLowerCase();
+        add(el.getAttribute("src") || el.getAttribute("data"), kind);
+        srcset(el.getAttribute("srcset"), kind);
+        if (el.getAttribute("poster")) add(el.getAttribute("poster"), kind);
+    });
+    return [...found].map(([url, kind]) => ({url, kind}));
+}
+"""
+
+
+def _origin(url: str) -> tuple[str, str, int]:
+    parts = urlsplit(url)
+    return parts.scheme, parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80)
+
+
+class _HostPool:
+    """Keep-alive connections to one origin, with at most *size* requests in flight."""
+
+    def __init__(self, origin: tuple[str, str, int], size: int, timeout_s: float) -> None:
+        self.origin = origin
+        self.timeout_s = timeout_s
+        self.slots = threading.BoundedSemaphore(size)
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> http.client.HTTPConnection:
+        """An idle kept-alive connection, or a new one."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self.connect()
+
+    def connect(self) -> http.client.HTTPConnection:
+        """A new connection (opened by its first request)."""
+        scheme, host, port = self.origin
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout_s, context=ssl.create_default_context())
+        return http.client.HTTPConnection(host, port, timeout=self.timeout_s)
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if not reusable:
+            conn.close()
+            return
+        with self._lock:
+            self._idle.append(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+
+class LinkChecker:
+    """Checks URLs concurrently with per-host limits, connection reuse and a persistent TTL cache."""
+
+    def __init__(
+        self,
+        per_host: int = config.LINK_CHECK_PER_HOST,
+        timeout_s: float = config.LINK_CHECK_TIMEOUT_S,
+        ttl_s: float = config.LINK_CHECK_TTL_S,
+        unverified: tuple[int, ...] = config.LINK_CHECK_UNVERIFIED,
+        cache_file: Path | None = CACHE_FILE,
+    ) -> None:
+        self.per_host = per_host
+        self.timeout_s = timeout_s
+        self.ttl_s = ttl_s
+        self.unverified = set(unverified)
+        self.cache_file = cache_file
+        self.stats = {"checked": 0, "cache_hits": 0, "requests": 0, "connections_reused": 0}
+        self._cache: dict[str, dict] | None = None
+        self._pools: dict[tuple, _HostPool] = {}
+        self._lock = threading.Lock()
+
+    # ── Cache ───────────────────────────────────────────────────────────
+
+    def _load_cache(self) -> dict[str, dict]:
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_file and self.ttl_s > 0:
+                with suppress(FileNotFoundError, json.JSONDecodeError):
+                    self._cache = json.loads(self.cache_file.read_text())
+        return self._cache
+
+    def _cached(self, url: str) -> dict | None:
+        entry = self._load_cache().get(url)
+        if entry is None or self.ttl_s <= 0:
+            return None
+        ttl = self.ttl_s if entry["outcome"] == "ok" else min(self.ttl_s, FAILURE_TTL_S)
+        if time.time() - entry["checked_at"] > ttl:
+            return None
+        return {**entry, "cached": True}
+
+    def save_cache(self) -> None:
+        """Write the cache, dropping expired entries (atomic, so parallel workers never read a partial file)."""
+        if not self.cache_file or self.ttl_s <= 0:
+            return
+        with self._lock:
+            now = time.time()
+            live = {url: e for url, e in self._load_cache().items() if now - e["checked_at"] <= self.ttl_s}
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(live))
+            os.replace(tmp, self.cache_file)
+
+    # ── Requests ────────────────────────────────────────────────────────
+
+    def _pool(self, url: str) -> _HostPool:
+        origin = _origin(url)
+        with self._lock:
+            if origin not in self._pools:
+                self._pools[origin] = _HostPool(origin, self.per_host, self.timeout_s)
+            return self._pools[origin]
+
+    def _request(self, method: str, url: str) -> tuple[int, str | None]:
+        """One request over a pooled connection; returns the status and the Location header."""
+        pool = self._pool(url)
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        with pool.slots:
+            for attempt in range(2):
+                # A kept-alive connection the server had already closed is retried once, in the same slot,
+                # on a fresh connection (a recursive call would wait for a slot of its own and could deadlock)
+                conn = pool.acquire() if attempt == 0 else pool.connect()
+                reused = conn.sock is not None
+                try:
+                    conn.request(method, path, headers={"User-Agent": USER_AGENT, "Accept": "*/*"})
+                    response = conn.getresponse()
+                    response.read(GET_READ_LIMIT if method == "GET" else None)
+                    break
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    if not reused:
+                        raise
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["connections_reused"] += reused
+            pool.release(conn, reusable=response.isclosed() and not response.will_close)
+            return response.status, response.getheader("Location")
+
+    def _fetch(self, url: str) -> dict:
+        """Follow *url* through its redirects, trying HEAD and then GET at each hop."""
+        start = time.perf_counter()
+        result = {"url": url, "final_url": url, "status": None, "method": "HEAD", "redirects": 0, "error": None}
+        current = url
+        try:
+            while True:
+                status, location = self._request("HEAD", current)
+                method = "HEAD"
+                if status >= 400 or (status in REDIRECTS and not location):
+                    status, location = self._request("GET", current)
+                    method = "GET"
+                result.update(final_url=current, status=status, method=method)
+                if status not in REDIRECTS or not location:
+                    break
+                if result["redirects"] == MAX_REDIRECTS:
+                    result["error"] = f"more than {MAX_REDIRECTS} redirects"
+                    break
+                result["redirects"] += 1
+                current = urljoin(current, location)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        if result["error"] or result["status"] is None:
+            result["outcome"] = "broken"
+        elif result["status"] in self.unverified:
+            result["outcome"] = "unverified"
+        else:
+            result["outcome"] = "ok" if result["status"] < 400 else "broken"
+        result["ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    def check(self, url: str) -> dict:
+        """Check one URL (served from the cache while it is fresh)."""
+        with self._lock:
+            self.stats["checked"] += 1
+            cached = self._cached(url)
+            if cached:
+                self.stats["cache_hits"] += 1
+                return cached
+        result = {**self._fetch(url), "checked_at": time.time()}
+        with self._lock:
+            self._load_cache()[url] = result
+        return {**result, "cached": False}
+
+    def check_all(self, urls: list[str]) -> list[dict]:
+        """Check *urls* concurrently and return their results in the same order."""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return []
+        hosts = len({url.split("/", 3)[2] for url in urls})  # netloc, without parsing (bad URLs fail in check)
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, hosts * self.per_host, len(urls))) as pool:
+            results = list(pool.map(self.check, urls))
+        self.save_cache()
+        unverified = [f"{r['url']} ({r['status']})" for r in results if r["outcome"] == "unverified"]
+        if unverified:
+            logger.warning("Link check: could not verify %d URL(s): %s", len(unverified), ", ".join(unverified[:5]))
+        cached = sum(r["cached"] for r in results)
+        logger.debug("Link check: %d URL(s) on %d host(s), %d from cache", len(urls), hosts, cached)
+        return results
+
+    def close(self) -> None:
+        for pool in self._pools.values():
+            pool.close()
+
+
+# Shared across scenarios so the connection pools and the in-memory cache outlive each page
+link_checker = LinkChecker()
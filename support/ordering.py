@@ -0,0 +1,114 @@
+"""History-driven scenario ordering for the fastest failure feedback.
+
+Each scenario is scored by its estimated probability of failing per second of
+runtime (Smith's rule for minimising the expected time to the first failure).
+The estimate comes from recent runs in ``run_history.json``:
+
+* failure rate — failed/broken runs, weighted towards recent runs, with a small prior
+* flakiness — how often the outcome flipped between consecutive runs
+* duration — recency-weighted mean runtime
+
+Scenarios with no history are treated as likely to fail (new code). Behave runs
+a feature's scenarios together, so features are ordered by their best-scoring
+scenario and the scenarios (and rules) inside each feature by their own score.
+The order depends only on the history snapshot. Ties fall back to file order,
+and every scenario still gets its own browser context.
+"""
+
+from itertools import pairwise
+from statistics import median
+
+HISTORY_WINDOW = 30  # most recent runs considered
+DECAY = 0.8  # weight of a run relative to the next newer one
+PRIOR_RUNS = 1.0  # pseudo-runs added to every scenario's record...
+PRIOR_FAILURES = 0.05  # ...of which this many failed
+NEW_SCENARIO_P_FAIL = 0.5
+MIN_DURATION_S = 0.1
+FAILING = ("failed", "broken")
+
+
+def scenario_stats(history: list, window: int = HISTORY_WINDOW) -> dict[str, dict]:
+    """Return ``{name: {"p_fail", "flakiness", "duration_s", "score"}}`` from the last *window* runs."""
+    raw: dict[str, dict] = {}
+    for age, run in enumerate(reversed(history[-window:])):
+        weight = DECAY**age
+        for scenario in run.get("scenarios", []):
+            entry = raw.setdefault(scenario["name"].strip(), {"w": 0.0, "fail_w": 0.0, "dur_w": 0.0, "outcomes": []})
+            failed = scenario["status"] in FAILING
+            entry["w"] += weight
+            entry["fail_w"] += weight * failed
+            entry["dur_w"] += weight * scenario.get("duration_ms", 0)
+            entry["outcomes"].append(failed)
+
+    stats = {}
+    for name, entry in raw.items():
+        fail_rate = (entry["fail_w"] + PRIOR_FAILURES) / (entry["w"] + PRIOR_RUNS)
+        outcomes = entry["outcomes"]
+        flips = sum(a != b for a, b in pairwise(outcomes))
+        flakiness = flips / (len(outcomes) - 1) if len(outcomes) > 1 else 0.0
+        p_fail = 1 - (1 - fail_rate) * (1 - flakiness / 2)
+        duration_s = max(entry["dur_w"] / entry["w"] / 1000, MIN_DURATION_S)
+        stats[name] = {
+            "p_fail": round(p_fail, 4),
+            "flakiness": round(flakiness, 3),
+            "duration_s": round(duration_s, 3),
+            "score": p_fail / duration_s,
+        }
+    return stats
+
+
+class ScenarioOrderer:
+    """Reorders a parsed Behave model in place by failure probability per second."""
+
+    def __init__(self, history: list) -> None:
+        self.stats = scenario_stats(history)
+        durations = [s["duration_s"] for s in self.stats.values()]
+        self.default_duration_s = median(durations) if durations else 5.0
+
+    def score(self, name: str) -> float:
+        stat = self.stats.get(name.strip())
+        return stat["score"] if stat else NEW_SCENARIO_P_FAIL / self.default_duration_s
+
+    @staticmethod
+    def _children(item) -> list | None:
+        """What runs inside *item*: a feature's or rule's ``run_items``, an outline's scenarios; None for a scenario."""
+        children = getattr(item, "run_items", None)
+        return children if children is not None else getattr(item, "scenarios", None)
+
+    def rank(self, item) -> float:
+        """Score of a scenario, or the best score inside a feature, rule or outline."""
+        children = self._children(item)
+        if children is None:
+            return self.score(item.name)
+        return max((self.rank(child) for child in children), default=0.0)
+
+    def _sort(self, container) -> None:
+        """Reorder a feature's or rule's ``run_items`` (what Behave iterates) and the rules inside it."""
+
+        def key(item) -> tuple:
+            return -self.rank(item), item.location.line
+
+        container.run_items.sort(key=key)
+        container.scenarios.sort(key=key)  # kept in step for code that reads .scenarios
+        for child in container.run_items:
+            if hasattr(child, "run_items"):
+                self._sort(child)
+
+    def _scenarios(self, item):
+        """The scenarios of *item* in run order; outline rows stay in Examples order."""
+        children = self._children(item)
+        if children is None:
+            yield item
+            return
+        for child in children:
+            yield from self._scenarios(child)
+
+    def order(self, features: list) -> list[dict]:
+        """Sort *features* and their scenarios in place; return the planned order (name, score)."""
+        features.sort(key=lambda feature: (-self.rank(feature), str(feature.filename)))
+        plan = []
+        for feature in features:
+            self._sort(feature)
+            for scenario in self._scenarios(feature):
+                plan.append({"name": scenario.name.strip(), "score": round(self.score(scenario.name), 4)})
+        return plan
@@ -0,0 +1,77 @@
+"""One hook on the Playwright sync API, shared by every observer of its calls.
+
+Every blocking sync API call goes through ``SyncBase._sync``. The step
+profiler, the IPC counter and the adaptive timeouts all need to see those
+calls. Instead of each one replacing ``_sync`` with its own wrapper, this
+module wraps it once and hands each call to the registered observers in
+order.
+
+An observer is called as ``observer(call, obj, coro)``. It must return
+``call(obj, coro)``, or close *coro* before raising without calling it. What
+it does before and after that call is up to the observer. The chain of
+observers is composed when one is registered, so a call costs one function
+call per observer.
+
+``SyncBase._sync`` is private to Playwright, which is why ``requirements.txt``
+pins its version. If an upgrade moves it, :func:`observe` raises
+:class:`PlaywrightHookError` instead of letting call budgets, the profiler and
+adaptive timeouts silently stop working.
+"""
+
+import functools
+
+PINNED_VERSION = "1.57.0"  # the Playwright version in requirements.txt this hook is written against
+
+_original = None
+_observers: list = []
+_chain = None
+
+
+class PlaywrightHookError(RuntimeError):
+    """Raised when the installed Playwright has no ``SyncBase._sync`` to observe."""
+
+
+def observe(observer) -> None:
+    """Pass every Playwright sync API call through *observer*.
+
+    Raises :class:`PlaywrightHookError` if this Playwright version has no ``SyncBase._sync``.
+    """
+    global _chain
+    if not _install():
+        try:
+            from playwright._repo_version import version
+        except ImportError:
+            version = "unknown"
+        raise PlaywrightHookError(
+            f"Playwright {version} has no SyncBase._sync to observe (written against {PINNED_VERSION}, "
+            "pinned in requirements.txt). Install that version, or set STEP_PROFILER, IPC_COUNT and "
+            "ADAPTIVE_TIMEOUTS to false."
+        )
+    if observer not in _observers:
+        _observers.append(observer)
+    call = _original
+    for registered in reversed(_observers):
+        call = functools.partial(registered, call)
+    _chain = call
+
+
+def _install() -> bool:
+    """Wrap ``SyncBase._sync`` once."""
+    global _original, _chain
+    if _original is not None:
+        return True
+    try:
+        from playwright._impl._sync_base import SyncBase
+    except ImportError:
+        SyncBase = None  # noqa: N806
+    original = getattr(SyncBase, "_sync", None)
+    if original is None:
+        return False
+    _original = _chain = original
+
+    @functools.wraps(original)
+    def _sync(obj, coro):
+        return _chain(obj, coro)
+
+    SyncBase._sync = _sync
+    return True
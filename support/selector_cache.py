@@ -0,0 +1,223 @@
+"""Run-wide selector pinning and cost profiler for page objects.
+
+Many page-object selectors are fallback unions (``"#top h2, #intro h2, .blurb
+h2"``) that cover several site builds. The first time such a union is looked
+up, one in-page probe counts the matches of each alternative and times one
+``querySelectorAll`` of each. When exactly one alternative matches, it is
+pinned for the rest of the run. Later lookups build ``pinned.or_(others)``
+without another probe: where the pinned alternative is the one that renders it
+is what matches, and on a page where it is missing the other alternatives still
+match, as with the full union.
+
+A union whose alternatives match at the same time is never narrowed: it is
+queried whole and reported as ambiguous. A union that matches nothing yet is
+queried whole (so Playwright still waits on it) and probed again on later
+lookups, at most ``MAX_PROBES`` times in the run. Single selectors are never
+probed, since there is nothing to pin.
+
+The profile is saved to ``reports/selector_profile.json`` and lists slow,
+ambiguous (several alternatives match at once) and dead (never matched)
+alternatives of the probed unions.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from playwright.sync_api import Locator
+
+import config
+
+logger = logging.getLogger("testify")
+
+PROFILE_FILE = Path(__file__).parent.parent / "reports" / "selector_profile.json"
+
+# Counts the matches of each alternative and times one querySelectorAll of it; null count = not plain CSS
+PROBE_SCRIPT = """
+(alternatives) => alternatives.map((selector) => {
+    try {
+        const start = performance.now();
+        const count = document.querySelectorAll(selector).length;
+        return {count, us: Math.round((performance.now() - start) * 1000)};
+    } catch (e) {
+        return {count: null, us: 0};
+    }
+})
+"""
+MAX_PROBES = 3  # probes of a union that has not matched yet, before it is always queried whole
+
+
+def split_union(selector: str) -> list[str]:
+    """Split a CSS selector list on its top-level commas (not inside quotes, brackets or parens)."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(selector):
+        if quote:
+            if ch == quote and selector[i - 1] != "\\":
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(selector[start:i].strip())
+            start = i + 1
+    parts.append(selector[start:].strip())
+    return [p for p in parts if p]
+
+
+class SelectorCache:
+    """Pins the single matching alternative of each union selector and profiles the probes."""
+
+    def __init__(self, slow_us: int = config.SELECTOR_SLOW_US, max_probes: int = MAX_PROBES) -> None:
+        self.slow_us = slow_us
+        self.max_probes = max_probes
+        self.stats: dict[str, dict] = {}
+        self.names: dict[str, str] = {}
+        self._registered: set[type] = set()
+
+    def register(self, page_class: type) -> None:
+        """Name the selector constants of *page_class* (e.g. ``HomePage.HERO_TAGLINE``) for the report."""
+        if page_class in self._registered:
+            return
+        self._registered.add(page_class)
+        for cls in reversed(page_class.__mro__):
+            for attr, value in vars(cls).items():
+                if not attr.isupper() or attr == "URL":
+                    continue
+                items = value.items() if isinstance(value, dict) else [(None, value)]
+                for key, selector in items:
+                    if isinstance(selector, str):
+                        label = f"{cls.__name__}.{attr}" + (f"[{key!r}]" if key is not None else "")
+                        self.names.setdefault(selector, label)
+
+    def _entry(self, selector: str) -> dict:
+        if selector not in self.stats:
+            alternatives = split_union(selector)
+            self.stats[selector] = {
+                "alternatives": alternatives,
+                "pinned": None,
+                "settled": len(alternatives) == 1,  # nothing left to probe for
+                "css": True,
+                "lookups": 0,
+                "probes": 0,
+                "probe_ms": 0.0,
+                "pin_hits": 0,
+                "max_matches": [0] * len(alternatives),
+                "query_us": [0] * len(alternatives),
+                "ambiguous_probes": 0,
+            }
+        return self.stats[selector]
+
+    def _probe(self, page, entry: dict) -> list[dict]:
+        start = time.perf_counter()
+        results = page.evaluate(PROBE_SCRIPT, entry["alternatives"])
+        entry["probe_ms"] += (time.perf_counter() - start) * 1000
+        entry["probes"] += 1
+        if any(r["count"] is None for r in results):
+            entry["css"] = False  # Playwright-only syntax: resolved by Playwright, not profiled
+            return results
+        for i, r in enumerate(results):
+            entry["max_matches"][i] = max(entry["max_matches"][i], r["count"])
+            entry["query_us"][i] = max(entry["query_us"][i], r["us"])
+        if sum(1 for r in results if r["count"]) > 1:
+            entry["ambiguous_probes"] += 1
+        return results
+
+    def locator(self, page, selector: str) -> Locator:
+        """A locator for *selector* on *page*: its pinned alternative (others as ``or_``), or the full union."""
+        entry = self._entry(selector)
+        entry["lookups"] += 1
+        if entry["pinned"] is not None:
+            entry["pin_hits"] += 1
+            return self._pinned_locator(page, entry)
+        if entry["settled"]:
+            return page.locator(selector)
+
+        results = self._probe(page, entry)
+        matching = [alt for alt, r in zip(entry["alternatives"], results, strict=True) if r["count"]]
+        if not entry["css"] or len(matching) > 1:
+            entry["settled"] = True  # not CSS, or ambiguous: narrowing would drop elements the union matches
+        elif matching:
+            entry["pinned"] = matching[0]
+            entry["settled"] = True
+            logger.debug("Pinned %s → %s", self.names.get(selector, selector), entry["pinned"])
+            return self._pinned_locator(page, entry)
+        elif entry["probes"] >= self.max_probes:
+            entry["settled"] = True  # nothing rendered yet on any probe: stop paying for probes
+        return page.locator(selector)
+
+    @staticmethod
+    def _pinned_locator(page, entry: dict) -> Locator:
+        pinned = page.locator(entry["pinned"])
+        rest = [alt for alt in entry["alternatives"] if alt != entry["pinned"]]
+        return pinned.or_(page.locator(", ".join(rest)))
+
+    def report(self) -> dict:
+        """Per-selector profile plus the slow, ambiguous and dead selector lists."""
+        selectors, slow, ambiguous, dead = [], [], [], []
+        for selector, entry in sorted(self.stats.items(), key=lambda kv: -kv[1]["probe_ms"]):
+            name = self.names.get(selector, selector)
+            row = {
+                "name": name,
+                "selector": selector,
+                "lookups": entry["lookups"],
+                "probes": entry["probes"],
+                "probe_ms": round(entry["probe_ms"], 1),
+                "pinned": entry["pinned"],
+                "pin_hits": entry["pin_hits"],
+                "alternatives": [
+                    {"selector": alt, "max_matches": matches, "query_us": us}
+                    for alt, matches, us in zip(
+                        entry["alternatives"], entry["max_matches"], entry["query_us"], strict=True
+                    )
+                ],
+            }
+            if not entry["css"]:
+                row["profiled"] = False
+            selectors.append(row)
+            if not entry["css"] or not entry["probes"]:
+                continue
+            query_us = sum(entry["query_us"])
+            if query_us > self.slow_us:
+                slow.append({"name": name, "query_us": query_us})
+            if entry["ambiguous_probes"]:
+                matching = [a["selector"] for a in row["alternatives"] if a["max_matches"]]
+                ambiguous.append({"name": name, "matching": matching})
+            never = [a["selector"] for a in row["alternatives"] if not a["max_matches"]]
+            if never:
+                dead.append({"name": name, "never_matched": never, "all": len(never) == len(entry["alternatives"])})
+        return {"selectors": selectors, "slow": slow, "ambiguous": ambiguous, "dead": dead}
+
+    def save_report(self, path: Path = PROFILE_FILE) -> dict:
+        """Write the profile to *path*, log the findings, and return summary counts."""
+        report = self.report()
+        report["generated"] = datetime.now(timezone.utc).isoformat()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        for item in report["slow"]:
+            logger.info("Slow selector %s: %dµs per query", item["name"], item["query_us"])
+        for item in report["ambiguous"]:
+            logger.info("Ambiguous selector %s: %s all match", item["name"], ", ".join(item["matching"]))
+        for item in report["dead"]:
+            logger.info("Dead selector %s: never matched %s", item["name"], ", ".join(item["never_matched"]))
+        summary = {
+            "selectors": len(report["selectors"]),
+            "probes": sum(e["probes"] for e in self.stats.values()),
+            "lookups": sum(e["lookups"] for e in self.stats.values()),
+            "pinned": sum(1 for e in self.stats.values() if e["pinned"]),
+            "slow": len(report["slow"]),
+            "ambiguous": len(report["ambiguous"]),
+            "dead": len(report["dead"]),
+        }
+        logger.info(
+            "Selector profile: %(selectors)d selectors, %(lookups)d lookups, %(probes)d probes, %(pinned)d pinned",
+            summary,
+        )
+        return summary
+
+
+selector_cache = SelectorCache()
@@ -0,0 +1,203 @@
+"""Hierarchical wall-time profiler: scenarios → steps → page-object methods → Playwright calls.
+
+Steps are timed from the Behave hooks. Page-object methods are timed by
+wrapping the public methods of the page classes, and Playwright calls by
+observing the sync API's single dispatch point, ``SyncBase._sync`` (see
+:mod:`support.playwright_hooks`). Every
+measured call becomes a Chrome trace "complete" event; the exported file opens
+in https://www.speedscope.app (or ``chrome://tracing``) as a flame graph.
+
+Totals per call site and the slowest steps are aggregated over the run. The
+profiler only takes two ``perf_counter_ns`` readings and one list append per
+call, and it times its own bookkeeping so the overhead can be checked.
+"""
+
+import functools
+import heapq
+import inspect
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import config
+from support.playwright_hooks import observe
+
+logger = logging.getLogger("testify")
+
+PROFILE_FILE = Path(__file__).parent.parent / "reports" / "step_profile.json"
+MAX_EVENTS = 200_000  # beyond this only the aggregates are kept
+
+
+class StepProfiler:
+    """Records nested timing frames for one Behave run."""
+
+    def __init__(self, top_n: int = config.PROFILE_TOP_N, max_events: int = MAX_EVENTS) -> None:
+        self.top_n = top_n
+        self.max_events = max_events
+        self.events: list[tuple] = []
+        self.dropped = 0
+        self.totals: dict[tuple[str, str], list] = {}  # (category, name) → [calls, total_ns, max_ns]
+        self.scenario = ""
+        self._slowest: list[tuple] = []  # min-heap of (duration_ns, seq, scenario, step)
+        self._seq = 0
+        self._stack: list[tuple[str, str, int]] = []
+        self._origin = time.perf_counter_ns()
+        self._overhead_ns = 0
+
+    # ── Frames ──────────────────────────────────────────────────────────
+
+    def begin(self, category: str, name: str) -> None:
+        """Open a frame; frames opened inside it nest under it in the flame graph."""
+        self._stack.append((category, name, time.perf_counter_ns()))
+
+    def end(self, category: str) -> int:
+        """Close the innermost *category* frame (and any frames left open inside it); return its duration in ns."""
+        now = time.perf_counter_ns()
+        duration = 0
+        while self._stack:
+            cat, name, start = self._stack.pop()
+            duration = now - start
+            if len(self.events) < self.max_events:
+                self.events.append((cat, name, start, duration, len(self._stack)))
+            else:
+                self.dropped += 1
+            total = self.totals.setdefault((cat, name), [0, 0, 0])
+            total[0] += 1
+            total[1] += duration
+            total[2] = max(total[2], duration)
+            if cat == category:
+                break
+        self._overhead_ns += time.perf_counter_ns() - now
+        return duration
+
+    def measure(self, category: str, name: str, fn, *args, **kwargs):
+        """Call *fn* inside a frame."""
+        self.begin(category, name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.end(category)
+
+    # ── Behave hooks ────────────────────────────────────────────────────
+
+    def start_scenario(self, scenario) -> None:
+        self.scenario = scenario.name
+        self.begin("scenario", scenario.name)
+
+    def finish_scenario(self) -> None:
+        if any(cat == "scenario" for cat, _, _ in self._stack):
+            self.end("scenario")
+
+    def start_step(self, step) -> None:
+        self.begin("step", f"{step.keyword} {step.name}")
+
+    def stop_step(self, step) -> None:
+        duration = self.end("step")
+        self._seq += 1
+        entry = (duration, self._seq, self.scenario, f"{step.keyword} {step.name}")
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    # ── Instrumentation ─────────────────────────────────────────────────
+
+    def _wrap(self, category: str, name: str, fn):
+        profiler = self
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler._stack:
+                return fn(*args, **kwargs)
+            return profiler.measure(category, name, fn, *args, **kwargs)
+
+        wrapper.__profiled__ = True
+        return wrapper
+
+    def instrument_pages(self, *page_classes: type) -> None:
+        """Time the public methods of *page_classes* and the base classes they define them on."""
+        seen = set()
+        for page_class in page_classes:
+            for cls in page_class.__mro__:
+                if cls is object or cls in seen:
+                    continue
+                seen.add(cls)
+                for attr, value in list(vars(cls).items()):
+                    if attr.startswith("_") or not inspect.isfunction(value) or getattr(value, "__profiled__", False):
+                        continue
+                    setattr(cls, attr, self._wrap("page", f"{cls.__name__}.{attr}", value))
+
+    def instrument_playwright(self) -> None:
+        """Time every Playwright sync API call (see :func:`support.playwright_hooks.observe`)."""
+        observe(self._observe_call)
+
+    def page_method(self) -> str | None:
+        """The outermost page-object method being timed, if any."""
+        return next((name for category, name, _ in self._stack if category == "page"), None)
+
+    def _observe_call(self, call, obj, coro):
+        if not self._stack:
+            return call(obj, coro)
+        return self.measure("playwright", getattr(coro, "__qualname__", type(obj).__name__), call, obj, coro)
+
+    # ── Output ──────────────────────────────────────────────────────────
+
+    def slowest_steps(self) -> list[dict]:
+        """The run's slowest steps, slowest first."""
+        return [
+            {"step": step, "scenario": scenario, "ms": round(duration / 1e6, 1)}
+            for duration, _, scenario, step in sorted(self._slowest, reverse=True)
+        ]
+
+    def hotspots(self, category: str) -> list[dict]:
+        """Top call sites of *category* by total time."""
+        rows = [
+            (total, calls, peak, name) for (cat, name), (calls, total, peak) in self.totals.items() if cat == category
+        ]
+        return [
+            {"name": name, "calls": calls, "total_ms": round(total / 1e6, 1), "max_ms": round(peak / 1e6, 1)}
+            for total, calls, peak, name in sorted(rows, reverse=True)[: self.top_n]
+        ]
+
+    def chrome_trace(self) -> dict:
+        """The recorded frames in Chrome trace event format (also read by speedscope)."""
+        pid = os.getpid()
+        events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "testify"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "behave"}},
+        ]
+        for cat, name, start, duration, _depth in sorted(self.events, key=lambda e: (e[2], e[4])):
+            events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": 1,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path: Path = PROFILE_FILE) -> dict:
+        """Write the flame-graph file, log the slowest steps, and return the run summary."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()))
+        summary = {
+            "events": len(self.events),
+            "dropped": self.dropped,
+            "overhead_ms": round(self._overhead_ns / 1e6, 1),
+            "step_ms": round(sum(t[1] for (cat, _), t in self.totals.items() if cat == "step") / 1e6, 1),
+            "slowest_steps": self.slowest_steps(),
+            "page_hotspots": self.hotspots("page"),
+            "playwright_hotspots": self.hotspots("playwright"),
+        }
+        logger.info(
+            "Step profile: %d frames, profiler overhead %.1f ms → %s", len(self.events), summary["overhead_ms"], path
+        )
+        for row in summary["slowest_steps"]:
+            logger.info("  %8.1f ms  %s  (%s)", row["ms"], row["step"], row["scenario"])
+        return summary
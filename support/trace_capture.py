@@ -0,0 +1,121 @@
+"""On-failure Playwright trace capture, recorded as one trace chunk per step.
+
+Tracing starts with each scenario's browser context. Every step runs in its own
+chunk, which is saved to a scratch directory when the step ends. Once the
+scenario is over, the chunks of failed or flaky scenarios are kept under
+``reports/traces/`` and attached to Allure; all others are deleted. Time spent
+in tracing calls and bytes kept are counted for the run.
+"""
+
+import logging
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import allure
+from playwright.sync_api import Error as PlaywrightError
+
+import config
+
+logger = logging.getLogger("testify")
+
+TRACE_DIR = Path(__file__).parent.parent / "reports" / "traces"
+
+
+class TraceRecorder:
+    """Per-run trace capture; drives one scenario's browser context at a time."""
+
+    def __init__(self, trace_dir: Path = TRACE_DIR) -> None:
+        self.trace_dir = trace_dir
+        self._tracing = None
+        self._scratch: Path | None = None
+        self._chunks: list[tuple[str, Path]] = []
+        self.stats = {"scenarios_traced": 0, "traces_kept": 0, "bytes_kept": 0, "overhead_s": 0.0}
+
+    def _timed(self, fn, *args, **kwargs) -> None:
+        start = time.perf_counter()
+        try:
+            fn(*args, **kwargs)
+        finally:
+            self.stats["overhead_s"] += time.perf_counter() - start
+
+    def start_scenario(self, browser_context) -> None:
+        """Start tracing *browser_context* for a new scenario."""
+        self._tracing = browser_context.tracing
+        self._scratch = Path(tempfile.mkdtemp(prefix="testify-trace-"))
+        self._chunks = []
+        self._timed(
+            self._tracing.start,
+            screenshots=config.TRACE_SCREENSHOTS,
+            snapshots=config.TRACE_SNAPSHOTS,
+            sources=config.TRACE_SOURCES,
+        )
+        self.stats["scenarios_traced"] += 1
+
+    def start_step(self, step) -> None:
+        """Open a chunk for *step* (discarding anything recorded since the last one)."""
+        if self._tracing is not None:
+            self._timed(self._tracing.start_chunk, title=f"{step.keyword} {step.name}")
+
+    def stop_step(self, step) -> None:
+        """Save the chunk for *step* to the scratch directory."""
+        if self._tracing is None:
+            return
+        path = self._scratch / f"{len(self._chunks) + 1:02d}.zip"
+        try:
+            self._timed(self._tracing.stop_chunk, path=str(path))
+        except PlaywrightError as e:  # the traced context was closed during the step
+            logger.debug("Trace chunk for '%s' not saved: %s", step.name, str(e).split("\n")[0])
+            return
+        self._chunks.append((f"{step.keyword} {step.name}", path))
+
+    def switch_context(self, browser_context) -> None:
+        """Trace *browser_context* instead, when a step replaces the scenario's context; the old trace is dropped."""
+        if self._tracing is None:
+            return
+        self._timed(self._tracing.stop)  # before the old context closes
+        shutil.rmtree(self._scratch, ignore_errors=True)
+        self.stats["scenarios_traced"] -= 1  # counted again by start_scenario
+        self.start_scenario(browser_context)
+
+    def finish_scenario(self, scenario, keep: bool) -> Path | None:
+        """Keep the step chunks of *scenario* if *keep*, else drop them; returns the kept directory."""
+        if self._tracing is None:
+            return None
+        self._tracing = None
+        kept = None
+        try:
+            if keep and self._chunks:
+                kept = self._keep(scenario)
+        finally:
+            shutil.rmtree(self._scratch, ignore_errors=True)
+        return kept
+
+    def _keep(self, scenario) -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_name = scenario.name.replace(" ", "_").replace("-", "")[:50]
+        target = self.trace_dir / f"{safe_name}_{timestamp}"
+        target.mkdir(parents=True, exist_ok=True)
+        for index, (title, chunk) in enumerate(self._chunks, start=1):
+            if not chunk.exists():
+                continue
+            dest = target / chunk.name
+            shutil.move(chunk, dest)
+            self.stats["bytes_kept"] += dest.stat().st_size
+            allure.attach.file(str(dest), name=f"Trace {index:02d}: {title}", extension="zip")
+        self.stats["traces_kept"] += 1
+        logger.warning("🧭 Trace kept: %s (playwright show-trace <chunk>.zip)", target)
+        return target
+
+    def summary(self) -> dict:
+        """Return the run totals, logging them once."""
+        logger.info(
+            "Tracing: %d scenarios traced, %d kept (%.1f KB), overhead %.2fs",
+            self.stats["scenarios_traced"],
+            self.stats["traces_kept"],
+            self.stats["bytes_kept"] / 1024,
+            self.stats["overhead_s"],
+        )
+        return {**self.stats, "overhead_s": round(self.stats["overhead_s"], 3)}
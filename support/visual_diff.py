@@ -0,0 +1,265 @@
+"""Visual regression: baseline screenshots compared with a tiled, vectorized diff.
+
+Each baseline PNG has a sidecar (``<name>.json``) with the digest of its bytes.
+A screenshot whose bytes match it passes without being decoded. Otherwise
+both images are split into ``VISUAL_TILE``-pixel square tiles and hashed, all
+tiles in one vectorized pass, and only the tiles whose hashes differ are
+diffed. Pixels that differ by too little to matter are filtered out
+with integer operations, and the rest get pixelmatch's perceptual YIQ color
+distance in one batch. A pixel counts as different when that distance exceeds
+``VISUAL_THRESHOLD`` (0-1). The check fails when more than
+``VISUAL_MAX_DIFF_RATIO`` of the pixels differ, or when the size changed.
+
+Baselines live in ``visual_baselines/<browser>/<width>x<height>/``, one per
+scenario, region and viewport. A ``@device_matrix`` profile has its own
+directory instead (``visual_baselines/<browser>/<profile>/``), since profiles
+with the same viewport can differ in device scale factor. With ``VISUAL_UPDATE=missing`` (default), a
+missing baseline is recorded and the check passes. ``all`` re-records every
+baseline and ``none`` fails on a missing one. Regions that change on their own
+are masked in the screenshot itself (Playwright ``mask``), so they hash and
+diff as identical. Failures attach the actual image, the baseline and a
+heatmap of the changed pixels to Allure.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import allure
+import numpy as np
+from PIL import Image
+
+import config
+
+logger = logging.getLogger("testify")
+
+BASELINE_DIR = Path(__file__).parent.parent / "visual_baselines"
+DIFF_DIR = Path(__file__).parent.parent / "reports" / "visual"
+MASK_COLOR = "#FF00FF"
+
+# RGB difference → YIQ difference, and the YIQ weights of pixelmatch's color distance
+YIQ = np.array(
+    [
+        [0.29889531, 0.58662247, 0.11448223],
+        [0.59597799, -0.27417610, -0.32180189],
+        [0.21147017, -0.52261711, 0.31114694],
+    ],
+    np.float32,
+)
+YIQ_WEIGHTS = np.array([0.5053, 0.299, 0.1957], np.float32)
+MAX_YIQ_DELTA = 35215.0  # distance between black and white
+# Largest distance per unit of squared RGB difference: pixels whose channels differ by at most m are within 3·k·m²
+YIQ_GAIN = float(np.linalg.eigvalsh(YIQ.T @ np.diag(YIQ_WEIGHTS) @ YIQ).max())
+
+_MULTIPLIERS: dict[int, np.ndarray] = {}
+
+# ── Diff engine ─────────────────────────────────────────────────────────────
+
+
+@dataclass
+class DiffResult:
+    """Outcome of comparing a screenshot with its baseline."""
+
+    width: int
+    height: int
+    tiles: int
+    changed_tiles: int
+    diff_pixels: int
+    size_changed: bool
+    passed: bool
+    ms: float
+    heatmap: np.ndarray | None = None
+
+    @property
+    def diff_ratio(self) -> float:
+        return self.diff_pixels / max(1, self.width * self.height)
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    """PNG bytes → ``(height, width, 3)`` uint8 RGB array."""
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, format="PNG", compress_level=1)
+    return out.getvalue()
+
+
+def png_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _padded(pixels: np.ndarray, tile: int) -> np.ndarray:
+    """*pixels* zero-padded to whole tiles (no copy when it already fits)."""
+    height, width, _ = pixels.shape
+    rows, cols = -(-height // tile), -(-width // tile)
+    if (rows * tile, cols * tile) == (height, width):
+        return np.ascontiguousarray(pixels)
+    padded = np.zeros((rows * tile, cols * tile, 3), np.uint8)
+    padded[:height, :width] = pixels
+    return padded
+
+
+def _tile_view(padded: np.ndarray, tile: int) -> np.ndarray:
+    """``(rows, tile, cols, tile, 3)`` view of a padded image: ``view[r, :, c]`` is one tile."""
+    return padded.reshape(padded.shape[0] // tile, tile, padded.shape[1] // tile, tile, 3)
+
+
+def tile_hashes(padded: np.ndarray, tile: int) -> np.ndarray:
+    """A 64-bit hash per tile, computed for all tiles at once.
+
+    Each tile's bytes are read as 64-bit words and summed with a fixed random
+    odd multiplier per word position (a multiplicative universal hash, wrapping
+    at 2**64). Changing any pixel changes the sum except with negligible
+    probability, and the whole image is hashed in a few vectorized passes with
+    no per-tile Python work.
+    """
+    if tile % 8:
+        raise ValueError(f"VISUAL_TILE must be a multiple of 8, got {tile}")
+    words_per_row = tile * 3 // 8
+    if tile not in _MULTIPLIERS:
+        rng = np.random.default_rng(tile)
+        _MULTIPLIERS[tile] = rng.integers(0, 2**63, (tile, words_per_row), dtype=np.uint64) * 2 + 1
+    words = padded.reshape(padded.shape[0], -1).view(np.uint64)
+    words = words.reshape(padded.shape[0] // tile, tile, padded.shape[1] // tile, words_per_row)
+    with np.errstate(over="ignore"):
+        return (words * _MULTIPLIERS[tile][None, :, None, :]).sum(axis=(1, 3), dtype=np.uint64)
+
+
+def _deltas(actual: np.ndarray, baseline: np.ndarray, limit: float) -> np.ndarray:
+    """Perceptual (YIQ) distance per pixel of equal-shaped ``(..., 3)`` arrays; 0 where it cannot exceed *limit*."""
+    diff = np.maximum(actual, baseline) - np.minimum(actual, baseline)
+    spread = np.maximum(np.maximum(diff[..., 0], diff[..., 1]), diff[..., 2])  # max(axis=-1) is far slower
+    candidates = np.flatnonzero(spread > int((limit / (3 * YIQ_GAIN)) ** 0.5))
+    delta = np.zeros(spread.shape, np.float32)
+    if candidates.size:
+        d = actual.reshape(-1, 3).take(candidates, axis=0).astype(np.float32)
+        d -= baseline.reshape(-1, 3).take(candidates, axis=0)
+        delta.reshape(-1)[candidates] = (d @ YIQ.T) ** 2 @ YIQ_WEIGHTS
+    return delta
+
+
+def _heatmap(padded: np.ndarray, tile: int, rows: np.ndarray, cols: np.ndarray, delta: np.ndarray, limit: float):
+    """The screenshot faded out, with differing pixels in red (darker = larger difference)."""
+    heat = padded // 4 + 191
+    strength = np.clip(delta / MAX_YIQ_DELTA, 0, 1)
+    red = np.stack([255 - 100 * strength, 40 * (1 - strength), 40 * (1 - strength)], axis=-1).astype(np.uint8)
+    view = _tile_view(heat, tile)
+    view[rows, :, cols] = np.where((delta > limit)[..., None], red, view[rows, :, cols])
+    return heat
+
+
+def compare(
+    actual: np.ndarray,
+    baseline: np.ndarray,
+    threshold: float = config.VISUAL_THRESHOLD,
+    max_ratio: float = config.VISUAL_MAX_DIFF_RATIO,
+    tile: int = config.VISUAL_TILE,
+    heatmap: bool = True,
+) -> DiffResult:
+    """Compare *actual* with *baseline*, diffing only the tiles whose hashes differ."""
+    start = time.perf_counter()
+    size_changed = baseline.shape != actual.shape
+    height, width = min(actual.shape[0], baseline.shape[0]), min(actual.shape[1], baseline.shape[1])
+    ours, theirs = _padded(actual[:height, :width], tile), _padded(baseline[:height, :width], tile)
+    hashes = tile_hashes(ours, tile)
+    changed = np.flatnonzero(hashes != tile_hashes(theirs, tile))
+    rows, cols = np.unravel_index(changed, hashes.shape)
+
+    limit = MAX_YIQ_DELTA * threshold * threshold
+    # view[rows, :, cols] gathers the changed tiles as (n, tile, tile, 3)
+    delta = _deltas(_tile_view(ours, tile)[rows, :, cols], _tile_view(theirs, tile)[rows, :, cols], limit)
+    diff_pixels = int(np.count_nonzero(delta > limit))
+    passed = not size_changed and diff_pixels / max(1, width * height) <= max_ratio
+    heat = None
+    if heatmap and not passed:
+        heat = _heatmap(ours, tile, rows, cols, delta, limit)[:height, :width]
+    ms = (time.perf_counter() - start) * 1000
+    return DiffResult(width, height, hashes.size, len(changed), diff_pixels, size_changed, passed, round(ms, 2), heat)
+
+
+# ── Baselines ───────────────────────────────────────────────────────────────
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+class VisualBaselines:
+    """Baseline PNGs and their digests, keyed by browser, viewport or device profile, scenario and region."""
+
+    def __init__(self, root: Path = BASELINE_DIR, browser: str = config.BROWSER, update: str = config.VISUAL_UPDATE):
+        self.root = root
+        self.browser = browser
+        self.update = update
+        self.stats = {"compared": 0, "unchanged": 0, "recorded": 0, "failed": 0, "diff_ms": 0.0}
+
+    def path(self, scenario: str, region: str, viewport: dict, device: str | None = None) -> Path:
+        scenario = scenario.split(" [")[0]  # without the matrix cell / device suffix
+        screen = _slug(device) if device else f"{viewport['width']}x{viewport['height']}"
+        return self.root / self.browser / screen / f"{_slug(scenario)}--{_slug(region)}.png"
+
+    def _record(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        path.with_suffix(".json").write_text(json.dumps({"png": png_digest(data)}))
+        self.stats["recorded"] += 1
+
+    def _digest(self, path: Path) -> str | None:
+        try:
+            return json.loads(path.with_suffix(".json").read_text()).get("png")
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def check(
+        self, screenshot: bytes, scenario: str, region: str, viewport: dict, device: str | None = None
+    ) -> DiffResult | None:
+        """Compare *screenshot* with its baseline; None if it matched byte for byte or was recorded."""
+        path = self.path(scenario, region, viewport, device)
+        if self.update == "all" or not path.exists():
+            if self.update == "none":
+                raise AssertionError(f"No visual baseline for {region!r} at {path} (VISUAL_UPDATE=none)")
+            self._record(path, screenshot)
+            logger.warning("Visual baseline recorded: %s", path)
+            return None
+
+        self.stats["compared"] += 1
+        if png_digest(screenshot) == self._digest(path):
+            self.stats["unchanged"] += 1
+            return None
+        result = compare(decode_png(screenshot), decode_png(path.read_bytes()))
+        self.stats["diff_ms"] = round(self.stats["diff_ms"] + result.ms, 2)
+        if not result.passed:
+            self.stats["failed"] += 1
+            self._attach_failure(path, screenshot, result)
+        return result
+
+    def _attach_failure(self, path: Path, screenshot: bytes, result: DiffResult) -> None:
+        allure.attach(screenshot, name="Visual: actual", attachment_type=allure.attachment_type.PNG)
+        allure.attach(path.read_bytes(), name="Visual: baseline", attachment_type=allure.attachment_type.PNG)
+        if result.heatmap is not None:
+            heatmap = encode_png(result.heatmap)
+            diff_file = DIFF_DIR / path.relative_to(self.root).with_suffix(".diff.png")
+            diff_file.parent.mkdir(parents=True, exist_ok=True)
+            diff_file.write_bytes(heatmap)
+            allure.attach(heatmap, name="Visual: diff heatmap", attachment_type=allure.attachment_type.PNG)
+
+
+def describe(result: DiffResult) -> str:
+    """One-line summary of a failed comparison."""
+    size = " after a size change" if result.size_changed else ""
+    return (
+        f"{result.diff_pixels} pixels differ ({result.diff_ratio:.3%}, limit {config.VISUAL_MAX_DIFF_RATIO:.3%}) "
+        f"in {result.changed_tiles}/{result.tiles} tiles{size}"
+    )
+
+
+# Shared for the run, so its stats cover every scenario
+visual_baselines = VisualBaselines()